@@ -1,14 +1,64 @@
-import tkinter as tk
-from tkinter import messagebox, ttk
-from datetime import datetime, date, timedelta
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import io
-from reportlab.pdfgen import canvas as pdf_canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import Table, TableStyle
-from reportlab.lib import colors as rl_colors
-from reportlab.lib.utils import ImageReader
+import time
+_STARTUP_T0 = time.perf_counter()
+import importlib
+import importlib.util
+import math
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+
+IMPORT_TIMINGS = {}  # seconds per module, eager ones at startup and lazy ones on first use
+TAB_BUILD_TIMINGS = {}  # seconds spent building each notebook tab, on first selection
+
+def _timed_import(name, attr=None):
+    """``import name`` (or ``from name import attr``), recording how long the import took.
+
+    A module's time includes whatever it imports that wasn't loaded yet.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    value = module if attr is None else getattr(module, attr, None)
+    if value is None:  # submodule not imported by its package
+        value = importlib.import_module(f"{name}.{attr}")
+    IMPORT_TIMINGS.setdefault(name, time.perf_counter() - start)
+    return value
+
+# ---------- Eagerly imported modules (the first window needs them) ----------
+tk = _timed_import("tkinter")
+messagebox = _timed_import("tkinter.messagebox")
+ttk = _timed_import("tkinter.ttk")
+if importlib.util.find_spec("app") is None:  # launched as `python app/ACEest_Fitness-V1.3.py`
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for _name in ("app.storage", "app.workouts", "app.progress", "app.reports", "app.render_cache", "app.jobs"):
+    _timed_import(_name)
+from app.storage import CATEGORIES, open_store
+from app.workouts import MET_VALUES, calculate_calories, parse_duration
+from app.progress import progress_series
+from app import reports
+from app.reports import report_filename, weekly_report_pdf, week_bounds
+from app.render_cache import RenderCache
+from app.jobs import JobQueue, JobWorkerPool
+
+# ---------- Lazily imported dependencies ----------
+# matplotlib is only needed by the Progress tab, so it is imported on first use
+# by _load_charting(); reportlab is loaded the same way by app/reports.py.
+FigureCanvasAgg = Figure = None
+
+def _load_charting():
+    global FigureCanvasAgg, Figure
+    if Figure is None: Figure = _timed_import("matplotlib.figure", "Figure")
+    if FigureCanvasAgg is None: FigureCanvasAgg = _timed_import("matplotlib.backends.backend_agg", "FigureCanvasAgg")
+
+def startup_report():
+    """Text table of import costs (each eagerly and lazily loaded module) and tab build times."""
+    lines = ["ACEest startup timing:"]
+    timings = {**IMPORT_TIMINGS, **reports.IMPORT_TIMINGS,
+               **{f"build tab {name.split(' ', 1)[-1]}": seconds for name, seconds in TAB_BUILD_TIMINGS.items()}}
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<40} {seconds * 1000:8.1f} ms")
+    return "\n".join(lines)
 
 # ---------- Color Palette ----------
 COLOR_PRIMARY = "#4CAF50"   # Green
@@ -16,16 +66,299 @@ COLOR_SECONDARY = "#2196F3" # Blue
 COLOR_BACKGROUND = "#F8F9FA"
 COLOR_CARD_BG = "#FFFFFF"
 COLOR_TEXT = "#343A40"
+EXPORT_POLL_MS = 200  # how often the Tk loop checks on a background export
+CHART_POLL_MS = 40  # how often the Tk loop checks for a finished chart render
+SUMMARY_PAGE_SIZE = 200  # sessions fetched per category each time the summary list needs more
+LOG_TAB, PLAN_TAB, DIET_TAB, PROGRESS_TAB = "🏋️ Log Workouts", "💡 Workout Plan", "🥗 Diet Guide", "📈 Progress Tracker"
+
+# ---------- Progress Chart ----------
+def rgba_to_ppm(rgba, width, height):
+    """Binary PPM, which tk.PhotoImage reads natively, from an RGBA buffer (alpha dropped)."""
+    rgba = bytes(rgba)
+    rgb = bytearray(width * height * 3)
+    rgb[0::3] = rgba[0::4]; rgb[1::3] = rgba[1::4]; rgb[2::3] = rgba[2::4]
+    return b"P6 %d %d 255\n" % (width, height) + bytes(rgb)
+
+
+class ChartRenderer:
+    """Draws the bar + pie Figure with Agg on a daemon worker thread.
+
+    The Figure is built on the first render and only touched by the worker;
+    later renders move bar heights and pie wedge angles.  Requests are
+    latest-wins: submit() replaces any queued request, and a render checks
+    between steps whether a newer version arrived, abandoning itself if so.
+    Finished frames are ``(version, width, height, ppm)`` on ``frames``.
+    """
+    CHART_COLORS = [COLOR_SECONDARY, COLOR_PRIMARY, "#FFC107"]
+
+    def __init__(self):
+        self.frames = queue.Queue()
+        self.figure = None
+        self.canvas = None
+        self.latest = 0  # newest version submitted; anything older is stale
+        self._request = None
+        self._busy = False
+        self._wake = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="chart-renderer", daemon=True)
+            self._thread.start()
+
+    def submit(self, version, categories, values):
+        with self._wake:
+            self.latest, self._request = version, (version, list(categories), list(values))
+            self._wake.notify()
+
+    def cancel(self, version):
+        """Make every render older than ``version`` stale without queuing a new one."""
+        with self._wake:
+            self.latest, self._request = version, None
+
+    @property
+    def pending(self):
+        return self._request is not None or self._busy or not self.frames.empty()
+
+    def _loop(self):
+        while True:
+            self.run_next(timeout=None)
+
+    def run_next(self, timeout=0):
+        """Render the newest request on the calling thread; returns False if none came within ``timeout``."""
+        with self._wake:
+            if not self._wake.wait_for(lambda: self._request is not None, timeout):
+                return False
+            request, self._request, self._busy = self._request, None, True
+        try:
+            frame = self.render(*request)
+            if frame is not None:
+                self.frames.put(frame)
+        finally:
+            self._busy = False
+        return True
+
+    def render(self, version, categories, values):
+        if version != self.latest:
+            return None
+        if self.figure is None:
+            self._build(categories)
+        for bar, value in zip(self.bars, values): bar.set_height(value)
+        self.ax_bar.relim(); self.ax_bar.autoscale_view()
+        self._layout_pie(values)
+        if version != self.latest:
+            return None
+        self.canvas.draw()
+        if version != self.latest:
+            return None
+        width, height = self.canvas.get_width_height()
+        return version, width, height, rgba_to_ppm(self.canvas.buffer_rgba(), width, height)
+
+    def _build(self, categories):
+        _load_charting()
+        fig = Figure(figsize=(8,5), dpi=100, facecolor=COLOR_CARD_BG)
+        ax1 = fig.add_subplot(121)
+        self.bars = ax1.bar(categories, [0] * len(categories), color=self.CHART_COLORS)
+        ax1.set_title("Total Minutes per Category", fontsize=10, color=COLOR_TEXT)
+        ax1.set_ylabel("Total Minutes", fontsize=8, color=COLOR_TEXT)
+        ax1.tick_params(axis='x', labelsize=8, colors=COLOR_TEXT)
+        ax1.tick_params(axis='y', labelsize=8, colors=COLOR_TEXT)
+        ax1.spines['right'].set_visible(False); ax1.spines['top'].set_visible(False)
+        ax1.grid(axis='y', linestyle='-', alpha=0.3); ax1.set_facecolor(COLOR_CARD_BG)
+        ax2 = fig.add_subplot(122)
+        # one wedge per category; _layout_pie sets the real angles and hides empty ones
+        self.wedges, self.pie_labels, self.pie_pcts = ax2.pie([1] * len(categories), labels=categories, autopct="%1.1f%%", startangle=90, colors=self.CHART_COLORS, wedgeprops={"edgecolor":"white",'linewidth':1}, textprops={'fontsize':8,'color':COLOR_TEXT})
+        ax2.set_title("Workout Distribution (%)", fontsize=10, color=COLOR_TEXT); ax2.axis('equal'); ax2.set_facecolor(COLOR_CARD_BG)
+        fig.tight_layout(pad=2.0)
+        self.figure, self.ax_bar = fig, ax1
+        self.canvas = FigureCanvasAgg(fig)
+
+    def _layout_pie(self, values):
+        total = float(sum(values)); theta = 90.0
+        for wedge, label, pct, value in zip(self.wedges, self.pie_labels, self.pie_pcts, values):
+            span = 360.0 * value / total
+            wedge.set_theta1(theta); wedge.set_theta2(theta + span)
+            mid = math.radians(theta + span / 2)
+            label.set_position((1.1 * math.cos(mid), 1.1 * math.sin(mid)))
+            label.set_horizontalalignment("left" if math.cos(mid) >= 0 else "right")
+            pct.set_position((0.6 * math.cos(mid), 0.6 * math.sin(mid)))
+            pct.set_text(f"{100.0 * value / total:.1f}%")
+            label.set_visible(value > 0); pct.set_visible(value > 0)
+            theta += span
+
+
+class ProgressChart:
+    """Progress tab chart: Tk-side half of the off-thread renderer.
+
+    update() hands the data to a ChartRenderer and returns at once; a
+    ``container.after`` poll picks finished frames off the renderer's queue
+    and shows the newest one as a PhotoImage.  The Tk loop never runs
+    tight_layout or draw, so input stays live while a chart refreshes.
+    """
+    def __init__(self, container):
+        self.container = container
+        self.renderer = ChartRenderer()
+        self.version = 0  # bumped by every update(); frames for older versions are dropped
+        self.shown_version = None
+        self.image_label = None
+        self.photo = None
+        self.empty_label = None
+        self._poll = None
+
+    def update(self, categories, values):
+        self.version += 1
+        if sum(values) == 0:
+            self.renderer.cancel(self.version)
+            if self.image_label is not None: self.image_label.pack_forget()
+            if self.empty_label is None:
+                self.empty_label = tk.Label(self.container, text="No workout data logged yet.", font=("Inter", 14, "italic"), fg="#888", bg=COLOR_CARD_BG)
+            self.empty_label.pack(pady=100); return
+        if self.empty_label is not None: self.empty_label.pack_forget()
+        self.renderer.submit(self.version, categories, values)
+        self.renderer.start()
+        if self._poll is None:
+            self._poll = self.container.after(CHART_POLL_MS, self.poll)
+
+    def poll(self):
+        """Show the newest finished frame; keep polling while a render is outstanding."""
+        self._poll = None
+        frame = None
+        while not self.renderer.frames.empty():
+            frame = self.renderer.frames.get_nowait()
+        if frame is not None and frame[0] == self.version:
+            self.show(*frame)
+        if self.renderer.pending:
+            self._poll = self.container.after(CHART_POLL_MS, self.poll)
+
+    def show(self, version, width, height, ppm):
+        self.photo = tk.PhotoImage(master=self.container, width=width, height=height, data=ppm, format="PPM")
+        if self.image_label is None:
+            self.image_label = tk.Label(self.container, bg=COLOR_CARD_BG)
+        self.image_label.config(image=self.photo); self.image_label.pack(fill="both", expand=True)
+        self.shown_version = version
+
+
+# ---------- Session History ----------
+class SessionList:
+    """Session history for view_summary as a lazily filled ``ttk.Treeview``.
+
+    Each category is a collapsible node.  Its sessions are read from the store
+    a page at a time with a keyset cursor: the first page when the node is
+    opened, the next whenever its "more" row scrolls into view.  Only pages the
+    user has scrolled to are ever inserted, and Tk only draws the visible rows.
+    """
+    COLUMNS = (("exercise", "Exercise", 200), ("duration", "Min", 60), ("calories", "kcal", 70), ("date", "Date", 90))
+    CATEGORY_COLORS = {"Warm-up": COLOR_SECONDARY, "Workout": COLOR_PRIMARY, "Cool-down": "#FFC107"}
+
+    def __init__(self, container, store, regn_id, totals, page_size=SUMMARY_PAGE_SIZE):
+        self.store = store
+        self.regn_id = regn_id
+        self.page_size = page_size
+        self.cursors = {}  # category -> (timestamp, id) of its last inserted row
+        self.loaded = {}   # category -> rows inserted so far
+        self.pending = {}  # category -> sessions not yet inserted (its "more" row exists while > 0)
+        self._fill_scheduled = False
+        self.scrollbar = ttk.Scrollbar(container); self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(container, columns=[name for name, _, _ in self.COLUMNS], height=20, yscrollcommand=self._on_scroll)
+        self.tree.pack(fill="both", expand=True)
+        self.scrollbar.config(command=self.tree.yview)
+        self.tree.heading("#0", text="Session"); self.tree.column("#0", width=90, stretch=False)
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading); self.tree.column(name, width=width, anchor="w" if name == "exercise" else "e")
+        # tags are configured once, not per inserted row
+        for category, color in self.CATEGORY_COLORS.items():
+            self.tree.tag_configure(category.lower(), font=("Inter", 12, "bold"), foreground=color)
+        self.tree.tag_configure("more", font=("Inter", 10, "italic"), foreground="#888")
+        self.tree.tag_configure("total", font=("Inter", 12, "bold"), foreground="#DC3545")
+        for category in CATEGORIES:
+            count = totals.get(category, {}).get("count", 0)
+            self.tree.insert("", tk.END, iid=category, text=category.upper(), values=(f"{count} sessions", "", "", ""), open=False, tags=(category.lower(),))
+            self.loaded[category], self.pending[category] = 0, count
+            self.tree.insert(category, tk.END, iid=self._more(category), text="…" if count else "", values=("Scroll for more sessions" if count else "No sessions recorded.", "", "", ""), tags=("more",))
+        total_time = sum(t["minutes"] for t in totals.values())
+        self.tree.insert("", tk.END, iid="totals", text="LIFETIME TOTALS", values=(f"Total Training Time: {total_time} minutes", "", "", ""), tags=("total",))
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+
+    @staticmethod
+    def _more(category):
+        return f"{category}:more"
+
+    def load_page(self, category):
+        """Insert the category's next page above its "more" row; returns how many rows were added."""
+        if self.pending[category] <= 0:
+            return 0
+        rows = self.store.sessions_page(self.regn_id, after=self.cursors.get(category), limit=self.page_size, category=category)
+        for session_id, _, entry in rows:
+            self.loaded[category] += 1
+            self.tree.insert(category, self.loaded[category] - 1, iid=f"session:{session_id}", text=str(self.loaded[category]),
+                             values=(entry["exercise"], entry["duration"], f"{entry['calories']:.1f}", entry["timestamp"][:10]))
+        if rows:
+            self.cursors[category] = (rows[-1][2]["timestamp"], rows[-1][0])
+        self.pending[category] = self.pending[category] - len(rows) if len(rows) == self.page_size else 0
+        if self.pending[category] <= 0:
+            self.tree.delete(self._more(category))
+        return len(rows)
+
+    def _on_open(self, event):
+        category = self.tree.focus()
+        if category in self.pending and self.loaded[category] == 0:
+            self.load_page(category)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self._fill_scheduled:  # coalesce a burst of scroll events into one check
+            self._fill_scheduled = True
+            self.tree.after_idle(self.fill_visible)
+
+    def fill_visible(self):
+        """Load the next page of every open category whose "more" row is on screen."""
+        self._fill_scheduled = False
+        for category in CATEGORIES:
+            if self.pending[category] > 0 and self.loaded[category] and self.tree.item(category, "open") and self.tree.bbox(self._more(category)):
+                self.load_page(category)
+
+
+# ---------- Redraw Scheduling ----------
+class RedrawScheduler:
+    """Coalesces chart refresh requests into a single ``master.after`` callback.
+
+    A burst of ``request()`` calls schedules one redraw.  When it fires, the
+    redraw is skipped if the chart isn't visible or if ``version()`` hasn't
+    changed since the last render; the chart then stays dirty until the next
+    request (e.g. when the Progress tab is selected).
+    """
+    def __init__(self, master, redraw, is_visible, version, delay_ms=150):
+        self.master = master
+        self.redraw = redraw
+        self.is_visible = is_visible
+        self.version = version
+        self.delay_ms = delay_ms
+        self.rendered_version = None
+        self._pending = None
+
+    @property
+    def dirty(self):
+        return self.version() != self.rendered_version
+
+    def request(self, delay_ms=None):
+        if self._pending is None:
+            self._pending = self.master.after(self.delay_ms if delay_ms is None else delay_ms, self._run)
+
+    def cancel(self):
+        if self._pending is not None:
+            self.master.after_cancel(self._pending); self._pending = None
+
+    def _run(self):
+        self._pending = None
+        if not self.is_visible() or not self.dirty:
+            return
+        version = self.version()
+        self.redraw()
+        self.rendered_version = version
+
 
-# ---------- MET Values for Exercises ----------
-MET_VALUES = {
-    "Warm-up": 3,
-    "Workout": 6,
-    "Cool-down": 2.5
-}
-        
 class FitnessTrackerApp:
-    def __init__(self, master):
+    def __init__(self, master, store=None):
         self.master = master
         master.title("ACEest Fitness & Gym Tracker")
         master.geometry("850x700")
@@ -34,10 +367,14 @@ class FitnessTrackerApp:
         # --- User Info ---
         self.user_info = {}  # Will hold name, regn-id, height, weight, age, gender, BMI, BMR
 
-        # --- Workouts ---
-        self.workouts = {"Warm-up": [], "Workout": [], "Cool-down": []}
-        self.daily_workouts = {}  # key=date_iso, value={category:[entries]}
-        
+        # --- Workouts (persisted per regn-id, see app/storage.py) ---
+        self.store = store if store is not None else open_store()
+        self._totals = None  # per-category running aggregates, loaded lazily per member
+        self._totals_member = None
+        self.data_version = 0  # bumped on every write so redraws can be skipped when nothing changed
+        self.render_cache = None  # created on first PDF export
+        self.jobs = None  # background export queue, started on first export
+
         # --- UI Setup ---
         self.style = ttk.Style()
         self.style.theme_use("clam")
@@ -58,19 +395,37 @@ class FitnessTrackerApp:
         self.diet_tab = tk.Frame(self.notebook, bg=COLOR_BACKGROUND)
         self.progress_tab = tk.Frame(self.notebook, bg=COLOR_CARD_BG)
 
-        self.notebook.add(self.log_tab, text="🏋️ Log Workouts")
-        self.notebook.add(self.chart_tab, text="💡 Workout Plan")
-        self.notebook.add(self.diet_tab, text="🥗 Diet Guide")
-        self.notebook.add(self.progress_tab, text="📈 Progress Tracker")
+        # tab contents are built the first time a tab is selected (see build_tab)
+        self.tab_builders = {}
+        for frame, text, builder in ((self.log_tab, LOG_TAB, self.create_log_tab),
+                                     (self.chart_tab, PLAN_TAB, self.create_workout_plan_tab),
+                                     (self.diet_tab, DIET_TAB, self.create_diet_guide_tab),
+                                     (self.progress_tab, PROGRESS_TAB, self.create_progress_tab)):
+            self.notebook.add(frame, text=text)
+            self.tab_builders[text] = builder
+        self.built_tabs = set()
 
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_change)
 
-        # --- Initialize Tabs ---
+        # --- Initialize Tabs: only what the logging screen needs ---
         self.create_user_info_section()
-        self.create_log_tab()
-        self.create_workout_plan_tab()
-        self.create_diet_guide_tab()
-        self.create_progress_tab()
+        self.build_tab(LOG_TAB)
+        self.chart_scheduler = RedrawScheduler(master, self.update_progress_charts, self.progress_visible,
+                                               lambda: (self.member_id, self.data_version))
+        master.after_idle(self.mark_interactive)
+
+    def build_tab(self, text):
+        """Build a notebook tab's widgets unless that already happened."""
+        if text in self.tab_builders and text not in self.built_tabs:
+            start = time.perf_counter()
+            self.tab_builders[text]()
+            self.built_tabs.add(text)
+            TAB_BUILD_TIMINGS[text] = time.perf_counter() - start
+
+    def mark_interactive(self):
+        """Runs on the first idle moment: the Log tab is drawn and accepts input."""
+        IMPORT_TIMINGS.setdefault("log tab interactive (total)", time.perf_counter() - _STARTUP_T0)
+
     # ADD THESE if not already present
     def create_workout_plan_tab(self):
         tk.Label(self.chart_tab, text="Workout Plan coming soon.", bg=COLOR_BACKGROUND).pack(pady=100)
@@ -78,11 +433,43 @@ class FitnessTrackerApp:
     def create_diet_guide_tab(self):
         tk.Label(self.diet_tab, text="Diet Guide coming soon.", bg=COLOR_BACKGROUND).pack(pady=100)
 
+    # ---------------- Workout Store ----------------
+    @property
+    def member_id(self):
+        return self.user_info.get("regn_id", "") if self.user_info else ""
+
+    @property
+    def workouts(self):
+        """{category: [entries]} for the current member, read from the store."""
+        return self.store.sessions_by_category(self.member_id)
+
+    @workouts.setter
+    def workouts(self, value):
+        self.store.replace(self.member_id, value)
+        self._totals = None
+        self.data_version += 1
+
+    @property
+    def totals(self):
+        """{category: {"minutes", "calories", "count"}}, kept up to date by add_workout."""
+        if self._totals is None or self._totals_member != self.member_id:
+            self._totals = self.store.aggregates(self.member_id)
+            self._totals_member = self.member_id
+        return self._totals
+
+    @property
+    def daily_workouts(self):
+        """{date_iso: {category: [entries]}} for the current member, read from the store."""
+        return self.store.sessions_by_date(self.member_id)
+
     # ---------------- Utility ----------------
+    def progress_visible(self):
+        return "Progress Tracker" in self.notebook.tab(self.notebook.select(), "text").strip()
+
     def on_tab_change(self, event):
-        selected_tab = self.notebook.tab(self.notebook.select(), "text").strip()
-        if "Progress Tracker" in selected_tab:
-            self.update_progress_charts()
+        self.build_tab(self.notebook.tab(self.notebook.select(), "text"))
+        if self.progress_visible():
+            self.chart_scheduler.request(delay_ms=0)
 
     # ---------- User Info ----------
     def create_user_info_section(self):
@@ -114,6 +501,8 @@ class FitnessTrackerApp:
         try:
             name = self.name_entry.get().strip()
             regn_id = self.regn_entry.get().strip()
+            if not regn_id:
+                raise ValueError("Regn-ID is required")
             age = int(self.age_entry.get().strip())
             gender = self.gender_entry.get().strip().upper()
             height_cm = float(self.height_entry.get().strip())
@@ -128,6 +517,7 @@ class FitnessTrackerApp:
                 "height": height_cm, "weight": weight_kg, "bmi": bmi, "bmr": bmr,
                 "weekly_cal_goal": 2000
             }
+            self.store.save_member(self.user_info)
             messagebox.showinfo("Success", f"User info saved! BMI={bmi:.1f}, BMR={bmr:.0f} kcal/day")
         except Exception as e:
             messagebox.showerror("Error", f"Invalid input: {e}")
@@ -141,7 +531,7 @@ class FitnessTrackerApp:
         # Category
         self.category_var = tk.StringVar(value="Workout")
         tk.Label(log_card, text="Category:", font=("Inter", 12, "bold"), bg=COLOR_CARD_BG, fg=COLOR_TEXT).grid(row=0, column=0, sticky="w", padx=10, pady=10)
-        self.category_menu = ttk.Combobox(log_card, textvariable=self.category_var, values=list(self.workouts.keys()), state="readonly", width=30, font=("Inter", 11))
+        self.category_menu = ttk.Combobox(log_card, textvariable=self.category_var, values=list(CATEGORIES), state="readonly", width=30, font=("Inter", 11))
         self.category_menu.grid(row=0, column=1, sticky="w", padx=10, pady=10)
         # Exercise
         tk.Label(log_card, text="Exercise Name:", font=("Inter", 12, "bold"), bg=COLOR_CARD_BG, fg=COLOR_TEXT).grid(row=1, column=0, sticky="w", padx=10, pady=10)
@@ -160,112 +550,102 @@ class FitnessTrackerApp:
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
 
     def add_workout(self):
+        if not self.member_id:  # sessions are stored per member; there is no anonymous bucket
+            messagebox.showerror("Error", "Please save user info first!"); return
         category = self.category_var.get()
         workout = self.workout_entry.get().strip()
         duration_str = self.duration_entry.get().strip()
         if not workout or not duration_str:
             messagebox.showerror("Input Error", "Please enter both exercise and duration."); return
         try:
-            duration = int(duration_str)
-            if duration <= 0: raise ValueError
-        except ValueError:
-            messagebox.showerror("Input Error", "Duration must be a positive whole number."); return
-        # Calories calculation
+            duration = parse_duration(duration_str)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e)); return
+        # Calories calculation (MET formula shared with the API, see app/workouts.py)
         weight = self.user_info.get("weight", 70)
-        met = MET_VALUES.get(category, 5)
-        calories = (met * 3.5 * weight / 200) * duration
-        entry = {"exercise": workout, "duration": duration, "calories": calories, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        self.workouts[category].append(entry)
-        today_iso = date.today().isoformat()
-        if today_iso not in self.daily_workouts:
-            self.daily_workouts[today_iso] = {"Warm-up": [], "Workout": [], "Cool-down": []}
-        self.daily_workouts[today_iso][category].append(entry)
+        calories = calculate_calories(category, duration, weight)
+        entry = {"exercise": workout, "duration": duration, "calories": calories, "weight": weight, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        running = self.totals.setdefault(category, {"minutes": 0, "calories": 0.0, "count": 0})  # load before writing
+        self.store.add(self.member_id, category, entry)
+        running["minutes"] += duration; running["calories"] += calories; running["count"] += 1
+        self.data_version += 1
         self.workout_entry.delete(0, tk.END); self.duration_entry.delete(0, tk.END)
         self.status_label.config(text=f"Added {workout} ({duration} min) to {category}! 💪")
-        self.update_progress_charts()
+        self.chart_scheduler.request()
         messagebox.showinfo("Success", f"{workout} added successfully!")
 
     def view_summary(self):
-        if not any(self.workouts.values()):
+        totals = self.totals
+        if not any(t["count"] for t in totals.values()):
             messagebox.showinfo("Summary", "No sessions logged yet!"); return
         summary_window = tk.Toplevel(self.master); summary_window.title("Detailed Workout Summary"); summary_window.geometry("550x550"); summary_window.config(bg=COLOR_CARD_BG)
         tk.Label(summary_window, text="🏋️ Full Session History", font=("Inter", 16, "bold"), bg=COLOR_CARD_BG, fg=COLOR_TEXT).pack(pady=10)
-        text_frame = tk.Frame(summary_window, bg=COLOR_CARD_BG); text_frame.pack(pady=10, padx=20, fill="both", expand=True)
-        scrollbar = ttk.Scrollbar(text_frame); scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        summary_text = tk.Text(text_frame, height=20, width=55, wrap=tk.WORD, font=("Inter", 10), bg=COLOR_BACKGROUND, fg=COLOR_TEXT, yscrollcommand=scrollbar.set, relief=tk.FLAT); summary_text.pack(fill="both", expand=True)
-        scrollbar.config(command=summary_text.yview)
-        total_time = 0
-        for category, sessions in self.workouts.items():
-            summary_text.insert(tk.END, f"--- {category.upper()} ---\n", category.lower())
-            summary_text.tag_config(category.lower(), font=("Inter", 12, "bold"), foreground=COLOR_SECONDARY if category=="Warm-up" else COLOR_PRIMARY if category=="Workout" else "#FFC107")
-            if sessions:
-                for i, entry in enumerate(sessions, 1):
-                    line = f"  {i}. {entry['exercise']} - {entry['duration']} min | {entry['calories']:.1f} kcal | Date: {entry['timestamp'].split(' ')[0]}\n"
-                    summary_text.insert(tk.END, line)
-                    total_time += entry['duration']
-            else:
-                summary_text.insert(tk.END, "  No sessions recorded.\n", "italic"); summary_text.tag_config("italic", font=("Inter", 10, "italic"), foreground="#888")
-            summary_text.insert(tk.END, "\n")
-        summary_text.insert(tk.END, f"--- LIFETIME TOTALS ---\n", "total_header"); summary_text.tag_config("total_header", font=("Inter", 13, "bold"), foreground="#DC3545")
-        summary_text.insert(tk.END, f"  Total Training Time: {total_time} minutes\n", "total_value"); summary_text.tag_config("total_value", font=("Inter", 12, "bold"), foreground="#DC3545")
-        summary_text.config(state=tk.DISABLED)
+        list_frame = tk.Frame(summary_window, bg=COLOR_CARD_BG); list_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        self.summary_list = SessionList(list_frame, self.store, self.member_id, totals)
 
     # ---------- Progress Charts ----------
     def create_progress_tab(self):
         tk.Label(self.progress_tab, text="📈 Personal Progress Tracker", font=("Inter", 20, "bold"), bg=COLOR_CARD_BG, fg=COLOR_TEXT).pack(pady=(20, 10))
         tk.Label(self.progress_tab, text="Visualization of your logged workout time distribution.", font=("Inter", 12), bg=COLOR_CARD_BG, fg="#6C757D").pack(pady=(0, 20))
         self.chart_container = tk.Frame(self.progress_tab, bg=COLOR_CARD_BG); self.chart_container.pack(pady=10, fill="both", expand=True)
-        self.chart_canvas = None
+        self.total_label = tk.Label(self.progress_tab, text="", font=("Inter", 13, "bold"), bg=COLOR_CARD_BG, fg="#DC3545"); self.total_label.pack(pady=(10,5))
+        self.goal_label = tk.Label(self.progress_tab, text="", font=("Inter", 12), bg=COLOR_CARD_BG, fg=COLOR_TEXT); self.goal_label.pack(pady=(0,10))
+        self.progress_chart = None
 
     def update_progress_charts(self):
-        for widget in self.chart_container.winfo_children(): widget.destroy()
-        totals = {cat: sum(entry['duration'] for entry in sessions) for cat, sessions in self.workouts.items()}
-        categories = list(totals.keys()); values = list(totals.values())
-        if sum(values) == 0:
-            tk.Label(self.chart_container, text="No workout data logged yet.", font=("Inter", 14, "italic"), fg="#888", bg=COLOR_CARD_BG).pack(pady=100); return
-        fig = Figure(figsize=(8,5), dpi=100, facecolor=COLOR_CARD_BG)
-        chart_colors = [COLOR_SECONDARY, COLOR_PRIMARY, "#FFC107"]
-        ax1 = fig.add_subplot(121)
-        ax1.bar(categories, values, color=chart_colors)
-        ax1.set_title("Total Minutes per Category", fontsize=10, color=COLOR_TEXT)
-        ax1.set_ylabel("Total Minutes", fontsize=8, color=COLOR_TEXT)
-        ax1.tick_params(axis='x', labelsize=8, colors=COLOR_TEXT)
-        ax1.tick_params(axis='y', labelsize=8, colors=COLOR_TEXT)
-        ax1.spines['right'].set_visible(False); ax1.spines['top'].set_visible(False)
-        ax1.grid(axis='y', linestyle='-', alpha=0.3); ax1.set_facecolor(COLOR_CARD_BG)
-        ax2 = fig.add_subplot(122)
-        pie_labels = [c for c, v in zip(categories, values) if v>0]; pie_values = [v for v in values if v>0]
-        pie_colors = [chart_colors[i] for i, v in enumerate(values) if v>0]
-        ax2.pie(pie_values, labels=pie_labels, autopct="%1.1f%%", startangle=90, colors=pie_colors, wedgeprops={"edgecolor":"white",'linewidth':1}, textprops={'fontsize':8,'color':COLOR_TEXT})
-        ax2.set_title("Workout Distribution (%)", fontsize=10, color=COLOR_TEXT); ax2.axis('equal'); ax2.set_facecolor(COLOR_CARD_BG)
-        fig.tight_layout(pad=2.0)
-        self.chart_canvas = FigureCanvasTkAgg(fig, master=self.chart_container)
-        self.chart_canvas.draw(); self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
+        if self.progress_chart is None:
+            self.progress_chart = ProgressChart(self.chart_container)
+        categories = list(self.totals.keys()); values = [t["minutes"] for t in self.totals.values()]
+        self.progress_chart.update(categories, values)
         total_minutes = sum(values)
-        tk.Label(self.progress_tab, text=f"LIFETIME TOTAL: {total_minutes} minutes logged", font=("Inter", 13, "bold"), bg=COLOR_CARD_BG, fg="#DC3545").pack(pady=(10,5))
+        self.total_label.config(text=f"LIFETIME TOTAL: {total_minutes} minutes logged" if total_minutes else "")
+        self.update_goal_progress()
+
+    def update_goal_progress(self):
+        # 52 weekly rollup rows from the store, not a scan of every logged session
+        goal = self.user_info.get("weekly_cal_goal") if self.user_info else None
+        if not goal:
+            self.goal_label.config(text=""); return
+        weeks = progress_series(self.store, self.member_id, "week", 52, weekly_goal=goal)
+        met = sum(w["goal_pct"] >= 100 for w in weeks)
+        self.goal_label.config(text=f"THIS WEEK: {weeks[-1]['calories']:.0f} of {goal} kcal goal ({weeks[-1]['goal_pct']:.0f}%) | Goal met in {met} of the last 52 weeks")
     
     # ---------- PDF Report ----------
     def export_weekly_report(self):
         if not self.user_info:
             messagebox.showerror("Error", "Please save user info first!"); return
-        filename = f"{self.user_info['name'].replace(' ','_')}_weekly_report.pdf"
-        c = pdf_canvas.Canvas(filename, pagesize=A4); width, height = A4
-        c.setFont("Helvetica-Bold", 16); c.drawString(50, height-50, f"Weekly Fitness Report - {self.user_info['name']}")
-        # User Info
-        c.setFont("Helvetica", 11)
-        c.drawString(50, height-80, f"Regn-ID: {self.user_info['regn_id']} | Age: {self.user_info['age']} | Gender: {self.user_info['gender']}")
-        c.drawString(50, height-100, f"Height: {self.user_info['height']} cm | Weight: {self.user_info['weight']} kg | BMI: {self.user_info['bmi']:.1f} | BMR: {self.user_info['bmr']:.0f} kcal/day")
-        # Table of workouts
-        y = height-140
-        table_data = [["Category","Exercise","Duration(min)","Calories(kcal)","Date"]]
-        for cat, sessions in self.workouts.items():
-            for e in sessions:
-                table_data.append([cat,e['exercise'],str(e['duration']),f"{e['calories']:.1f}", e['timestamp'].split()[0]])
-        table = Table(table_data, colWidths=[80,150,80,80,80])
-        table.setStyle(TableStyle([("BACKGROUND",(0,0),(-1,0),rl_colors.lightblue),("GRID",(0,0),(-1,-1),0.5,rl_colors.black)]))
-        table.wrapOn(c, width-100, y); table.drawOn(c,50,y-20)
-        c.save()
-        messagebox.showinfo("PDF Export", f"Weekly report exported successfully as {filename}")
+        # rendered by a background job worker so the window stays responsive; check_export
+        # polls for the outcome from the Tk event loop
+        week_start, week_end = week_bounds()
+        payload = {"user_info": dict(self.user_info), "filename": report_filename(self.user_info), "week_start": week_start, "week_end": week_end}
+        self.export_job_id = self.start_jobs().enqueue("export_weekly_report", payload, max_attempts=1)
+        self.master.after(EXPORT_POLL_MS, self.check_export, self.export_job_id)
+
+    def start_jobs(self):
+        # in-process queue: the service's shared queue has no handler for GUI exports
+        if self.jobs is None:
+            self.jobs = JobQueue(":memory:")
+            JobWorkerPool(self.jobs, {"export_weekly_report": self.render_export}, concurrency=1).start()
+        return self.jobs
+
+    def render_export(self, payload):
+        # runs on the job worker thread: paginated, week-filtered report streamed from the store
+        # (see app/reports.py); re-exports with unchanged data are served from the render cache
+        user_info, week_start, week_end = payload["user_info"], payload["week_start"], payload["week_end"]
+        if self.render_cache is None: self.render_cache = RenderCache()
+        pdf = weekly_report_pdf(user_info, lambda: self.store.iter_sessions(user_info["regn_id"], start_date=week_start, end_date=week_end),
+                                week_start, week_end, cache=self.render_cache)
+        with open(payload["filename"], "wb") as f: f.write(pdf)
+        return {"filename": payload["filename"]}
+
+    def check_export(self, job_id):
+        job = self.jobs.get(job_id)
+        if job["status"] in ("queued", "running"):
+            self.master.after(EXPORT_POLL_MS, self.check_export, job_id); return
+        if job["status"] == "succeeded":
+            messagebox.showinfo("PDF Export", f"Weekly report exported successfully as {job['result']['filename']}")
+        else:
+            messagebox.showerror("PDF Export", f"Weekly report export failed: {job['error']}")
 
 # ---------- Main ----------
 if __name__ == "__main__":
@@ -274,4 +654,8 @@ if __name__ == "__main__":
     # Button placed inside main window for exporting weekly report
     export_btn = ttk.Button(root, text="📄 Export Weekly PDF Report", command=app.export_weekly_report, style="Secondary.TButton")
     export_btn.place(x=20, y=350)
+    if os.environ.get("ACEEST_STARTUP_REPORT"):
+        # printed once the Log tab is interactive, and again on exit to include lazy imports and tabs
+        root.after_idle(lambda: print(startup_report()))
+        import atexit; atexit.register(lambda: print(startup_report()))
     root.mainloop()
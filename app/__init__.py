@@ -1,8 +1,72 @@
-from flask import Flask
-
-def create_app():
+def create_app(config=None):
+    # imported here so the Tk tracker and batch tools can use app.* without loading Flask
+    import click
+    from flask import Flask
     app = Flask(__name__)
+    app.config.from_mapping(
+        WORKOUT_DB=None,          # None -> ACEEST_DB_PATH or ~/.aceest/workouts.db
+        MAX_BATCH_SIZE=10000,
+        DEFAULT_PAGE_SIZE=100,    # rows per page for list endpoints (?limit= overrides)
+        MAX_PAGE_SIZE=1000,
+        REPORTS_DIR="weekly_reports",
+        MAX_REPORT_WORKERS=4,     # render processes per batch report job ("workers" may ask for fewer)
+        RENDER_CACHE_DIR=None,    # None -> ACEEST_CACHE_DIR or ~/.aceest/cache
+        RENDER_CACHE_MAX_BYTES=256 * 1024 * 1024,
+        READINESS_INTERVAL=5.0,   # seconds between background readiness checks
+        COMPRESS_MIN_SIZE=500,    # bytes; smaller bodies aren't worth compressing
+        COMPRESS_LEVEL=6,         # gzip level
+        COMPRESS_BROTLI_QUALITY=5,
+        JOBS_DB=None,             # None -> ACEEST_JOBS_DB or ~/.aceest/jobs.db
+        JOB_WORKERS=2,            # node-wide limit on concurrently running jobs (0 = don't run jobs here)
+        JOB_WORKERS_AUTOSTART=False,  # server processes start them (gunicorn.conf.py), not the CLI or tests
+        JOB_MAX_ATTEMPTS=3,
+        JOB_QUEUE_MAX_DEPTH=500,  # POST /reports answers 503 beyond this; readiness fails too
+    )
+    if config:
+        app.config.update(config)
+    # shared workout store (see app/storage.py)
+    from .storage import open_store
+    app.extensions["workout_store"] = open_store(app.config["WORKOUT_DB"])
+    # rendered PDFs / chart PNGs keyed by their inputs (see app/render_cache.py)
+    from .render_cache import RenderCache
+    app.extensions["render_cache"] = RenderCache(app.config["RENDER_CACHE_DIR"], app.config["RENDER_CACHE_MAX_BYTES"])
+    # report exports and recomputation run on a background job queue (see app/jobs.py)
+    from .jobs import JobQueue, JobWorkerPool, service_handlers
+    jobs = app.extensions["job_queue"] = JobQueue(app.config["JOBS_DB"])
+    handlers = service_handlers(app.extensions["workout_store"], app.extensions["render_cache"], app.config["REPORTS_DIR"],
+                                app.config["MAX_REPORT_WORKERS"])
+    app.extensions["job_workers"] = JobWorkerPool(jobs, handlers, concurrency=app.config["JOB_WORKERS"])
+    if app.config["JOB_WORKERS_AUTOSTART"]:
+        app.extensions["job_workers"].start()
+    # readiness checks run in the background; /healthcheck/ready serves the last results
+    from .health import ReadinessChecker, directory_writable_check, queue_depth_check, storage_check
+    readiness = ReadinessChecker(app.config["READINESS_INTERVAL"])
+    readiness.register("storage", storage_check(app.extensions["workout_store"]))
+    readiness.register("render_cache", directory_writable_check(app.extensions["render_cache"].directory))
+    readiness.register("job_queue", queue_depth_check(jobs.depth, app.config["JOB_QUEUE_MAX_DEPTH"]))
+    readiness.run_checks()
+    readiness.start()
+    app.extensions["readiness"] = readiness
     # register routes in blueprints or directly
     from . import routes
     app.register_blueprint(routes.bp)
+    # request latency / status / in-flight metrics and the /metrics endpoint
+    from . import metrics
+    metrics.init_app(app)
+    # negotiated gzip/brotli for every compressible response (see app/encoding.py)
+    from . import encoding
+    encoding.init_app(app)
+
+    @app.cli.command("recompute-calories")
+    @click.option("--background", is_flag=True, help="Queue the job for the service's workers instead.")
+    def recompute_calories_command(background):
+        """Recompute stored calorie burns from the current MET table."""
+        if background:
+            job_id = jobs.enqueue("recompute_calories", max_attempts=app.config["JOB_MAX_ATTEMPTS"])
+            print(f"Queued recompute job {job_id}")
+            return
+        from .workouts import recompute_calories
+        count = recompute_calories(app.extensions["workout_store"])
+        print(f"Recomputed calories for {count} sessions")
+
     return app
@@ -0,0 +1,116 @@
+# app/asgi.py
+"""ASGI adapter used by the async serving mode (``ACEEST_SERVER_MODE=async``).
+
+Under uvicorn workers the event loop owns every socket: request bodies are
+read and responses written without holding a thread, so slow clients and
+idle long-polls cost a coroutine rather than one of a handful of worker
+threads.  The Flask app stays synchronous and runs on a thread pool;
+``/healthcheck/`` paths get a small pool of their own, so long report renders
+can't queue the kubelet's probes behind them.
+"""
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+HEALTH_PREFIX = "/healthcheck/"
+CHUNK_BYTES = 64 * 1024  # streamed bodies are forwarded in chunks of about this size
+
+
+def _environ(scope, body):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "REMOTE_ADDR": client[0],
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name, value = name.decode("latin-1").upper().replace("-", "_"), value.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue
+        key = name if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _read_chunk(iterator):
+    """Pull body pieces until about CHUNK_BYTES are buffered; returns ``(data, finished)``."""
+    buffered = bytearray()
+    for piece in iterator:
+        buffered += piece
+        if len(buffered) >= CHUNK_BYTES:
+            return bytes(buffered), False
+    return bytes(buffered), True
+
+
+class ASGIApp:
+    def __init__(self, wsgi_app, threads=32, health_threads=2):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="asgi-app")
+        self.health_executor = ThreadPoolExecutor(health_threads, thread_name_prefix="asgi-health")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']!r}")
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        executor = self.health_executor if scope["path"].startswith(HEALTH_PREFIX) else self.executor
+        await self._respond(executor, _environ(scope, bytes(body)), send)
+
+    async def _respond(self, executor, environ, send):
+        loop = asyncio.get_running_loop()
+        start = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and start.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            start["message"] = {"type": "http.response.start", "status": int(status.split(" ", 1)[0]),
+                                "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]}
+
+        result = await loop.run_in_executor(executor, self.wsgi_app, environ, start_response)
+        iterator = iter(result)
+        try:
+            finished = False
+            while not finished:
+                data, finished = await loop.run_in_executor(executor, _read_chunk, iterator)
+                if not start.get("sent"):
+                    start["sent"] = True
+                    await send(start["message"])
+                if data or finished:
+                    await send({"type": "http.response.body", "body": data, "more_body": not finished})
+        finally:
+            if hasattr(result, "close"):
+                await loop.run_in_executor(executor, result.close)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                self.health_executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,161 @@
+# app/batch_reports.py
+"""Headless weekly report run for every member.
+
+Usage:
+  python -m app.batch_reports --out weekly_reports [--date 2024-03-04] [--workers 8] [--force]
+
+Members are rendered in parallel across a process pool; each worker opens
+its own connection to the (file-backed) store.  A ``manifest.json`` in the
+output directory remembers each member's data signature so members whose
+week hasn't changed since their last report are skipped.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from .reports import TEMPLATE_VERSION, render_weekly_report, week_bounds
+from .storage import open_store
+
+MANIFEST_NAME = "manifest.json"
+
+_worker_store = None  # one store per worker process
+
+
+def member_report_path(out_dir, regn_id):
+    # readable prefix plus a hash of the raw id, so "A/B" and "A_B" get different files
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", regn_id)[:64]
+    digest = hashlib.sha256(regn_id.encode()).hexdigest()[:12]
+    return os.path.join(out_dir, f"{safe}_{digest}_weekly_report.pdf")
+
+
+def _signature(profile, week_start, week_end, range_signature):
+    payload = json.dumps([TEMPLATE_VERSION, profile, week_start, week_end, list(range_signature)],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _render_member(db_path, backend, regn_id, profile, week_start, week_end, out_dir):
+    global _worker_store
+    if _worker_store is None:
+        _worker_store = open_store(db_path, backend)
+    start = time.perf_counter()
+    sessions = _worker_store.iter_sessions(regn_id, start_date=week_start, end_date=week_end)
+    path = member_report_path(out_dir, regn_id)
+    pages = render_weekly_report(path, profile, sessions, week_start, week_end)
+    return {"regn_id": regn_id, "path": path, "pages": pages, "seconds": round(time.perf_counter() - start, 4)}
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def generate_weekly_reports(out_dir, store=None, db_path=None, backend=None, day=None, workers=None,
+                            force=False, progress=None, mp_context=None):
+    """Render the week's report (``day`` defaults to today) for every saved member.
+
+    Pass an open ``store`` or a ``db_path``/``backend`` to open one; workers
+    reopen it from ``store.path``.  ``workers=0`` renders in-process (no pool);
+    ``mp_context`` picks how pool processes start (see ProcessPoolExecutor).
+    ``progress(done, total, result)`` is called as each member finishes.
+    Returns a summary dict with per-member timings plus ``skipped`` and
+    ``failed`` lists; ``no_profile`` lists regn_ids that logged sessions this
+    week (e.g. through the API) but have no saved profile to report on.
+    """
+    global _worker_store
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    week_start, week_end = week_bounds(day)
+    if store is None:
+        store = open_store(db_path, backend)
+    manifest = _load_manifest(out_dir)
+    todo, skipped, profiled = [], [], set()
+    for regn_id, profile in store.members():
+        profiled.add(regn_id)
+        signature = _signature(profile, week_start, week_end,
+                               store.range_signature(regn_id, week_start, week_end))
+        if not force and manifest.get(regn_id) == signature and os.path.exists(member_report_path(out_dir, regn_id)):
+            skipped.append(regn_id)
+        else:
+            todo.append((regn_id, profile, signature))
+    no_profile = [regn_id for regn_id in store.active_members(week_start, week_end) if regn_id not in profiled]
+    # in-memory stores can't be shared with worker processes
+    if getattr(store, "path", None) == ":memory:":
+        workers = 0
+
+    generated, failed = [], []
+    def finished(regn_id, signature, result=None, error=None):
+        if error is None:
+            manifest[regn_id] = signature
+            generated.append(result)
+        else:
+            failed.append({"regn_id": regn_id, "error": str(error)})
+        if progress:
+            progress(len(generated) + len(failed), len(todo), result or failed[-1])
+
+    if workers == 0:
+        _worker_store = store
+        for regn_id, profile, signature in todo:
+            try:
+                finished(regn_id, signature, _render_member(store.path, backend, regn_id, profile, week_start, week_end, out_dir))
+            except Exception as e:
+                finished(regn_id, signature, error=e)
+        _worker_store = None
+    elif todo:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            futures = {pool.submit(_render_member, store.path, backend, regn_id, profile, week_start, week_end, out_dir):
+                       (regn_id, signature) for regn_id, profile, signature in todo}
+            for future in as_completed(futures):
+                regn_id, signature = futures[future]
+                try:
+                    finished(regn_id, signature, future.result())
+                except Exception as e:
+                    finished(regn_id, signature, error=e)
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return {
+        "week_start": week_start, "week_end": week_end,
+        "generated": sorted(generated, key=lambda r: r["regn_id"]),
+        "skipped": skipped, "failed": failed, "no_profile": no_profile,
+        "elapsed_seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate weekly PDF reports for every member.")
+    parser.add_argument("--out", default="weekly_reports", help="output directory")
+    parser.add_argument("--db", default=None, help="workout database (default: ACEEST_DB_PATH)")
+    parser.add_argument("--date", default=None, help="any day in the target week (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=None, help="process count (0 = in-process)")
+    parser.add_argument("--force", action="store_true", help="re-render members whose data is unchanged")
+    args = parser.parse_args(argv)
+
+    def progress(done, total, result):
+        if "error" in result:
+            print(f"[{done}/{total}] {result['regn_id']} FAILED: {result['error']}")
+        else:
+            print(f"[{done}/{total}] {result['regn_id']} {result['pages']} page(s) in {result['seconds']:.2f}s")
+
+    day = date.fromisoformat(args.date) if args.date else None
+    summary = generate_weekly_reports(args.out, db_path=args.db, day=day, workers=args.workers,
+                                      force=args.force, progress=progress)
+    print(f"Generated {len(summary['generated'])}, skipped {len(summary['skipped'])} unchanged, "
+          f"failed {len(summary['failed'])} in {summary['elapsed_seconds']:.2f}s")
+    if summary["no_profile"]:
+        print(f"No saved profile for {len(summary['no_profile'])} active member(s): "
+              + ", ".join(summary["no_profile"]))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
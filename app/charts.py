@@ -0,0 +1,44 @@
+# app/charts.py
+"""Headless (Agg) rendering of the progress chart to PNG bytes.
+
+Mirrors the Progress tab's bar + pie layout for API clients; matplotlib is
+imported on first render.
+"""
+import io
+
+from .render_cache import cache_key
+
+CHART_VERSION = 1
+CHART_COLORS = ["#2196F3", "#4CAF50", "#FFC107"]
+COLOR_CARD_BG = "#FFFFFF"
+COLOR_TEXT = "#343A40"
+
+
+def render_progress_png(categories, values, dpi=100):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=(8,5), dpi=dpi, facecolor=COLOR_CARD_BG)
+    ax1 = fig.add_subplot(121)
+    ax1.bar(categories, values, color=CHART_COLORS[:len(categories)])
+    ax1.set_title("Total Minutes per Category", fontsize=10, color=COLOR_TEXT)
+    ax1.set_ylabel("Total Minutes", fontsize=8, color=COLOR_TEXT)
+    ax1.spines['right'].set_visible(False); ax1.spines['top'].set_visible(False)
+    ax1.grid(axis='y', linestyle='-', alpha=0.3); ax1.set_facecolor(COLOR_CARD_BG)
+    ax2 = fig.add_subplot(122)
+    shown = [(c, v, color) for c, v, color in zip(categories, values, CHART_COLORS) if v > 0]
+    if shown:
+        labels, pie_values, colors = zip(*shown)
+        ax2.pie(pie_values, labels=labels, autopct="%1.1f%%", startangle=90, colors=colors, wedgeprops={"edgecolor":"white",'linewidth':1}, textprops={'fontsize':8,'color':COLOR_TEXT})
+    ax2.set_title("Workout Distribution (%)", fontsize=10, color=COLOR_TEXT); ax2.axis('equal')
+    fig.tight_layout(pad=2.0)
+    buf = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(buf)
+    return buf.getvalue()
+
+
+def progress_png(categories, values, cache=None, dpi=100):
+    """PNG bytes for the chart, served from ``cache`` for identical inputs."""
+    if cache is None:
+        return render_progress_png(categories, values, dpi)
+    key = cache_key("progress-chart", CHART_VERSION, list(categories), list(values), dpi)
+    return cache.get_or_render(key, lambda: render_progress_png(categories, values, dpi), ".png")
@@ -0,0 +1,102 @@
+# app/encoding.py
+"""Response encodings: negotiated compression and optional MessagePack bodies.
+
+``init_app`` registers an ``after_request`` hook that compresses every
+compressible response with the client's preferred ``Accept-Encoding``
+(brotli when the ``brotli`` package is installed, else gzip).  Responses
+below ``COMPRESS_MIN_SIZE`` bytes are sent as-is; streamed responses are
+compressed chunk by chunk.  Compressed variants get their own strong ETag
+(``"<etag>-<encoding>"``), which ``http_cache.conditional`` also matches.
+
+``encode`` / ``request_payload`` let bulk endpoints speak
+``application/msgpack`` when the ``msgpack`` package is installed.
+"""
+import zlib
+
+from flask import current_app, jsonify, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; bulk endpoints fall back to JSON
+    msgpack = None
+
+ENCODINGS = ("br", "gzip")  # in order of preference
+MSGPACK_MIMETYPE = "application/msgpack"
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/x-ndjson", MSGPACK_MIMETYPE, "text/plain", "text/html")
+
+
+def supported_encodings():
+    return ENCODINGS if brotli is not None else tuple(e for e in ENCODINGS if e != "br")
+
+
+def _compressor(encoding):
+    """Return ``(compress, finish)`` callables for a streaming compressor."""
+    if encoding == "br":
+        c = brotli.Compressor(quality=current_app.config["COMPRESS_BROTLI_QUALITY"])
+        return c.process, c.finish
+    c = zlib.compressobj(current_app.config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)  # 31: gzip container
+    return c.compress, c.flush
+
+
+def _compress_stream(chunks, compress, finish):
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def compress_response(response):
+    if "Content-Encoding" in response.headers or response.status_code != 200:
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(supported_encodings())
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        compress, finish = _compressor(encoding)
+        response.response = _compress_stream(response.iter_encoded(), compress, finish)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+            return response
+        compress, finish = _compressor(encoding)
+        response.set_data(compress(data) + finish())
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def wants_msgpack():
+    return msgpack is not None and request.accept_mimetypes.best_match(
+        ["application/json", MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+
+def encode(payload, status=200):
+    """``jsonify`` that answers with MessagePack when the client prefers it."""
+    if wants_msgpack():
+        return current_app.response_class(msgpack.packb(payload), status=status, mimetype=MSGPACK_MIMETYPE)
+    return jsonify(payload), status
+
+
+def request_payload():
+    """Decode a JSON or (when available) MessagePack request body; None if unparseable."""
+    if msgpack is not None and request.mimetype == MSGPACK_MIMETYPE:
+        try:
+            return msgpack.unpackb(request.get_data())
+        except Exception:
+            return None
+    return request.get_json(silent=True)
+
+
+def init_app(app):
+    app.after_request(compress_response)
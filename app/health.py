@@ -0,0 +1,91 @@
+# app/health.py
+"""Readiness checks that run in the background and are served from memory.
+
+Checks are registered by name; a daemon thread runs them every
+``interval`` seconds and keeps the last result of each.  The
+``/healthcheck/ready`` view only reads that snapshot, so a probe never
+waits on the storage layer.  Results older than ``stale_after`` seconds
+count as failures, so a wedged checker thread makes the pod unready
+instead of leaving it ready forever.
+"""
+import os
+import tempfile
+import threading
+import time
+
+
+class ReadinessChecker:
+    def __init__(self, interval=5.0, stale_after=None):
+        self.interval = interval
+        self.stale_after = stale_after if stale_after is not None else 3 * interval
+        self._checks = {}
+        self._results = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, name, check):
+        """``check()`` returns a detail dict (or None) when healthy and raises otherwise."""
+        self._checks[name] = check
+
+    def run_checks(self):
+        for name, check in list(self._checks.items()):
+            start = time.monotonic()
+            try:
+                result = {"ok": True, **(check() or {})}
+            except Exception as e:
+                result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            result["duration_ms"] = round((time.monotonic() - start) * 1000, 2)
+            result["checked_at"] = time.time()
+            with self._lock:
+                self._results[name] = result
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="readiness-checks", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_checks()
+
+    def snapshot(self):
+        """Return ``(ready, {name: result})`` from the last completed run."""
+        now = time.time()
+        with self._lock:
+            results = {name: dict(result) for name, result in self._results.items()}
+        ready = bool(self._checks)
+        for name in self._checks:
+            result = results.setdefault(name, {"ok": False, "error": "not checked yet"})
+            if result["ok"] and now - result["checked_at"] > self.stale_after:
+                result.update(ok=False, error="stale result")
+            ready = ready and result["ok"]
+        return ready, results
+
+
+# ---------- Built-in checks ----------
+def storage_check(store):
+    def check():
+        store.ping()
+    return check
+
+
+def directory_writable_check(directory):
+    def check():
+        fd, path = tempfile.mkstemp(dir=directory, prefix=".ready-")
+        os.close(fd)
+        os.remove(path)
+    return check
+
+
+def queue_depth_check(depth, max_depth):
+    """Fail when ``depth()`` pending items exceed ``max_depth``."""
+    def check():
+        current = depth()
+        if current > max_depth:
+            raise RuntimeError(f"queue depth {current} exceeds {max_depth}")
+        return {"depth": current, "max_depth": max_depth}
+    return check
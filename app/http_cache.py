@@ -0,0 +1,51 @@
+# app/http_cache.py
+"""Conditional GET for read endpoints.
+
+``@conditional(version)`` computes a strong ETag from a cheap version value
+(usually the store's ``data_version`` counter) plus the request's path,
+query string and Accept header.  A matching ``If-None-Match`` is answered
+with 304 before the view runs, so nothing is queried or serialised.  Each
+route also declares its ``Cache-Control`` policy.
+"""
+import functools
+
+from flask import current_app, make_response, request
+
+from .encoding import ENCODINGS
+from .render_cache import cache_key
+
+REVALIDATE = "private, no-cache"  # clients may keep a copy but must revalidate it every time
+
+
+def make_etag(*parts):
+    return cache_key("etag", *parts)[:32]
+
+
+def conditional(version, cache_control=REVALIDATE):
+    """Decorate a view with ETag / ``If-None-Match`` handling.
+
+    ``version(**view_args)`` returns any JSON-serialisable value that
+    changes whenever the view's output would; ``None`` skips validation.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            value = version(**view_args)
+            etag = None if value is None else make_etag(
+                value, request.path, sorted(request.args.items(multi=True)), request.headers.get("Accept", ""))
+            # compressed variants carry "<etag>-<encoding>" (see app/encoding.py)
+            matched = etag is not None and next((tag for tag in (etag, *(f"{etag}-{e}" for e in ENCODINGS))
+                                                 if request.if_none_match.contains(tag)), None)
+            if matched:
+                response = current_app.response_class(status=304)
+                etag = matched
+            else:
+                response = make_response(view(**view_args))
+            if response.status_code in (200, 304):
+                if etag is not None:
+                    response.set_etag(etag)
+                response.headers["Cache-Control"] = cache_control
+                response.vary.add("Accept")
+            return response
+        return wrapper
+    return decorator
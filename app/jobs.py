@@ -0,0 +1,284 @@
+# app/jobs.py
+"""Background jobs: a SQLite-backed queue and a worker pool.
+
+The queue lives in its own SQLite file (``ACEEST_JOBS_DB``), so every
+process on the node -- gunicorn workers, the CLI, the Tk tracker -- shares
+one queue without an external broker.  A job is claimed in one IMMEDIATE
+transaction that also enforces the node-wide ``concurrency`` limit and
+requeues jobs whose lease expired (their worker died).  Running workers
+renew their lease, and a claim's attempt number is its token: once a job
+has been requeued, the old worker's complete/fail is ignored.  Failed
+attempts are retried with exponential backoff until ``max_attempts``.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+DEFAULT_JOBS_DB = os.path.join(os.path.expanduser("~"), ".aceest", "jobs.db")
+
+
+class JobQueue:
+    MIGRATIONS = (
+        """CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            available_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            lease_until REAL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs (status, available_at)",
+    )
+
+    def __init__(self, path=None, lease_seconds=600.0, retry_delay=2.0):
+        path = path or os.environ.get("ACEEST_JOBS_DB", DEFAULT_JOBS_DB)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self._lock = threading.RLock()
+        self._work = threading.Event()
+        # autocommit; claim() opens its own IMMEDIATE transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            for statement in self.MIGRATIONS[version:]:
+                self._conn.execute(statement)
+            self._conn.execute(f"PRAGMA user_version = {len(self.MIGRATIONS)}")
+
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = None if job["result"] is None else json.loads(job["result"])
+        del job["lease_until"]
+        return job
+
+    def enqueue(self, kind, payload=None, max_attempts=3):
+        job_id, now = uuid.uuid4().hex, time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, max_attempts, created_at, available_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload or {}, sort_keys=True), QUEUED, max_attempts, now, now))
+        self.notify()
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._job(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def depth(self):
+        """Number of jobs waiting to run."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    def claim(self, concurrency):
+        """Mark the next runnable job as running and return it, or None.
+
+        Returns None while ``concurrency`` jobs are already running in any
+        process sharing the queue.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                    "error = 'lease expired', lease_until = NULL, "
+                    "finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END "
+                    "WHERE status = ? AND lease_until < ?", (QUEUED, FAILED, now, RUNNING, now))
+                running = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (RUNNING,)).fetchone()[0]
+                row = None if running >= concurrency else self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? AND available_at <= ? ORDER BY available_at, created_at "
+                    "LIMIT 1", (QUEUED, now)).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, lease_until = ? "
+                        "WHERE id = ?", (RUNNING, now, now + self.lease_seconds, row["id"]))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return None if row is None else self.get(row["id"])
+
+    def renew(self, job_id, attempt):
+        """Extend a running claim's lease; False once the claim is no longer ours."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (time.time() + self.lease_seconds, job_id, RUNNING, attempt)).rowcount == 1
+
+    def complete(self, job_id, attempt, result):
+        """Record the claim's result; False (nothing written) if the claim was lost."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, lease_until = NULL "
+                "WHERE id = ? AND status = ? AND attempts = ?",
+                (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id, RUNNING, attempt)).rowcount == 1
+
+    def fail(self, job_id, attempt, error, retry=True):
+        """Record a failed attempt; requeue with backoff while attempts remain.
+
+        Returns False (nothing written) if the claim was lost.
+        """
+        now = time.time()
+        with self._lock:
+            job = self._conn.execute("SELECT max_attempts FROM jobs WHERE id = ? AND status = ? AND attempts = ?",
+                                     (job_id, RUNNING, attempt)).fetchone()
+            if job is None:
+                return False
+            if retry and attempt < job["max_attempts"]:
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_until = NULL WHERE id = ?",
+                    (QUEUED, error, now + delay, job_id))
+                self.notify()
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                    (FAILED, error, now, job_id))
+            return True
+
+    def notify(self):
+        """Wake this process's idle workers."""
+        self._work.set()
+
+    def wait_for_work(self, timeout):
+        """Block until a job is enqueued in this process or ``timeout`` passes."""
+        if self._work.wait(timeout):
+            self._work.clear()
+
+    def wait(self, job_id, timeout=30.0, interval=0.05):
+        """Poll until the job has finished (succeeded or failed) and return it."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in (SUCCEEDED, FAILED) or time.monotonic() >= deadline:
+                return job
+            time.sleep(interval)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobWorkerPool:
+    """Runs queued jobs on ``concurrency`` daemon threads.
+
+    ``handlers`` maps a job kind to ``handler(payload)``, whose
+    JSON-serialisable return value becomes the job result.
+    """
+
+    def __init__(self, queue, handlers, concurrency=2, poll_interval=1.0):
+        self.queue = queue
+        self.handlers = dict(handlers)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        while len(self._threads) < self.concurrency:
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self.queue.notify()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if not self.run_next():
+                self.queue.wait_for_work(self.poll_interval)
+
+    def run_next(self):
+        """Claim and run one job on the calling thread; returns False when none was runnable."""
+        job = self.queue.claim(self.concurrency)
+        if job is None:
+            return False
+        handler = self.handlers.get(job["kind"])
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job kind {job['kind']!r}")
+            result = handler(job["payload"])
+        except Exception as e:
+            self.queue.fail(job["id"], job["attempts"], f"{type(e).__name__}: {e}", retry=handler is not None)
+        else:
+            self.queue.complete(job["id"], job["attempts"], result)
+        finally:
+            done.set()
+            heartbeat.join()
+        return True
+
+    def _heartbeat(self, job, done):
+        # renew well before the lease runs out, so slow jobs aren't taken for dead ones
+        while not done.wait(self.queue.lease_seconds / 3):
+            if not self.queue.renew(job["id"], job["attempts"]):
+                return
+
+    def run_pending(self):
+        """Run runnable jobs on the calling thread until none are left; returns how many ran."""
+        count = 0
+        while self.run_next():
+            count += 1
+        return count
+
+
+# ---------- Job kinds served by the Flask app ----------
+def service_handlers(store, render_cache, reports_dir, max_report_workers=None):
+    import multiprocessing
+    from datetime import date
+
+    from .batch_reports import generate_weekly_reports
+    from .reports import weekly_report_pdf, week_bounds
+    from .workouts import recompute_calories
+
+    def weekly_report(payload):
+        regn_id = payload["regn_id"]
+        profile = store.get_member(regn_id)
+        if profile is None:
+            raise LookupError(f"Unknown member: {regn_id}")
+        week_start, week_end = week_bounds(date.fromisoformat(payload["date"]) if payload.get("date") else None)
+        pdf = weekly_report_pdf(profile, lambda: store.iter_sessions(regn_id, start_date=week_start, end_date=week_end),
+                                week_start, week_end, cache=render_cache)
+        # one file per run: a shared per-member name would let one job serve another's PDF
+        job_dir = os.path.join(reports_dir, "jobs")
+        os.makedirs(job_dir, exist_ok=True)
+        path = os.path.abspath(os.path.join(job_dir, f"{uuid.uuid4().hex}.pdf"))
+        with open(path, "wb") as f:
+            f.write(pdf)
+        return {"path": path, "bytes": len(pdf), "week_start": week_start, "week_end": week_end}
+
+    def weekly_reports_batch(payload):
+        day = date.fromisoformat(payload["date"]) if payload.get("date") else None
+        # spawn, not fork: this process runs request and job threads
+        return generate_weekly_reports(reports_dir, store=store, day=day,
+                                       workers=payload.get("workers", max_report_workers),
+                                       force=bool(payload.get("force")), mp_context=multiprocessing.get_context("spawn"))
+
+    def recompute(payload):
+        return {"updated": recompute_calories(store)}
+
+    return {"weekly_report": weekly_report, "weekly_reports_batch": weekly_reports_batch,
+            "recompute_calories": recompute}
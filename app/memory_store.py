@@ -0,0 +1,179 @@
+# app/memory_store.py
+"""Non-persistent, in-process workout store (``ACEEST_STORE_BACKEND=memory``).
+
+Members are spread over ``stripes`` locks by hash, so writers for different
+members almost never contend, and a write holds only its member's stripe.
+Readers take no lock at all: each member's state is an immutable snapshot
+that writers swap in with a single reference assignment, so a reader always
+sees a consistent member and never blocks a writer.  A snapshot doesn't copy
+the sessions: it holds a view of the member's first ``len()`` rows (see
+SessionColumns), and a write appends past that length and publishes a
+longer view, so its cost doesn't grow with the member's history.  Data
+lives only as long as the process, so it suits tests, benchmarks and
+demos; anything whose history must survive a restart (the tracker, the
+service) keeps the default SQLite backend.
+"""
+import itertools
+import threading
+
+from .records import Session, SessionColumns
+from .storage import CATEGORIES, WorkoutStore, empty_aggregates, empty_categories, to_epoch, ts_bounds
+
+DEFAULT_STRIPES = 64
+
+
+class _Member:
+    """One member's snapshot; never mutated once published (rows past ``len(columns)`` aren't part of it)."""
+    __slots__ = ("columns", "aggregates", "version", "profile")
+
+    def __init__(self, columns=None, aggregates=None, version=0, profile=None):
+        self.columns = columns if columns is not None else SessionColumns()
+        self.aggregates = aggregates or empty_aggregates()
+        self.version = version
+        self.profile = profile
+
+
+def _aggregate(sessions, base=None):
+    """Per-category totals of ``sessions``, added onto a copy of ``base`` when given."""
+    aggregates = {category: dict(totals) for category, totals in (base or empty_aggregates()).items()}
+    for session in sessions:
+        totals = aggregates[session.category]
+        totals["minutes"] += session.duration; totals["calories"] += session.calories; totals["count"] += 1
+    return aggregates
+
+
+class MemoryWorkoutStore(WorkoutStore):
+    path = ":memory:"  # can't be shared with other processes (see batch_reports)
+
+    def __init__(self, stripes=DEFAULT_STRIPES):
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._members = {}
+        self._writes = [0] * stripes  # per stripe, so the store-wide version needs no shared lock
+        self._ids = itertools.count(1)
+
+    def _stripe(self, regn_id):
+        return hash(regn_id) % len(self._stripes)
+
+    def _snapshot(self, regn_id):
+        return self._members.get(regn_id) or _Member()
+
+    def _update(self, regn_id, change):
+        """Publish ``change(current) -> (columns, aggregates, profile)`` as the member's next snapshot."""
+        stripe = self._stripe(regn_id)
+        with self._stripes[stripe]:
+            current = self._snapshot(regn_id)
+            columns, aggregates, profile = change(current)
+            self._members[regn_id] = _Member(columns, aggregates, current.version + 1, profile)
+            self._writes[stripe] += 1
+
+    # --- writes ---
+    def add(self, regn_id, category, entry):
+        self.add_many([(regn_id, category, entry)])
+
+    def add_many(self, rows):
+        by_member = {}
+        for regn_id, category, entry in rows:  # normalise every row before writing any
+            by_member.setdefault(regn_id, []).append(Session.from_entry(category, entry, next(self._ids)))
+        for regn_id, sessions in by_member.items():
+            def change(current, sessions=sessions):
+                return (current.columns.inserted(sessions), _aggregate(sessions, current.aggregates),
+                        current.profile)
+            self._update(regn_id, change)
+        return sum(len(sessions) for sessions in by_member.values())
+
+    def replace(self, regn_id, workouts):
+        sessions = [Session.from_entry(category, entry, next(self._ids))
+                    for category, entries in workouts.items() for entry in entries]
+        columns = SessionColumns(sessions)
+        self._update(regn_id, lambda current: (columns, _aggregate(sessions), current.profile))
+
+    def recalculate_calories(self, compute, chunk_size=50000):
+        updated = 0
+        for regn_id in list(self._members):
+            def change(current):
+                columns = current.columns
+                if not len(columns):
+                    return columns, current.aggregates, current.profile
+                size = len(columns)
+                burns = compute([CATEGORIES[code] for code in columns.categories[:size]], list(columns.durations[:size]),
+                                columns.weight_list())
+                columns = columns.with_calories(float(burn) for burn in burns)
+                return columns, _aggregate(columns), current.profile
+            self._update(regn_id, change)
+            updated += len(self._members[regn_id].columns)
+        return updated
+
+    def save_member(self, user_info):
+        profile = dict(user_info)
+        self._update(user_info["regn_id"], lambda current: (current.columns, current.aggregates, profile))
+
+    # --- lock-free snapshot reads ---
+    @staticmethod
+    def _rows(columns, start_date=None, end_date=None, category=None, start=None):
+        span = columns.span(*ts_bounds(start_date, end_date))
+        if start is not None:
+            span = range(max(span.start, start), span.stop)
+        if category is None:
+            return span
+        code = CATEGORIES.index(category) if category in CATEGORIES else -1
+        return (i for i in span if columns.categories[i] == code)
+
+    def sessions(self, regn_id, category=None, start_date=None, end_date=None):
+        columns = self._snapshot(regn_id).columns
+        return [(columns.category(i), columns.entry(i)) for i in self._rows(columns, start_date, end_date, category)]
+
+    def sessions_page(self, regn_id, after=None, limit=100, start_date=None, end_date=None, category=None):
+        columns = self._snapshot(regn_id).columns
+        rows = self._rows(columns, start_date, end_date, category, start=columns.after(to_epoch(after[0]), after[1]) if after else None)
+        return [(columns.ids[i], columns.category(i), columns.entry(i)) for i in itertools.islice(rows, limit)]
+
+    def totals(self, regn_id):
+        return {category: totals["minutes"] for category, totals in self._snapshot(regn_id).aggregates.items()}
+
+    def aggregates(self, regn_id):
+        return {category: dict(totals) for category, totals in self._snapshot(regn_id).aggregates.items()}
+
+    def range_signature(self, regn_id, start_date=None, end_date=None):
+        columns = self._snapshot(regn_id).columns
+        span = columns.span(*ts_bounds(start_date, end_date))
+        if not span:
+            return 0, None, None, None
+        return (len(span), max(columns.ids[span.start:span.stop]), sum(columns.durations[span.start:span.stop]),
+                sum(columns.calories[span.start:span.stop]))
+
+    def get_member(self, regn_id):
+        profile = self._snapshot(regn_id).profile
+        return None if profile is None else dict(profile)
+
+    def members(self, after=None, limit=None):
+        snapshot = dict(self._members)
+        ids = sorted(regn_id for regn_id, member in snapshot.items()
+                     if member.profile is not None and regn_id > (after or ""))
+        for regn_id in ids[:limit]:
+            yield regn_id, dict(snapshot[regn_id].profile)
+
+    def active_members(self, start_date=None, end_date=None):
+        bounds = ts_bounds(start_date, end_date)
+        snapshot = dict(self._members)
+        return sorted(regn_id for regn_id, member in snapshot.items() if member.columns.span(*bounds))
+
+    def data_version(self, regn_id=None):
+        if regn_id is None:
+            return sum(self._writes)  # each term only grows, so the sum never goes backwards
+        return self._snapshot(regn_id).version
+
+    # both views read the same snapshot columns
+    def sessions_by_category(self, regn_id):
+        columns = self._snapshot(regn_id).columns
+        grouped = empty_categories()
+        for i in range(len(columns)):
+            grouped[columns.category(i)].append(columns.entry(i))
+        return grouped
+
+    def sessions_by_date(self, regn_id, start_date=None, end_date=None):
+        columns = self._snapshot(regn_id).columns
+        days = {}
+        for i in self._rows(columns, start_date, end_date):
+            entry = columns.entry(i)
+            days.setdefault(entry["timestamp"][:10], empty_categories())[columns.category(i)].append(entry)
+        return days
@@ -0,0 +1,73 @@
+# app/metrics.py
+"""Prometheus metrics for the Flask service.
+
+Requests are timed in ``before_request``/``after_request`` and labelled by
+route template (``/members/<regn_id>/...``) rather than raw path, so label
+cardinality stays bounded.  Under gunicorn every worker process writes its
+samples to ``PROMETHEUS_MULTIPROC_DIR`` and ``/metrics`` aggregates the
+directory, so any worker can answer a scrape with service-wide numbers.
+The directory is cleaned on start and dead workers are reaped by the hooks
+in ``gunicorn.conf.py``.
+"""
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "aceest_http_request_duration_seconds", "Request latency by route.",
+    ["method", "endpoint"], buckets=LATENCY_BUCKETS)
+REQUESTS = Counter(
+    "aceest_http_requests_total", "Requests by route and status code.",
+    ["method", "endpoint", "status"])
+IN_FLIGHT = Gauge(
+    "aceest_http_requests_in_flight", "Requests currently being served.",
+    ["endpoint"], multiprocess_mode="livesum")
+
+
+def _endpoint():
+    return request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_endpoint = _endpoint()
+    IN_FLIGHT.labels(g.metrics_endpoint).inc()
+
+
+def _after_request(response):
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        REQUEST_LATENCY.labels(request.method, g.metrics_endpoint).observe(time.perf_counter() - start)
+        REQUESTS.labels(request.method, g.metrics_endpoint, str(response.status_code)).inc()
+    return response
+
+
+def _teardown_request(exc):
+    # runs even when a view raised, so the in-flight gauge can't leak
+    endpoint = g.pop("metrics_endpoint", None)
+    if endpoint is not None:
+        IN_FLIGHT.labels(endpoint).dec()
+        if "metrics_start" in g:  # after_request was skipped by an unhandled error
+            REQUESTS.labels(request.method, endpoint, "500").inc()
+
+
+def metrics_view():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
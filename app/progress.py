@@ -0,0 +1,47 @@
+# app/progress.py
+"""Progress series for goal widgets, read from the store's daily/weekly rollups.
+
+A 52-week series touches at most 52 rollup rows per category, however many
+sessions the member has logged.
+"""
+import re
+from datetime import date, timedelta
+
+from .storage import empty_aggregates, period_start
+
+MAX_PERIODS = 366
+_RANGE = re.compile(r"^(\d+)([dw])$")
+
+
+def parse_range(value):
+    """Parse ``"30d"`` / ``"12w"`` into ``(period, count)``."""
+    match = _RANGE.match(str(value).strip().lower())
+    if not match or not 1 <= int(match.group(1)) <= MAX_PERIODS:
+        raise ValueError(f"range must look like 30d or 12w (1 to {MAX_PERIODS} periods).")
+    return ("day" if match.group(2) == "d" else "week"), int(match.group(1))
+
+
+def progress_series(store, regn_id, period, count, end_date=None, weekly_goal=None):
+    """Return ``count`` consecutive periods ending with the one containing ``end_date`` (default today).
+
+    Each point has the period ``start`` plus minutes/calories/count totals
+    and the per-category breakdown; empty periods are zero-filled.  Weekly
+    points also get ``goal_pct`` when a ``weekly_goal`` (kcal) is given.
+    """
+    step = timedelta(days=1 if period == "day" else 7)
+    last = date.fromisoformat(period_start(end_date or date.today().isoformat(), period))
+    first = last - step * (count - 1)
+    rollups = store.rollups(regn_id, period, first.isoformat(), last.isoformat())
+    series = []
+    for i in range(count):
+        start = (first + step * i).isoformat()
+        categories = rollups.get(start) or empty_aggregates()
+        point = {"start": start,
+                 "minutes": sum(t["minutes"] for t in categories.values()),
+                 "calories": round(sum(t["calories"] for t in categories.values()), 2),
+                 "count": sum(t["count"] for t in categories.values()),
+                 "categories": categories}
+        if weekly_goal and period == "week":
+            point["goal_pct"] = round(100 * point["calories"] / weekly_goal, 1)
+        series.append(point)
+    return series
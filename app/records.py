@@ -0,0 +1,172 @@
+# app/records.py
+"""Compact in-memory session records.
+
+A session dict with a formatted timestamp costs several hundred bytes once
+its keys, strings and floats are counted.  ``Session`` holds the same data
+in ``__slots__`` with an interned exercise name, an epoch-second timestamp
+and a category code; ``SessionColumns`` stores many sessions column-wise in
+``array`` buffers (about 45 bytes per session), and the per-category and
+per-day views are built from one shared set of columns instead of copies.
+"""
+import bisect
+import math
+import sys
+from array import array
+
+from .storage import CATEGORIES, from_epoch, normalize_timestamp, to_epoch
+from .workouts import CATEGORY_CODES
+
+_NO_WEIGHT = math.nan  # weights column value for "not recorded"
+
+
+class Session:
+    __slots__ = ("session_id", "category_code", "exercise", "duration", "calories", "ts", "weight")
+
+    def __init__(self, session_id, category_code, exercise, duration, calories, ts, weight=None):
+        self.session_id = session_id
+        self.category_code = category_code
+        self.exercise = sys.intern(exercise)
+        self.duration = duration
+        self.calories = calories
+        self.ts = ts
+        self.weight = weight
+
+    @classmethod
+    def from_entry(cls, category, entry, session_id=0):
+        """Build a record from a tracker session dict (see WorkoutStore)."""
+        if category not in CATEGORY_CODES:
+            raise ValueError(f"Unknown category: {category!r}")
+        timestamp, _ = normalize_timestamp(entry.get("timestamp"))
+        weight = entry.get("weight")
+        return cls(session_id, CATEGORY_CODES[category], entry["exercise"], int(entry["duration"]),
+                   float(entry["calories"]), to_epoch(timestamp), None if weight is None else float(weight))
+
+    @property
+    def category(self):
+        return CATEGORIES[self.category_code]
+
+    @property
+    def timestamp(self):
+        return from_epoch(self.ts)
+
+    def sort_key(self):
+        return self.ts, self.session_id
+
+    def as_entry(self):
+        return {"exercise": self.exercise, "duration": self.duration, "calories": self.calories,
+                "timestamp": self.timestamp}
+
+
+class SessionColumns:
+    """Sessions stored column-wise and ordered by ``(ts, session_id)``.
+
+    A SessionColumns is a view of its first ``len()`` rows and never changes:
+    ``inserted()`` appends in-order sessions to the shared arrays past the
+    view's end (amortised O(1) each) and returns a longer view, so a reader
+    keeps using an older one without a lock.  Back-dated sessions, and
+    ``with_calories()``, build new arrays instead.
+    """
+    __slots__ = ("ids", "ts", "categories", "durations", "calories", "weights", "exercises", "_size")
+
+    def __init__(self, sessions=()):
+        self.ids, self.ts, self.categories = array("q"), array("q"), array("b")
+        self.durations, self.calories, self.weights = array("i"), array("d"), array("d")
+        self.exercises = []  # interned, so repeated names share one string
+        self._size = 0
+        for session in sorted(sessions, key=Session.sort_key):
+            self._append(session)
+
+    def _append(self, session):
+        self.ids.append(session.session_id); self.ts.append(session.ts)
+        self.categories.append(session.category_code); self.durations.append(session.duration)
+        self.calories.append(session.calories)
+        self.weights.append(_NO_WEIGHT if session.weight is None else session.weight)
+        self.exercises.append(session.exercise)
+        self._size += 1
+
+    def _insert(self, i, session):
+        self.ids.insert(i, session.session_id); self.ts.insert(i, session.ts)
+        self.categories.insert(i, session.category_code); self.durations.insert(i, session.duration)
+        self.calories.insert(i, session.calories)
+        self.weights.insert(i, _NO_WEIGHT if session.weight is None else session.weight)
+        self.exercises.insert(i, session.exercise)
+        self._size += 1
+
+    def _view(self, size):
+        view = SessionColumns.__new__(SessionColumns)
+        for name in ("ids", "ts", "categories", "durations", "calories", "weights", "exercises"):
+            setattr(view, name, getattr(self, name))
+        view._size = size
+        return view
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if not -self._size <= i < self._size:
+            raise IndexError("session index out of range")
+        i %= self._size
+        weight = self.weights[i]
+        return Session(self.ids[i], self.categories[i], self.exercises[i], self.durations[i], self.calories[i],
+                       self.ts[i], None if math.isnan(weight) else weight)
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def copy(self):
+        """Columns with their own arrays holding this view's rows."""
+        columns = SessionColumns()
+        for name in ("ids", "ts", "categories", "durations", "calories", "weights"):
+            setattr(columns, name, getattr(self, name)[:self._size])
+        columns.exercises = self.exercises[:self._size]
+        columns._size = self._size
+        return columns
+
+    def inserted(self, sessions):
+        """Columns holding these rows and ``sessions``; this view is unchanged."""
+        sessions = sorted(sessions, key=Session.sort_key)
+        if not sessions:
+            return self
+        in_order = not self._size or (self.ts[self._size - 1], self.ids[self._size - 1]) < sessions[0].sort_key()
+        if in_order and len(self.ids) == self._size:  # nobody has appended past this view yet
+            grown = self._view(self._size)
+            for session in sessions:
+                grown._append(session)
+            return grown
+        # back-dated entries (or a stale view): copy the arrays once and splice each session in
+        columns = self.copy()
+        for session in sessions:
+            columns._insert(columns.after(session.ts, session.session_id), session)
+        return columns
+
+    def with_calories(self, burns):
+        columns = self.copy()
+        columns.calories = array("d", burns)
+        return columns
+
+    def span(self, start_ts=None, end_ts=None):
+        """Row indices with ``start_ts <= ts < end_ts``."""
+        lo = 0 if start_ts is None else bisect.bisect_left(self.ts, start_ts, 0, self._size)
+        hi = self._size if end_ts is None else bisect.bisect_left(self.ts, end_ts, 0, self._size)
+        return range(lo, max(lo, hi))
+
+    def after(self, ts, session_id):
+        """Index of the first row sorting after ``(ts, session_id)``."""
+        lo, hi = bisect.bisect_left(self.ts, ts, 0, self._size), bisect.bisect_right(self.ts, ts, 0, self._size)
+        return bisect.bisect_right(self.ids, session_id, lo, hi)
+
+    def category(self, i):
+        return CATEGORIES[self.categories[i]]
+
+    def entry(self, i):
+        return {"exercise": self.exercises[i], "duration": self.durations[i], "calories": self.calories[i],
+                "timestamp": from_epoch(self.ts[i])}
+
+    def weight_list(self):
+        return [None if math.isnan(w) else w for w in self.weights[:self._size]]
+
+    @property
+    def nbytes(self):
+        """Bytes held by this view's rows (interned exercise strings not included)."""
+        arrays = (self.ids, self.ts, self.categories, self.durations, self.calories, self.weights)
+        return sum(a.itemsize for a in arrays) * self._size + 8 * self._size
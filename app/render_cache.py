@@ -0,0 +1,111 @@
+# app/render_cache.py
+"""Content-addressed on-disk cache for rendered PDFs and chart images.
+
+Entries are named by a SHA-256 of their inputs, so identical inputs return
+the stored bytes unchanged.  The directory is kept under ``max_bytes`` by
+evicting least-recently-used files (recency is the file mtime, which hits
+refresh, so it survives restarts).  Several processes may share the
+directory, so eviction re-scans it rather than trusting this process's own
+tally, and a file another process removed is simply a miss.
+"""
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".aceest", "cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(*parts):
+    """Stable hash of JSON-serialisable parts (dicts are key-sorted)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RenderCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get("ACEEST_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """Rebuild the LRU index from the directory, which other processes also write to."""
+        rank = {name: i for i, name in enumerate(self._entries)}  # our own order breaks mtime ties
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith("."):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except OSError:  # removed by another process since listdir()
+                continue
+            if stat.S_ISREG(info.st_mode):
+                entries.append((info.st_mtime_ns, rank.get(name, -1), name, info.st_size))
+        self._entries = OrderedDict((name, size) for _, _, name, size in sorted(entries))  # LRU first
+        self._size = sum(self._entries.values())
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def get(self, key, suffix=""):
+        name = f"{key}{suffix}"
+        path = self._path(key, suffix)
+        with self._lock:
+            try:
+                os.utime(path)  # first, so another process's eviction can't strand a half-finished hit
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                self._size -= self._entries.pop(name, 0)
+                self.misses += 1
+                return None
+            self.hits += 1
+            if name in self._entries:
+                self._entries.move_to_end(name)
+            return data
+
+    def put(self, key, data, suffix=""):
+        name = f"{key}{suffix}"
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            os.replace(tmp, self._path(key, suffix))
+            self._size += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+
+    def _evict(self):
+        self._scan()  # our tally misses other processes' writes, hits and evictions
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:  # another process got there first
+                continue
+            self.evictions += 1
+
+    def get_or_render(self, key, render, suffix=""):
+        """Return cached bytes for ``key`` or store and return ``render()``."""
+        data = self.get(key, suffix)
+        if data is None:
+            data = render()
+            self.put(key, data, suffix)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
@@ -0,0 +1,139 @@
+# app/reports.py
+"""Weekly PDF report engine.
+
+Sessions are consumed from an iterator (e.g. ``store.iter_sessions``) one
+page at a time: each page gets its own table with the header row repeated,
+so only ``rows_per_page`` rows are held in memory however long the history.
+reportlab is imported on first render.  weekly_report_pdf() adds the
+content-addressed RenderCache in front of rendering.
+"""
+import hashlib
+import io
+import json
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from .render_cache import cache_key
+
+TEMPLATE_VERSION = 1
+ROWS_PER_PAGE = 32
+TABLE_HEADER = ["Category", "Exercise", "Duration(min)", "Calories(kcal)", "Date"]
+COL_WIDTHS = [80, 150, 80, 80, 80]
+IMPORT_TIMINGS = {}  # seconds spent importing reportlab, for startup reports
+
+
+def _reportlab():
+    start = time.perf_counter()
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import Table, TableStyle
+    from reportlab.lib import colors
+    IMPORT_TIMINGS.setdefault("reportlab", time.perf_counter() - start)
+    return SimpleNamespace(canvas=canvas, A4=A4, Table=Table, TableStyle=TableStyle, colors=colors)
+
+
+def week_bounds(day=None):
+    """Return the ISO ``(monday, sunday)`` dates of the week containing ``day``."""
+    day = day or date.today()
+    monday = day - timedelta(days=day.weekday())
+    return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+
+
+def report_filename(user_info):
+    return f"{user_info['name'].replace(' ','_')}_weekly_report.pdf"
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _draw_member_header(c, height, user_info, week_start, week_end):
+    c.setFont("Helvetica-Bold", 16); c.drawString(50, height-50, f"Weekly Fitness Report - {user_info['name']}")
+    c.setFont("Helvetica", 11)
+    c.drawString(50, height-80, f"Week: {week_start} to {week_end}")
+    c.drawString(50, height-100, f"Regn-ID: {user_info['regn_id']} | Age: {user_info['age']} | Gender: {user_info['gender']}")
+    c.drawString(50, height-120, f"Height: {user_info['height']} cm | Weight: {user_info['weight']} kg | BMI: {user_info['bmi']:.1f} | BMR: {user_info['bmr']:.0f} kcal/day")
+    return height - 150
+
+
+def _draw_continuation_header(c, height, user_info, week_start, week_end):
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, height-50, f"Weekly Fitness Report - {user_info['name']} ({week_start} to {week_end}, continued)")
+    return height - 70
+
+
+def _draw_footer(c, width, page):
+    c.setFont("Helvetica", 9); c.drawRightString(width-50, 30, f"Page {page}")
+
+
+def render_weekly_report(out, user_info, sessions, week_start, week_end, rows_per_page=ROWS_PER_PAGE):
+    """Write a paginated weekly report for ``(category, entry)`` sessions to ``out``.
+
+    ``out`` is a filename or a binary file object.  Returns the page count.
+    """
+    rl = _reportlab()
+    c = rl.canvas.Canvas(out, pagesize=rl.A4); width, height = rl.A4
+    style = rl.TableStyle([("BACKGROUND",(0,0),(-1,0),rl.colors.lightblue),("GRID",(0,0),(-1,-1),0.5,rl.colors.black)])
+    page = 1
+    y = _draw_member_header(c, height, user_info, week_start, week_end)
+    _draw_footer(c, width, page)
+    minutes = calories = count = 0
+    for rows in chunked(sessions, rows_per_page):
+        if count:
+            c.showPage(); page += 1
+            y = _draw_continuation_header(c, height, user_info, week_start, week_end)
+            _draw_footer(c, width, page)
+        table_data = [TABLE_HEADER]
+        for cat, e in rows:
+            table_data.append([cat, e['exercise'], str(e['duration']), f"{e['calories']:.1f}", e['timestamp'][:10]])
+            minutes += e['duration']; calories += e['calories']; count += 1
+        table = rl.Table(table_data, colWidths=COL_WIDTHS, repeatRows=1)
+        table.setStyle(style)
+        _, table_height = table.wrapOn(c, width-100, y)
+        table.drawOn(c, 50, y-table_height)
+        y -= table_height + 25
+    if y < 80:
+        c.showPage(); page += 1
+        y = _draw_continuation_header(c, height, user_info, week_start, week_end)
+        _draw_footer(c, width, page)
+    c.setFont("Helvetica-Bold", 11)
+    if not count:
+        c.drawString(50, y, "No sessions logged this week.")
+    else:
+        goal = user_info.get("weekly_cal_goal")
+        goal_text = f" | Goal: {calories / goal:.0%} of {goal} kcal" if goal else ""
+        c.drawString(50, y, f"Week total: {count} sessions | {minutes} min | {calories:.0f} kcal{goal_text}")
+    c.save()
+    return page
+
+
+def weekly_report_key(user_info, sessions, week_start, week_end):
+    """Cache key over (user_info, the week's sessions, template version), hashed as rows stream by."""
+    digest = hashlib.sha256(cache_key("weekly-report", TEMPLATE_VERSION, user_info, week_start, week_end).encode())
+    for category, entry in sessions:
+        digest.update(json.dumps([category, entry], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def weekly_report_pdf(user_info, sessions_factory, week_start, week_end, cache=None):
+    """Return the report PDF bytes, served from ``cache`` when the inputs are unchanged.
+
+    ``sessions_factory()`` must return a fresh session iterator; it is called
+    once to compute the key and once more only on a cache miss.
+    """
+    def render():
+        buf = io.BytesIO()
+        render_weekly_report(buf, user_info, sessions_factory(), week_start, week_end)
+        return buf.getvalue()
+    if cache is None:
+        return render()
+    key = weekly_report_key(user_info, sessions_factory(), week_start, week_end)
+    return cache.get_or_render(key, render, ".pdf")
@@ -1,9 +1,90 @@
 # app/routes.py
-from flask import Blueprint, jsonify, request, current_app
+import base64
+import json
+from datetime import date
+
+from flask import Blueprint, Response, jsonify, request, current_app, send_file, url_for
+
+from .charts import progress_png
+from .encoding import encode, request_payload
+from .http_cache import conditional
+from .progress import parse_range, progress_series
+from .reports import report_filename, weekly_report_pdf, week_bounds
+from .storage import normalize_timestamp
+from .workouts import validate_workout, validate_workouts
 
 bp = Blueprint('main', __name__)
 
+def get_store():
+    return current_app.extensions["workout_store"]
+
+def get_render_cache():
+    return current_app.extensions["render_cache"]
+
+def get_jobs():
+    return current_app.extensions["job_queue"]
+
+# ETag versions for @conditional: the member's write counter, plus today's date
+# for views whose default window ends today
+def member_version(regn_id):
+    return get_store().data_version(regn_id)
+
+def member_version_today(regn_id):
+    return [get_store().data_version(regn_id), date.today().isoformat()]
+
+# Page cursors are the opaque, url-safe encoding of the last row's sort key.
+def encode_cursor(*key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor, *parsers):
+    """Sort key from a cursor; each part must pass the matching ``cursor_*`` parser."""
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(key, list) or len(key) != len(parsers):
+            raise ValueError
+        return tuple(parse(part) for parse, part in zip(parsers, key))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Invalid cursor.") from None
+
+def cursor_str(part):
+    if not isinstance(part, str):
+        raise ValueError
+    return part
+
+def cursor_timestamp(part):
+    return normalize_timestamp(cursor_str(part))[0]
+
+def cursor_id(part):
+    if isinstance(part, bool) or not isinstance(part, int) or not 0 <= part < 2 ** 63:
+        raise ValueError
+    return part
+
+def page_limit():
+    limit = request.args.get("limit", current_app.config["DEFAULT_PAGE_SIZE"])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer.") from None
+    if not 1 <= limit <= current_app.config["MAX_PAGE_SIZE"]:
+        raise ValueError(f"limit must be between 1 and {current_app.config['MAX_PAGE_SIZE']}.")
+    return limit
+
+def date_arg(name):
+    value = request.args.get(name)
+    try:
+        return date.fromisoformat(value).isoformat() if value else None
+    except ValueError:
+        raise ValueError(f"{name} must be YYYY-MM-DD.") from None
+
+def missing_dependency(error, feature):
+    # reportlab / matplotlib are imported on first render; without them the feature is down, not broken
+    package = (error.name or "a required package").split(".")[0]
+    return jsonify({"error": f"{feature} are unavailable on this server: {package} is not installed."}), 503
+
 @bp.route('/', methods=['GET'])
+@conditional(lambda: "v1.3", cache_control="public, max-age=300")
 def home():
     return jsonify({
         "service": "ACEest Fitness & Gym",
@@ -18,6 +99,213 @@ def liveness():
 
 @bp.route('/healthcheck/ready', methods=['GET'])
 def readiness():
-    # readiness: example check for dependencies; here we assume ready
-    # Replace with DB/minikube checks later
-    return jsonify({"status": "ready"}), 200
+    # readiness: last results of the background dependency checks (app/health.py);
+    # nothing is checked on the request thread
+    ready, checks = current_app.extensions["readiness"].snapshot()
+    return jsonify({"status": "ready" if ready else "not ready", "checks": checks}), 200 if ready else 503
+
+@bp.route('/workouts', methods=['POST'])
+def add_workout():
+    payload = request.get_json(silent=True)
+    try:
+        regn_id, category, entry = validate_workout(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    get_store().add(regn_id, category, entry)
+    return jsonify({"regn_id": regn_id, "category": category, **entry}), 201
+
+@bp.route('/workouts/batch', methods=['POST'])
+def add_workouts_batch():
+    payload = request_payload()
+    items = payload.get("workouts") if isinstance(payload, dict) else payload
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Expected a non-empty list of workouts."}), 400
+    limit = current_app.config["MAX_BATCH_SIZE"]
+    if len(items) > limit:
+        return jsonify({"error": f"Batch too large: {len(items)} > {limit} workouts."}), 413
+    rows, errors = validate_workouts(items)
+    if errors:
+        # all-or-nothing: nothing is written when any entry is invalid
+        return encode({"error": "Invalid workouts in batch.", "details": errors}, 400)
+    inserted = get_store().add_many(rows)
+    return encode({"inserted": inserted}, 201)
+
+@bp.route('/members', methods=['GET'])
+@conditional(lambda: get_store().data_version())
+def list_members():
+    try:
+        after = decode_cursor(request.args.get("cursor"), cursor_str)
+        limit = page_limit()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    rows = list(get_store().members(after=after[0] if after else None, limit=limit))
+    next_cursor = encode_cursor(rows[-1][0]) if len(rows) == limit else None
+    return encode({"members": [profile for _, profile in rows], "next_cursor": next_cursor})
+
+@bp.route('/members/<regn_id>/workouts', methods=['GET'])
+@conditional(member_version)
+def member_workouts(regn_id):
+    try:
+        after = decode_cursor(request.args.get("cursor"), cursor_timestamp, cursor_id)
+        limit = page_limit()
+        start_date, end_date = date_arg("start"), date_arg("end")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    store = get_store()
+    as_json = lambda session_id, category, entry: {"id": session_id, "category": category, **entry}
+
+    if request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"]) == "application/x-ndjson":
+        # full history from the cursor on, one page in memory at a time
+        def stream(after):
+            while True:
+                rows = store.sessions_page(regn_id, after, limit, start_date, end_date)
+                for row in rows:
+                    yield json.dumps(as_json(*row)) + "\n"
+                if len(rows) < limit:
+                    return
+                after = (rows[-1][2]["timestamp"], rows[-1][0])
+        return Response(stream(after), mimetype="application/x-ndjson")
+
+    rows = store.sessions_page(regn_id, after, limit, start_date, end_date)
+    next_cursor = encode_cursor(rows[-1][2]["timestamp"], rows[-1][0]) if len(rows) == limit else None
+    return encode({"regn_id": regn_id, "workouts": [as_json(*row) for row in rows], "next_cursor": next_cursor})
+
+def report_options(options):
+    """Validated ``date``/``workers``/``force`` job payload from a report request body."""
+    if not isinstance(options, dict):
+        raise ValueError("Expected a JSON object.")
+    payload = {}
+    if options.get("date") is not None:
+        try:
+            payload["date"] = date.fromisoformat(options["date"]).isoformat()
+        except (TypeError, ValueError):
+            raise ValueError("date must be YYYY-MM-DD.") from None
+    if "workers" in options:
+        workers, limit = options["workers"], current_app.config["MAX_REPORT_WORKERS"]
+        if isinstance(workers, bool) or not isinstance(workers, int) or not 0 <= workers <= limit:
+            raise ValueError(f"workers must be an integer between 0 and {limit}.")
+        payload["workers"] = workers
+    if "force" in options:
+        payload["force"] = bool(options["force"])
+    return payload
+
+@bp.route('/reports/weekly/batch', methods=['POST'])
+def weekly_reports_batch():
+    # rendered by the job workers (their own process pool), never on the request thread
+    try:
+        payload = report_options(request_payload() if request.content_length else {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return enqueue_job("weekly_reports_batch", payload)
+
+REPORT_JOB_KINDS = ("weekly_report", "weekly_reports_batch")
+
+def public_result(value):
+    # report file paths are server-side detail; clients download through result_url
+    if isinstance(value, dict):
+        return {key: public_result(item) for key, item in value.items() if key != "path"}
+    if isinstance(value, list):
+        return [public_result(item) for item in value]
+    return value
+
+def job_json(job):
+    view = {key: job[key] for key in ("id", "kind", "status", "attempts", "max_attempts", "error",
+                                      "created_at", "started_at", "finished_at")}
+    view["status_url"] = url_for("main.report_job", job_id=job["id"])
+    if job["status"] == "succeeded":
+        view["result"] = public_result(job["result"])
+        if job["kind"] == "weekly_report":
+            view["result_url"] = url_for("main.report_job_result", job_id=job["id"])
+    return view
+
+@bp.route('/reports', methods=['POST'])
+def enqueue_report():
+    # queue the render and answer at once; clients poll status_url
+    options = request_payload() if request.content_length else {}
+    try:
+        payload = report_options(options)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    kind = options.get("kind", "weekly_report")
+    if kind not in REPORT_JOB_KINDS:
+        return jsonify({"error": f"kind must be one of: {', '.join(REPORT_JOB_KINDS)}."}), 400
+    if kind == "weekly_report":
+        regn_id = str(options.get("regn_id") or "").strip()
+        if not regn_id:
+            return jsonify({"error": "regn_id is required."}), 400
+        if get_store().get_member(regn_id) is None:
+            return jsonify({"error": f"Unknown member: {regn_id}"}), 404
+        payload["regn_id"] = regn_id
+    return enqueue_job(kind, payload)
+
+def enqueue_job(kind, payload):
+    jobs = get_jobs()
+    if jobs.depth() >= current_app.config["JOB_QUEUE_MAX_DEPTH"]:
+        return jsonify({"error": "Report queue is full, retry later."}), 503, {"Retry-After": "30"}
+    job_id = jobs.enqueue(kind, payload, max_attempts=current_app.config["JOB_MAX_ATTEMPTS"])
+    view = job_json(jobs.get(job_id))
+    return jsonify(view), 202, {"Location": view["status_url"]}
+
+@bp.route('/reports/<job_id>', methods=['GET'])
+def report_job(job_id):
+    job = get_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(job_json(job)), 200
+
+@bp.route('/reports/<job_id>/result', methods=['GET'])
+def report_job_result(job_id):
+    job = get_jobs().get(job_id)
+    if job is None or job["kind"] != "weekly_report":
+        return jsonify({"error": f"Unknown report job: {job_id}"}), 404
+    if job["status"] != "succeeded":
+        return jsonify({"error": f"Report is {job['status']}.", "status_url": url_for("main.report_job", job_id=job_id)}), 409
+    return send_file(job["result"]["path"], mimetype="application/pdf", as_attachment=True,
+                     download_name=f"{job['payload']['regn_id']}_{job['result']['week_start']}_weekly_report.pdf")
+
+@bp.route('/members/<regn_id>/reports/weekly', methods=['GET'])
+@conditional(member_version_today)
+def member_weekly_report(regn_id):
+    store = get_store()
+    profile = store.get_member(regn_id)
+    if profile is None:
+        return jsonify({"error": f"Unknown member: {regn_id}"}), 404
+    try:
+        day = date.fromisoformat(request.args["date"]) if request.args.get("date") else None
+    except ValueError:
+        return jsonify({"error": "date must be YYYY-MM-DD."}), 400
+    week_start, week_end = week_bounds(day)
+    try:
+        pdf = weekly_report_pdf(profile, lambda: store.iter_sessions(regn_id, start_date=week_start, end_date=week_end),
+                                week_start, week_end, cache=get_render_cache())
+    except ImportError as e:
+        return missing_dependency(e, "PDF reports")
+    return Response(pdf, mimetype="application/pdf",
+                    headers={"Content-Disposition": f'attachment; filename="{report_filename(profile)}"'})
+
+@bp.route('/members/<regn_id>/progress.png', methods=['GET'])
+@conditional(member_version)
+def member_progress_chart(regn_id):
+    totals = get_store().totals(regn_id)
+    try:
+        png = progress_png(list(totals.keys()), list(totals.values()), cache=get_render_cache())
+    except ImportError as e:
+        return missing_dependency(e, "Progress charts")
+    return Response(png, mimetype="image/png")
+
+@bp.route('/members/<regn_id>/progress', methods=['GET'])
+@conditional(member_version_today)
+def member_progress(regn_id):
+    try:
+        period, count = parse_range(request.args.get("range", "12w"))
+        end_date = date_arg("end")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    store = get_store()
+    goal = (store.get_member(regn_id) or {}).get("weekly_cal_goal")
+    series = progress_series(store, regn_id, period, count, end_date, weekly_goal=goal)
+    return jsonify({"regn_id": regn_id, "period": period, "weekly_cal_goal": goal, "periods": series}), 200
+
+@bp.route('/cache/stats', methods=['GET'])
+def render_cache_stats():
+    return jsonify(get_render_cache().stats()), 200
@@ -0,0 +1,543 @@
+# app/storage.py
+"""Persistent workout storage shared by the Tk tracker and the Flask service.
+
+The store is pluggable: backends register a factory under a name and
+``open_store()`` picks one from its arguments or the environment
+(``ACEEST_STORE_BACKEND`` / ``ACEEST_DB_PATH``).  SQLite in WAL mode is the
+default backend so several gunicorn workers can read while one writes.
+"""
+import calendar
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+CATEGORIES = ("Warm-up", "Workout", "Cool-down")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".aceest", "workouts.db")
+
+
+def normalize_timestamp(value):
+    """Return ``(timestamp, date_iso)`` for a datetime or timestamp string.
+
+    Accepts the tracker's ``"%Y-%m-%d %H:%M:%S"`` format as well as ISO-8601
+    (``datetime.isoformat()``) strings.  Times with a UTC offset (or ``Z``)
+    are converted to local wall-clock time, which is what naive times mean.
+    """
+    if value is None:
+        value = datetime.now()
+    if not isinstance(value, datetime):
+        value = str(value).strip()
+        value = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.strftime(TIMESTAMP_FORMAT), value.date().isoformat()
+
+
+def to_epoch(timestamp):
+    """Whole seconds from 1970-01-01 to a ``TIMESTAMP_FORMAT`` wall-clock time (no timezone applied)."""
+    return calendar.timegm(datetime.fromisoformat(timestamp).timetuple())
+
+
+def from_epoch(seconds):
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(seconds))
+
+
+def ts_bounds(start_date=None, end_date=None):
+    """Epoch-second bounds ``[start, end)`` covering an inclusive ISO date range (None = open)."""
+    start = None if start_date is None else calendar.timegm(date.fromisoformat(start_date).timetuple())
+    end = None if end_date is None else calendar.timegm(date.fromisoformat(end_date).timetuple()) + 86400
+    return start, end
+
+
+def empty_categories():
+    return {cat: [] for cat in CATEGORIES}
+
+
+def empty_aggregates():
+    return {cat: {"minutes": 0, "calories": 0.0, "count": 0} for cat in CATEGORIES}
+
+
+ROLLUP_PERIODS = ("day", "week")
+
+
+def period_start(day_iso, period):
+    """Return the ISO date that keys ``day_iso``'s rollup: the day itself or its week's Monday."""
+    if period == "day":
+        return day_iso
+    if period == "week":
+        day = date.fromisoformat(day_iso)
+        return (day - timedelta(days=day.weekday())).isoformat()
+    raise ValueError(f"Unknown rollup period: {period!r}")
+
+
+# Rollup tables keyed by (regn_id, period start, category), with the SQL for a session's period start.
+_ROLLUP_TABLES = (("daily_rollups", "date", "{r}.date"),
+                  ("weekly_rollups", "week_start", "date({r}.date, 'weekday 0', '-6 days')"))
+
+
+def _rollup_table(table, column):
+    return f"""CREATE TABLE IF NOT EXISTS {table} (
+            regn_id TEXT NOT NULL,
+            {column} TEXT NOT NULL,
+            category TEXT NOT NULL,
+            minutes INTEGER NOT NULL,
+            calories REAL NOT NULL,
+            sessions INTEGER NOT NULL,
+            PRIMARY KEY (regn_id, {column}, category)
+        ) WITHOUT ROWID"""
+
+
+def _rollup_backfill(table, column, period):
+    return (f"INSERT INTO {table} (regn_id, {column}, category, minutes, calories, sessions) "
+            f"SELECT regn_id, {period.format(r='sessions')}, category, SUM(duration), SUM(calories), COUNT(*) "
+            "FROM sessions GROUP BY 1, 2, 3")
+
+
+def _rollup_apply(r, sign):
+    """Trigger body adding (sign=1) or removing (sign=-1) session row ``r`` in every rollup table."""
+    body = []
+    for table, column, period in _ROLLUP_TABLES:
+        period = period.format(r=r)
+        body.append(f"INSERT INTO {table} (regn_id, {column}, category, minutes, calories, sessions) "
+                    f"VALUES ({r}.regn_id, {period}, {r}.category, {sign} * {r}.duration, {sign} * {r}.calories, {sign}) "
+                    f"ON CONFLICT (regn_id, {column}, category) DO UPDATE SET minutes = minutes + excluded.minutes, "
+                    "calories = calories + excluded.calories, sessions = sessions + excluded.sessions;")
+        if sign < 0:
+            body.append(f"DELETE FROM {table} WHERE regn_id = {r}.regn_id AND {column} = {period} "
+                        f"AND category = {r}.category AND sessions <= 0;")
+    return "\n".join(body)
+
+
+ALL_MEMBERS = "*"  # data_versions scope bumped by every write
+
+
+def _bump_version(scope):
+    return (f"INSERT INTO data_versions (scope, version) VALUES ({scope}, 1) "
+            "ON CONFLICT (scope) DO UPDATE SET version = version + 1;")
+
+
+def _version_trigger(name, event, table, *rows):
+    bumps = "\n".join(_bump_version(f"{r}.regn_id") for r in rows)
+    return (f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN\n{bumps}\n"
+            f"{_bump_version(repr(ALL_MEMBERS))}\nEND")
+
+
+class WorkoutStore:
+    """Interface every storage backend implements.
+
+    Entries are the tracker's session dicts:
+    ``{"exercise", "duration", "calories", "timestamp"}``, optionally with the
+    member's ``"weight"`` when written.
+    """
+
+    def add(self, regn_id, category, entry):
+        raise NotImplementedError
+
+    def add_many(self, rows):
+        """Insert ``(regn_id, category, entry)`` rows in a single transaction."""
+        raise NotImplementedError
+
+    def sessions(self, regn_id, category=None, start_date=None, end_date=None):
+        """Return ``(category, entry)`` pairs in logging order; dates are inclusive ISO strings."""
+        raise NotImplementedError
+
+    def iter_sessions(self, regn_id, start_date=None, end_date=None, batch_size=500):
+        """Like sessions() but yields lazily; backends may fetch in batches."""
+        yield from self.sessions(regn_id, start_date=start_date, end_date=end_date)
+
+    def sessions_page(self, regn_id, after=None, limit=100, start_date=None, end_date=None, category=None):
+        """Return up to ``limit`` ``(session_id, category, entry)`` rows in logging order.
+
+        ``after`` is the ``(timestamp, session_id)`` of the last row already
+        seen, so pages are keyset cursors rather than offsets.
+        """
+        raise NotImplementedError
+
+    def totals(self, regn_id):
+        """Return ``{category: total_minutes}`` for a member."""
+        raise NotImplementedError
+
+    def aggregates(self, regn_id):
+        """Return ``{category: {"minutes", "calories", "count"}}`` for a member."""
+        raise NotImplementedError
+
+    def replace(self, regn_id, workouts):
+        """Replace a member's whole history with ``{category: [entries]}``."""
+        raise NotImplementedError
+
+    def recalculate_calories(self, compute, chunk_size=50000):
+        """Rewrite every stored burn from columnar (categories, durations, weights)."""
+        raise NotImplementedError
+
+    def range_signature(self, regn_id, start_date=None, end_date=None):
+        """Cheap value that changes whenever the member's sessions in the range change."""
+        raise NotImplementedError
+
+    # --- Member profiles (the tracker's user_info dicts) ---
+    def save_member(self, user_info):
+        raise NotImplementedError
+
+    def get_member(self, regn_id):
+        raise NotImplementedError
+
+    def members(self, after=None, limit=None):
+        """Yield ``(regn_id, user_info)`` ordered by regn_id, starting after ``after``."""
+        raise NotImplementedError
+
+    def active_members(self, start_date=None, end_date=None):
+        """Return the sorted regn_ids with sessions in the date range, profile or not."""
+        raise NotImplementedError
+
+    def data_version(self, regn_id=None):
+        """Counter that increases with every write to a member's sessions or profile.
+
+        With ``regn_id=None`` it covers every member.  Cheap enough to read
+        on each request, so it can back ETags.
+        """
+        raise NotImplementedError
+
+    def rollups(self, regn_id, period="day", start_date=None, end_date=None):
+        """Return ``{period_start: {category: {"minutes", "calories", "count"}}}`` in date order.
+
+        ``period`` is ``"day"`` or ``"week"`` (ISO weeks, keyed by their
+        Monday); the date range selects period starts.  This default scans
+        sessions; backends should serve it from precomputed rollups.
+        """
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown rollup period: {period!r}")
+        last_day = end_date
+        if period == "week" and end_date is not None:
+            last_day = (date.fromisoformat(end_date) + timedelta(days=6)).isoformat()
+        rollups = {}
+        for category, entry in self.iter_sessions(regn_id, start_date=start_date, end_date=last_day):
+            key = period_start(entry["timestamp"][:10], period)
+            if end_date is not None and key > end_date:
+                continue
+            totals = rollups.setdefault(key, empty_aggregates()).setdefault(
+                category, {"minutes": 0, "calories": 0.0, "count": 0})
+            totals["minutes"] += entry["duration"]; totals["calories"] += entry["calories"]; totals["count"] += 1
+        return dict(sorted(rollups.items()))
+
+    def ping(self):
+        """Raise if the backend can't serve queries (used by readiness checks)."""
+
+    def close(self):
+        pass
+
+    # --- Views built on the primitives above ---
+    def sessions_by_category(self, regn_id):
+        grouped = empty_categories()
+        for category, entry in self.sessions(regn_id):
+            grouped.setdefault(category, []).append(entry)
+        return grouped
+
+    def sessions_by_date(self, regn_id, start_date=None, end_date=None):
+        days = {}
+        for category, entry in self.sessions(regn_id, start_date=start_date, end_date=end_date):
+            day = days.setdefault(entry["timestamp"][:10], empty_categories())
+            day.setdefault(category, []).append(entry)
+        return days
+
+
+class SQLiteWorkoutStore(WorkoutStore):
+    """Default backend: a single SQLite file in WAL mode.
+
+    One connection is shared by all threads of a process and serialised with a
+    lock; separate processes (gunicorn workers) each open their own connection.
+    """
+
+    # Applied in order; PRAGMA user_version records how many have run.
+    MIGRATIONS = (
+        """CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            regn_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            exercise TEXT NOT NULL,
+            duration INTEGER NOT NULL,
+            calories REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            date TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_member_date_cat ON sessions (regn_id, date, category)",
+        # body weight at logging time, so burns can be recomputed when MET values change
+        "ALTER TABLE sessions ADD COLUMN weight REAL",
+        # member profiles, so reports can be produced without the GUI
+        """CREATE TABLE IF NOT EXISTS members (
+            regn_id TEXT PRIMARY KEY,
+            profile TEXT NOT NULL
+        )""",
+        # daily / ISO-week rollups per member and category, kept current by the triggers below
+        *(_rollup_table(table, column) for table, column, _ in _ROLLUP_TABLES),
+        *(_rollup_backfill(*rollup) for rollup in _ROLLUP_TABLES),
+        f"CREATE TRIGGER IF NOT EXISTS sessions_rollup_insert AFTER INSERT ON sessions BEGIN\n{_rollup_apply('NEW', 1)}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS sessions_rollup_delete AFTER DELETE ON sessions BEGIN\n{_rollup_apply('OLD', -1)}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS sessions_rollup_update AFTER UPDATE OF regn_id, category, duration, calories, date "
+        f"ON sessions BEGIN\n{_rollup_apply('OLD', -1)}\n{_rollup_apply('NEW', 1)}\nEND",
+        # write counters per member (and ALL_MEMBERS) for HTTP validators, see data_version()
+        "CREATE TABLE IF NOT EXISTS data_versions (scope TEXT PRIMARY KEY, version INTEGER NOT NULL) WITHOUT ROWID",
+        _version_trigger("sessions_version_insert", "INSERT", "sessions", "NEW"),
+        _version_trigger("sessions_version_delete", "DELETE", "sessions", "OLD"),
+        _version_trigger("sessions_version_update", "UPDATE", "sessions", "OLD", "NEW"),
+        _version_trigger("members_version_insert", "INSERT", "members", "NEW"),
+        _version_trigger("members_version_update", "UPDATE", "members", "NEW"),
+        # keyset paging through one category of a member's history (the tracker's summary list)
+        "CREATE INDEX IF NOT EXISTS idx_sessions_member_cat_ts ON sessions (regn_id, category, timestamp, id)",
+        # integer epoch seconds (wall clock, like timestamp); range and keyset queries seek on it
+        "ALTER TABLE sessions ADD COLUMN ts INTEGER",
+        "UPDATE sessions SET ts = CAST(strftime('%s', timestamp) AS INTEGER)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_member_time ON sessions (regn_id, ts, id)",
+        "DROP INDEX IF EXISTS idx_sessions_member_cat_ts",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_member_cat_time ON sessions (regn_id, category, ts, id)",
+        # superseded by idx_sessions_member_time; no query reads date any more
+        "DROP INDEX IF EXISTS idx_sessions_member_date_cat",
+    )
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        # busy timeout: other processes may hold the write lock while they migrate
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+
+    def _migrate(self):
+        """Apply pending MIGRATIONS in one exclusive transaction.
+
+        gunicorn workers open a fresh database at the same moment; the first to
+        get the lock migrates, and the others re-read ``user_version`` once it
+        is released and find nothing left to do.
+        """
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] == len(self.MIGRATIONS):
+            return
+        self._conn.execute("BEGIN EXCLUSIVE")
+        try:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == 0 and self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'idx_sessions_member_date_cat'").fetchone():
+                version = 2  # databases created before versioning was introduced
+            for statement in self.MIGRATIONS[version:]:
+                self._conn.execute(statement)
+            self._conn.execute(f"PRAGMA user_version = {len(self.MIGRATIONS)}")
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    @staticmethod
+    def _row(regn_id, category, entry):
+        timestamp, day = normalize_timestamp(entry.get("timestamp"))
+        weight = entry.get("weight")
+        return (regn_id, category, entry["exercise"], int(entry["duration"]),
+                float(entry["calories"]), timestamp, to_epoch(timestamp), day, None if weight is None else float(weight))
+
+    _INSERT = ("INSERT INTO sessions (regn_id, category, exercise, duration, calories, timestamp, ts, date, weight) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def add(self, regn_id, category, entry):
+        row = self._row(regn_id, category, entry)
+        with self._lock, self._conn:
+            self._conn.execute(self._INSERT, row)
+
+    def add_many(self, rows):
+        params = [self._row(regn_id, category, entry) for regn_id, category, entry in rows]
+        with self._lock, self._conn:
+            self._conn.executemany(self._INSERT, params)
+        return len(params)
+
+    @staticmethod
+    def _where(regn_id, category=None, start_date=None, end_date=None):
+        clause, params = "regn_id = ?", [regn_id]
+        start_ts, end_ts = ts_bounds(start_date, end_date)
+        if start_ts is not None:
+            clause += " AND ts >= ?"; params.append(start_ts)
+        if end_ts is not None:
+            clause += " AND ts < ?"; params.append(end_ts)
+        if category is not None:
+            clause += " AND category = ?"; params.append(category)
+        return clause, params
+
+    @staticmethod
+    def _entry(r):
+        return (r["category"], {"exercise": r["exercise"], "duration": r["duration"],
+                                "calories": r["calories"], "timestamp": r["timestamp"]})
+
+    _COLUMNS = "id, category, exercise, duration, calories, timestamp"
+
+    def sessions(self, regn_id, category=None, start_date=None, end_date=None):
+        clause, params = self._where(regn_id, category, start_date, end_date)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM sessions WHERE {clause} ORDER BY ts, id", params).fetchall()
+        return [self._entry(r) for r in rows]
+
+    def iter_sessions(self, regn_id, start_date=None, end_date=None, batch_size=500):
+        """Yield sessions in logging order, ``batch_size`` rows per query.
+
+        Batches are fetched with a (timestamp, id) keyset, so no cursor or
+        lock is held between batches and memory stays bounded.
+        """
+        after = None
+        while True:
+            rows = self.sessions_page(regn_id, after, batch_size, start_date, end_date)
+            for _, category, entry in rows:
+                yield category, entry
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][2]["timestamp"], rows[-1][0])
+
+    def sessions_page(self, regn_id, after=None, limit=100, start_date=None, end_date=None, category=None):
+        clause, params = self._where(regn_id, category, start_date, end_date)
+        if after is not None:
+            clause += " AND (ts, id) > (?, ?)"; params += [to_epoch(after[0]), after[1]]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM sessions WHERE {clause} ORDER BY ts, id LIMIT ?", params + [limit]).fetchall()
+        return [(r["id"], *self._entry(r)) for r in rows]
+
+    def totals(self, regn_id):
+        totals = {cat: 0 for cat in CATEGORIES}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, SUM(duration) FROM sessions WHERE regn_id = ? GROUP BY category", (regn_id,)
+            ).fetchall()
+        for category, minutes in rows:
+            totals[category] = minutes or 0
+        return totals
+
+    def aggregates(self, regn_id):
+        aggregates = empty_aggregates()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, SUM(duration), SUM(calories), COUNT(*) FROM sessions "
+                "WHERE regn_id = ? GROUP BY category", (regn_id,)
+            ).fetchall()
+        for category, minutes, calories, count in rows:
+            aggregates[category] = {"minutes": minutes or 0, "calories": calories or 0.0, "count": count}
+        return aggregates
+
+    def replace(self, regn_id, workouts):
+        params = [self._row(regn_id, category, entry)
+                  for category, entries in workouts.items() for entry in entries]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE regn_id = ?", (regn_id,))
+            self._conn.executemany(self._INSERT, params)
+
+    def recalculate_calories(self, compute, chunk_size=50000):
+        """Rewrite every stored burn with ``compute(categories, durations, weights)``.
+
+        Rows are processed in id-ordered chunks, each chunk being one columnar
+        call to ``compute`` and one executemany; returns the number of rows.
+        """
+        updated, last_id = 0, 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, category, duration, weight FROM sessions WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size)).fetchall()
+            if not rows:
+                return updated
+            ids, categories, durations, weights = zip(*rows)
+            burns = compute(categories, durations, weights)
+            with self._lock, self._conn:
+                self._conn.executemany("UPDATE sessions SET calories = ? WHERE id = ?", zip(burns, ids))
+            updated += len(rows)
+            last_id = ids[-1]
+
+    def range_signature(self, regn_id, start_date=None, end_date=None):
+        clause, params = self._where(regn_id, start_date=start_date, end_date=end_date)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT COUNT(*), MAX(id), SUM(duration), SUM(calories) FROM sessions WHERE {clause}", params
+            ).fetchone()
+        return tuple(row)
+
+    def rollups(self, regn_id, period="day", start_date=None, end_date=None):
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown rollup period: {period!r}")
+        table, column, _ = _ROLLUP_TABLES[ROLLUP_PERIODS.index(period)]
+        clause, params = "regn_id = ?", [regn_id]
+        if start_date is not None:
+            clause += f" AND {column} >= ?"; params.append(start_date)
+        if end_date is not None:
+            clause += f" AND {column} <= ?"; params.append(end_date)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, category, minutes, calories, sessions FROM {table} WHERE {clause} ORDER BY {column}",
+                params).fetchall()
+        rollups = {}
+        for start, category, minutes, calories, count in rows:
+            rollups.setdefault(start, empty_aggregates())[category] = {
+                "minutes": minutes, "calories": calories, "count": count}
+        return rollups
+
+    def data_version(self, regn_id=None):
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM data_versions WHERE scope = ?",
+                                     (ALL_MEMBERS if regn_id is None else regn_id,)).fetchone()
+        return row[0] if row else 0
+
+    def save_member(self, user_info):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO members (regn_id, profile) VALUES (?, ?)",
+                               (user_info["regn_id"], json.dumps(user_info, sort_keys=True)))
+
+    def get_member(self, regn_id):
+        with self._lock:
+            row = self._conn.execute("SELECT profile FROM members WHERE regn_id = ?", (regn_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def members(self, after=None, limit=None):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT regn_id, profile FROM members WHERE regn_id > ? ORDER BY regn_id LIMIT ?",
+                (after or "", -1 if limit is None else limit)).fetchall()
+        for regn_id, profile in rows:
+            yield regn_id, json.loads(profile)
+
+    def active_members(self, start_date=None, end_date=None):
+        start_ts, end_ts = ts_bounds(start_date, end_date)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT regn_id FROM sessions WHERE ts >= ? AND ts < ? ORDER BY regn_id",
+                (-2**63 if start_ts is None else start_ts, 2**63 - 1 if end_ts is None else end_ts)).fetchall()
+        return [regn_id for regn_id, in rows]
+
+    def ping(self):
+        with self._lock:
+            self._conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ---------- Backend registry ----------
+def _memory_store(path):
+    from .memory_store import MemoryWorkoutStore  # imports this module
+    return MemoryWorkoutStore()
+
+
+_BACKENDS = {"sqlite": SQLiteWorkoutStore, "memory": _memory_store}
+
+
+def register_backend(name, factory):
+    """Make ``factory(path)`` available as ``open_store(backend=name)``."""
+    _BACKENDS[name] = factory
+
+
+def open_store(path=None, backend=None):
+    backend = backend or os.environ.get("ACEEST_STORE_BACKEND", "sqlite")
+    path = path or os.environ.get("ACEEST_DB_PATH", DEFAULT_DB_PATH)
+    try:
+        factory = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown workout store backend: {backend!r}") from None
+    return factory(path)
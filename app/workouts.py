@@ -0,0 +1,160 @@
+# app/workouts.py
+"""Workout validation and MET calorie formula shared by the GUI and the API."""
+import math
+
+from .storage import CATEGORIES, normalize_timestamp
+
+_UNLOADED = object()
+np = _UNLOADED  # imported on the first batch by _numpy(); None when it isn't installed
+
+# ---------- MET Values for Exercises ----------
+MET_VALUES = {
+    "Warm-up": 3,
+    "Workout": 6,
+    "Cool-down": 2.5
+}
+DEFAULT_MET = 5
+DEFAULT_WEIGHT_KG = 70
+MAX_DURATION_MINUTES = 24 * 60  # one session can't outlast a day
+MAX_WEIGHT_KG = 500
+MAX_REGN_ID_LENGTH = 64
+MAX_EXERCISE_LENGTH = 100
+CATEGORY_CODES = {cat: code for code, cat in enumerate(CATEGORIES)}
+
+
+def calculate_calories(category, duration, weight=DEFAULT_WEIGHT_KG):
+    met = MET_VALUES.get(category, DEFAULT_MET)
+    return (met * 3.5 * weight / 200) * duration
+
+
+def met_table(met_values=None):
+    """MET per category code; index ``len(CATEGORIES)`` holds the default MET."""
+    met_values = MET_VALUES if met_values is None else met_values
+    return [met_values.get(cat, DEFAULT_MET) for cat in CATEGORIES] + [DEFAULT_MET]
+
+
+def _numpy():
+    global np
+    if np is _UNLOADED:
+        try:
+            import numpy
+        except ImportError:  # numpy is optional; calculate_calories_batch falls back to a loop
+            numpy = None
+        np = numpy
+    return np
+
+
+def calculate_calories_batch(category_codes, durations, weights, met_values=None):
+    """Columnar version of calculate_calories.
+
+    Takes equal-length sequences of category codes (see CATEGORY_CODES; any
+    other code uses DEFAULT_MET), durations and weights (None -> default
+    weight) and returns a list of calorie burns, computed with NumPy in one
+    pass when it is installed.
+    """
+    table = met_table(met_values)
+    unknown = len(table) - 1
+    np = _numpy()
+    if np is not None:
+        codes = np.asarray(category_codes, dtype=np.int64)
+        codes = np.where((codes >= 0) & (codes < unknown), codes, unknown)
+        mets = np.asarray(table, dtype=np.float64)[codes]
+        weight_arr = np.asarray(weights, dtype=np.float64)  # None -> nan
+        weight_arr = np.where(np.isnan(weight_arr), DEFAULT_WEIGHT_KG, weight_arr)
+        return ((mets * 3.5 * weight_arr / 200) * np.asarray(durations, dtype=np.float64)).tolist()
+    burns = []
+    for code, duration, weight in zip(category_codes, durations, weights):
+        met = table[code] if 0 <= code < unknown else table[unknown]
+        weight = DEFAULT_WEIGHT_KG if weight is None else weight
+        burns.append((met * 3.5 * weight / 200) * duration)
+    return burns
+
+
+def parse_duration(value):
+    """Return a positive int duration (minutes) or raise ValueError with the tracker's message."""
+    try:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError
+        duration = int(str(value).strip()) if isinstance(value, str) else int(value)
+        if not 0 < duration <= MAX_DURATION_MINUTES:
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError(f"Duration must be a positive whole number (at most {MAX_DURATION_MINUTES}).") from None
+    return duration
+
+
+def _text(payload, key, max_length):
+    """Stripped string field ("" when missing); other JSON types are rejected, not stringified."""
+    value = payload.get(key)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string.")
+    value = value.strip()
+    if len(value) > max_length:
+        raise ValueError(f"{key} must be at most {max_length} characters.")
+    return value
+
+
+def _parse_workout(payload):
+    if not isinstance(payload, dict):
+        raise ValueError("Each workout must be a JSON object.")
+    regn_id = _text(payload, "regn_id", MAX_REGN_ID_LENGTH)
+    if not regn_id:
+        raise ValueError("regn_id is required.")
+    category = payload.get("category", "Workout")
+    if category not in CATEGORIES:
+        raise ValueError(f"category must be one of: {', '.join(CATEGORIES)}.")
+    exercise = _text(payload, "exercise", MAX_EXERCISE_LENGTH)
+    if not exercise or payload.get("duration") in (None, ""):
+        raise ValueError("Please enter both exercise and duration.")
+    duration = parse_duration(payload["duration"])
+    weight = payload.get("weight", DEFAULT_WEIGHT_KG)
+    try:
+        weight = float(weight)
+        if not (math.isfinite(weight) and 0 < weight <= MAX_WEIGHT_KG):
+            raise ValueError
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"weight must be a positive number of kg (at most {MAX_WEIGHT_KG}).") from None
+    try:
+        timestamp, _ = normalize_timestamp(payload.get("timestamp"))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("timestamp must be 'YYYY-MM-DD HH:MM:SS' or ISO-8601.") from None
+    entry = {"exercise": exercise, "duration": duration, "weight": weight, "timestamp": timestamp}
+    return regn_id, category, entry
+
+
+def validate_workout(payload):
+    """Validate one API payload and return ``(regn_id, category, entry)``.
+
+    Raises ValueError with a user-facing message on bad input.
+    """
+    regn_id, category, entry = _parse_workout(payload)
+    entry["calories"] = calculate_calories(category, entry["duration"], entry["weight"])
+    return regn_id, category, entry
+
+
+def validate_workouts(payloads):
+    """Validate a batch; returns ``(rows, errors)`` with calories computed in one pass.
+
+    ``errors`` is a list of ``{"index", "error"}`` dicts for rejected payloads.
+    """
+    rows, errors = [], []
+    for index, payload in enumerate(payloads):
+        try:
+            rows.append(_parse_workout(payload))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    burns = calculate_calories_batch([CATEGORY_CODES[category] for _, category, _ in rows],
+                                     [entry["duration"] for _, _, entry in rows],
+                                     [entry["weight"] for _, _, entry in rows])
+    for (_, _, entry), calories in zip(rows, burns):
+        entry["calories"] = calories
+    return rows, errors
+
+
+def recompute_calories(store, met_values=None):
+    """Recompute every stored burn after a MET table change; returns the row count."""
+    return store.recalculate_calories(
+        lambda categories, durations, weights: calculate_calories_batch(
+            [CATEGORY_CODES.get(cat, -1) for cat in categories], durations, weights, met_values))
@@ -0,0 +1,7 @@
+# asgi.py (place at repo root) -- ASGI entry point for ACEEST_SERVER_MODE=async
+import os
+
+from app import create_app
+from app.asgi import ASGIApp
+
+app = ASGIApp(create_app(), threads=int(os.environ.get("ACEEST_ASGI_THREADS", "32")))
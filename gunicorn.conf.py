@@ -0,0 +1,40 @@
+# gunicorn.conf.py
+# Server settings and hooks for `gunicorn -c gunicorn.conf.py` (see Dockerfile).
+import os
+import shutil
+
+# ACEEST_SERVER_MODE selects how requests are served:
+#   sync  -- run:app on gthread workers (--workers/--threads)
+#   async -- asgi:app on uvicorn workers; sockets live on an event loop and the
+#            Flask app runs on ACEEST_ASGI_THREADS threads (see app/asgi.py)
+SERVER_MODE = os.environ.get("ACEEST_SERVER_MODE", "sync")
+if SERVER_MODE == "async":
+    wsgi_app = "asgi:app"
+    worker_class = "uvicorn.workers.UvicornWorker"
+elif SERVER_MODE == "sync":
+    wsgi_app = "run:app"
+else:
+    raise RuntimeError(f"ACEEST_SERVER_MODE must be 'sync' or 'async', not {SERVER_MODE!r}")
+
+
+def on_starting(server):
+    # start every deploy with an empty Prometheus multiprocess directory
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def post_worker_init(worker):
+    # background jobs run in serving processes only; create_app() leaves them stopped
+    app = worker.wsgi
+    if not hasattr(app, "extensions"):  # asgi:app wraps the Flask app
+        app = app.wsgi_app
+    app.extensions["job_workers"].start()
+
+
+def child_exit(server, worker):
+    # drop live gauges of workers that exited so /metrics doesn't count them
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
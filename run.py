@@ -4,4 +4,5 @@ from app import create_app
 app = create_app()
 
 if __name__ == "__main__":
+    app.extensions["job_workers"].start()
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -3,3 +3,10 @@ import os, sys
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+# Keep the workout store in memory so tests never touch ~/.aceest/workouts.db
+os.environ.setdefault("ACEEST_DB_PATH", ":memory:")
+os.environ.setdefault("ACEEST_JOBS_DB", ":memory:")
+# ...and render caches in a throwaway directory
+import tempfile
+os.environ.setdefault("ACEEST_CACHE_DIR", tempfile.mkdtemp(prefix="aceest-cache-"))
@@ -0,0 +1,72 @@
+# tests/test_asgi.py
+import asyncio
+import json
+import threading
+
+from flask import Flask, Response, jsonify
+
+from app import create_app
+from app.asgi import ASGIApp
+
+
+def _scope(path, method="GET", query=b"", headers=()):
+    return {"type": "http", "method": method, "path": path, "query_string": query, "root_path": "",
+            "http_version": "1.1", "scheme": "http", "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+            "headers": [(k.encode(), v.encode()) for k, v in headers]}
+
+
+async def _call(asgi, scope, body=b""):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi(scope, receive, send)
+    status = sent[0]["status"]
+    headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+    return status, headers, b"".join(m.get("body", b"") for m in sent[1:]), sent
+
+
+def test_routes_through_the_flask_app():
+    asgi = ASGIApp(create_app(), threads=2)
+    status, headers, body, _ = asyncio.run(_call(asgi, _scope("/")))
+    assert status == 200 and headers["content-type"] == "application/json"
+    assert json.loads(body)["service"].startswith("ACEest")
+
+    payload = json.dumps({"regn_id": "A1", "category": "Workout", "exercise": "Row", "duration": 10}).encode()
+    status, _, body, _ = asyncio.run(_call(asgi, _scope("/workouts", "POST", headers=[
+        ("Content-Type", "application/json"), ("Content-Length", str(len(payload)))]), payload))
+    assert status == 201 and json.loads(body)["regn_id"] == "A1"
+
+    status, _, body, _ = asyncio.run(_call(asgi, _scope("/members/A1/workouts", query=b"limit=5")))
+    assert status == 200 and len(json.loads(body)["workouts"]) == 1
+
+
+def test_streamed_body_is_forwarded_in_chunks():
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule("/stream", "stream", lambda: Response((b"x" * 1024 for _ in range(200)), mimetype="text/plain"))
+    _, _, body, sent = asyncio.run(_call(ASGIApp(flask_app, threads=1), _scope("/stream")))
+    assert body == b"x" * 1024 * 200
+    chunks = [m for m in sent if m["type"] == "http.response.body"]
+    assert len(chunks) > 2 and chunks[-1]["more_body"] is False
+
+
+def test_health_checks_are_not_starved_by_slow_requests():
+    release = threading.Event()
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule("/slow", "slow", lambda: release.wait(5) and "done")
+    flask_app.add_url_rule("/healthcheck/live", "live", lambda: jsonify({"status": "alive"}))
+    asgi = ASGIApp(flask_app, threads=1)
+
+    async def scenario():
+        slow = asyncio.ensure_future(_call(asgi, _scope("/slow")))
+        await asyncio.sleep(0.05)  # the only app thread is now busy
+        status, _, _, _ = await asyncio.wait_for(_call(asgi, _scope("/healthcheck/live")), timeout=2)
+        release.set()
+        return status, (await slow)[0]
+
+    assert asyncio.run(scenario()) == (200, 200)
@@ -0,0 +1,121 @@
+# tests/test_batch_reports.py
+import json
+import os
+import types
+from datetime import date
+from unittest import mock
+
+import pytest
+
+from app import batch_reports, reports
+from app.storage import SQLiteWorkoutStore
+
+WEEK_DAY = date(2024, 3, 6)
+
+
+class FileCanvas:
+    """Minimal reportlab canvas stand-in that writes a file on save()."""
+    def __init__(self, out, pagesize=None): self.out = out; self.pages = 1
+    def showPage(self): self.pages += 1
+    def save(self):
+        with open(self.out, "wb") as f:
+            f.write(b"%%PDF-fake pages=%d" % self.pages)
+    def __getattr__(self, name): return lambda *a, **k: None
+
+
+class FakeTable:
+    def __init__(self, data, **k): self.data = data
+    def setStyle(self, style): pass
+    def wrapOn(self, canv, w, h): return w, 18 * len(self.data)
+    def drawOn(self, canv, x, y): pass
+
+
+@pytest.fixture(autouse=True)
+def fake_reportlab(monkeypatch):
+    monkeypatch.setattr(reports, "_reportlab", lambda: types.SimpleNamespace(
+        canvas=types.SimpleNamespace(Canvas=FileCanvas), A4=(595.27, 841.89),
+        Table=FakeTable, TableStyle=lambda *a, **k: None, colors=mock.MagicMock()))
+
+
+def _profile(regn_id):
+    return {"name": f"Member {regn_id}", "regn_id": regn_id, "age": 30, "gender": "F", "height": 165,
+            "weight": 60, "bmi": 22.0, "bmr": 1350, "weekly_cal_goal": 2000}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SQLiteWorkoutStore(str(tmp_path / "workouts.db"))
+    for regn_id in ("M1", "M2", "M/3"):
+        s.save_member(_profile(regn_id))
+        s.add(regn_id, "Workout", {"exercise": "Lift", "duration": 20, "calories": 80.0,
+                                   "timestamp": "2024-03-05 07:00:00"})
+    yield s
+    s.close()
+
+
+# ----------------------------------------------------------------------
+# 📦 BATCH WEEKLY REPORTS
+# ----------------------------------------------------------------------
+def test_generates_every_member_then_skips_unchanged(store, tmp_path):
+    out = str(tmp_path / "out")
+    progress = []
+    summary = batch_reports.generate_weekly_reports(out, store=store, day=WEEK_DAY, workers=0,
+                                                    progress=lambda *a: progress.append(a))
+    assert summary["week_start"] == "2024-03-04"
+    assert [r["regn_id"] for r in summary["generated"]] == ["M/3", "M1", "M2"]
+    assert all(os.path.exists(r["path"]) and r["seconds"] >= 0 for r in summary["generated"])
+    assert os.path.basename(batch_reports.member_report_path(out, "M/3")).startswith("M_3_")
+    colliding = {batch_reports.member_report_path(out, regn_id) for regn_id in ("A/B", "A_B", "A B")}
+    assert len(colliding) == 3
+    assert [p[:2] for p in progress] == [(1, 3), (2, 3), (3, 3)]
+    with open(os.path.join(out, "manifest.json")) as f:
+        assert set(json.load(f)) == {"M1", "M2", "M/3"}
+
+    # nothing changed -> everything skipped
+    summary = batch_reports.generate_weekly_reports(out, store=store, day=WEEK_DAY, workers=0)
+    assert summary["generated"] == [] and sorted(summary["skipped"]) == ["M/3", "M1", "M2"]
+
+    # new session in the week (and a profile change) only re-render those members
+    store.add("M1", "Warm-up", {"exercise": "Jog", "duration": 5, "calories": 10.0, "timestamp": "2024-03-07 07:00:00"})
+    store.save_member({**_profile("M2"), "weight": 58})
+    # sessions outside the week don't count
+    store.add("M/3", "Warm-up", {"exercise": "Jog", "duration": 5, "calories": 10.0, "timestamp": "2024-02-01 07:00:00"})
+    summary = batch_reports.generate_weekly_reports(out, store=store, day=WEEK_DAY, workers=0)
+    assert [r["regn_id"] for r in summary["generated"]] == ["M1", "M2"]
+    assert summary["skipped"] == ["M/3"]
+
+    summary = batch_reports.generate_weekly_reports(out, store=store, day=WEEK_DAY, workers=0, force=True)
+    assert len(summary["generated"]) == 3
+
+
+def test_process_pool_workers(store, tmp_path):
+    out = str(tmp_path / "pool")
+    summary = batch_reports.generate_weekly_reports(out, db_path=store.path, day=WEEK_DAY, workers=2)
+    assert summary["failed"] == []
+    assert len(summary["generated"]) == 3
+    assert all(os.path.exists(r["path"]) for r in summary["generated"])
+
+
+def test_failures_are_reported_not_raised(store, tmp_path, monkeypatch):
+    store.save_member({"regn_id": "BROKEN"})  # profile missing fields the report needs
+    summary = batch_reports.generate_weekly_reports(str(tmp_path / "out"), store=store, day=WEEK_DAY, workers=0)
+    assert [f["regn_id"] for f in summary["failed"]] == ["BROKEN"]
+    assert len(summary["generated"]) == 3
+
+
+def test_members_without_a_profile_are_listed(store, tmp_path):
+    # logged through the API only, so there is no profile to render
+    store.add("API1", "Workout", {"exercise": "Row", "duration": 15, "calories": 60.0,
+                                  "timestamp": "2024-03-05 08:00:00"})
+    summary = batch_reports.generate_weekly_reports(str(tmp_path / "out"), store=store, day=WEEK_DAY, workers=0)
+    assert summary["no_profile"] == ["API1"]
+    assert len(summary["generated"]) == 3 and summary["failed"] == []
+
+
+def test_cli(store, tmp_path, capsys):
+    code = batch_reports.main(["--out", str(tmp_path / "cli"), "--db", store.path,
+                               "--date", "2024-03-06", "--workers", "0"])
+    assert code == 0
+    out = capsys.readouterr().out
+    assert "[3/3]" in out and "Generated 3, skipped 0 unchanged, failed 0" in out
+    assert "No saved profile" not in out
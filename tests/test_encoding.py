@@ -0,0 +1,85 @@
+# tests/test_encoding.py
+import gzip
+import json
+
+import pytest
+
+from app import create_app, encoding
+
+
+def _workout(i):
+    return {"exercise": f"Exercise {i}", "duration": 10, "calories": 40.0, "timestamp": "2024-03-05 10:00:00"}
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.extensions["workout_store"].add_many([("Z1", "Workout", _workout(i)) for i in range(50)])
+    return app
+
+
+def test_gzip_negotiated_above_threshold(app):
+    client = app.test_client()
+    resp = client.get("/members/Z1/workouts", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    body = json.loads(gzip.decompress(resp.data))
+    assert len(body["workouts"]) == 50
+    assert int(resp.headers["Content-Length"]) == len(resp.data)
+
+    plain = client.get("/members/Z1/workouts")
+    assert "Content-Encoding" not in plain.headers
+    small = client.get("/healthcheck/live", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    refused = client.get("/members/Z1/workouts", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_streamed_ndjson_is_compressed(app):
+    resp = app.test_client().get("/members/Z1/workouts?limit=7", headers={
+        "Accept": "application/x-ndjson", "Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip" and "Content-Length" not in resp.headers
+    lines = gzip.decompress(resp.get_data()).decode().splitlines()
+    assert len(lines) == 50
+
+
+def test_compressed_variant_has_its_own_etag_and_revalidates(app):
+    client = app.test_client()
+    headers = {"Accept-Encoding": "gzip"}
+    plain_etag = client.get("/members/Z1/workouts").headers["ETag"]
+    gzip_etag = client.get("/members/Z1/workouts", headers=headers).headers["ETag"]
+    assert gzip_etag == plain_etag[:-1] + '-gzip"'
+    resp = client.get("/members/Z1/workouts", headers={**headers, "If-None-Match": gzip_etag})
+    assert resp.status_code == 304 and resp.headers["ETag"] == gzip_etag
+
+
+def test_brotli_preferred_when_installed(app):
+    brotli = pytest.importorskip("brotli")
+    resp = app.test_client().get("/members/Z1/workouts", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "br"
+    assert len(json.loads(brotli.decompress(resp.data))["workouts"]) == 50
+
+
+def test_br_only_client_gets_identity_without_brotli(app, monkeypatch):
+    monkeypatch.setattr(encoding, "brotli", None)
+    resp = app.test_client().get("/members/Z1/workouts", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_msgpack_falls_back_to_json_when_unavailable(app, monkeypatch):
+    monkeypatch.setattr(encoding, "msgpack", None)
+    resp = app.test_client().get("/members/Z1/workouts", headers={"Accept": "application/msgpack"})
+    assert resp.is_json and len(resp.get_json()["workouts"]) == 50
+
+
+def test_msgpack_round_trip(app):
+    msgpack = pytest.importorskip("msgpack")
+    client = app.test_client()
+    resp = client.get("/members/Z1/workouts?limit=5", headers={"Accept": "application/msgpack"})
+    assert resp.mimetype == "application/msgpack"
+    assert len(msgpack.unpackb(resp.data)["workouts"]) == 5
+
+    body = msgpack.packb([{"regn_id": "Z2", "category": "Workout", "exercise": "Row", "duration": 10}])
+    resp = client.post("/workouts/batch", data=body, content_type="application/msgpack",
+                       headers={"Accept": "application/msgpack"})
+    assert resp.status_code == 201 and msgpack.unpackb(resp.data) == {"inserted": 1}
@@ -0,0 +1,84 @@
+# tests/test_health.py
+import time
+
+from app import create_app
+from app.health import ReadinessChecker, directory_writable_check, queue_depth_check, storage_check
+from app.storage import SQLiteWorkoutStore
+
+
+def test_not_ready_until_checks_have_run():
+    checker = ReadinessChecker(interval=60)
+    assert checker.snapshot() == (False, {})
+    checker.register("storage", lambda: None)
+    ready, results = checker.snapshot()
+    assert not ready and results["storage"]["error"] == "not checked yet"
+    checker.run_checks()
+    ready, results = checker.snapshot()
+    assert ready and results["storage"]["ok"]
+
+
+def test_failing_check_is_reported_with_its_error():
+    checker = ReadinessChecker(interval=60)
+    checker.register("ok", lambda: {"detail": 1})
+    checker.register("broken", lambda: 1 / 0)
+    checker.run_checks()
+    ready, results = checker.snapshot()
+    assert not ready
+    assert results["ok"]["detail"] == 1
+    assert results["broken"] == {**results["broken"], "ok": False, "error": "ZeroDivisionError: division by zero"}
+
+
+def test_stale_results_count_as_failures():
+    checker = ReadinessChecker(interval=60, stale_after=0.01)
+    checker.register("storage", lambda: None)
+    checker.run_checks()
+    time.sleep(0.02)
+    ready, results = checker.snapshot()
+    assert not ready and results["storage"]["error"] == "stale result"
+
+
+def test_background_thread_refreshes_results():
+    calls = []
+    checker = ReadinessChecker(interval=0.01)
+    checker.register("counter", lambda: calls.append(1))
+    checker.start()
+    try:
+        deadline = time.time() + 2
+        while len(calls) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        checker.stop()
+    assert len(calls) >= 3
+
+
+def test_builtin_checks(tmp_path):
+    store = SQLiteWorkoutStore(":memory:")
+    check = storage_check(store)
+    check()
+    store.close()
+    checker = ReadinessChecker(interval=60)
+    checker.register("storage", check)
+    checker.register("dir", directory_writable_check(str(tmp_path)))
+    checker.register("missing_dir", directory_writable_check(str(tmp_path / "nope")))
+    checker.register("queue", queue_depth_check(lambda: 5, max_depth=3))
+    checker.run_checks()
+    _, results = checker.snapshot()
+    assert not results["storage"]["ok"]
+    assert results["dir"]["ok"] and list(tmp_path.iterdir()) == []
+    assert not results["missing_dir"]["ok"]
+    assert results["queue"]["error"] == "RuntimeError: queue depth 5 exceeds 3"
+
+
+def test_ready_endpoint_serves_cached_snapshot():
+    app = create_app({"TESTING": True})
+    checker = app.extensions["readiness"]
+    checker.stop()
+    client = app.test_client()
+    data = client.get("/healthcheck/ready").get_json()
+    assert set(data["checks"]) == {"storage", "render_cache", "job_queue"}
+
+    checker.register("storage", lambda: 1 / 0)
+    checker.run_checks()
+    response = client.get("/healthcheck/ready")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "not ready"
@@ -0,0 +1,68 @@
+# tests/test_http_cache.py
+from flask import Flask, jsonify
+
+from app import create_app
+from app.http_cache import conditional
+
+
+def _app(state):
+    app = Flask(__name__)
+
+    @app.route("/items/<name>")
+    @conditional(lambda name: state["version"], cache_control="public, max-age=30")
+    def item(name):
+        state["renders"] += 1
+        return jsonify({"name": name, "version": state["version"]})
+
+    @app.route("/missing")
+    @conditional(lambda: 1)
+    def missing():
+        return jsonify({"error": "nope"}), 404
+
+    return app.test_client()
+
+
+def test_matching_etag_skips_the_view():
+    state = {"version": 1, "renders": 0}
+    client = _app(state)
+    first = client.get("/items/a")
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "public, max-age=30"
+    etag = first.headers["ETag"]
+
+    again = client.get("/items/a", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+    assert again.headers["ETag"] == etag
+    assert state["renders"] == 1
+
+    state["version"] = 2
+    changed = client.get("/items/a", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert state["renders"] == 2
+
+
+def test_etag_depends_on_path_query_and_accept():
+    client = _app({"version": 1, "renders": 0})
+    tags = {client.get(url, headers=headers).headers["ETag"] for url, headers in (
+        ("/items/a", {}), ("/items/b", {}), ("/items/a?x=1", {}), ("/items/a", {"Accept": "application/x-ndjson"}))}
+    assert len(tags) == 4
+
+
+def test_errors_are_not_validated():
+    resp = _app({"version": 1, "renders": 0}).get("/missing")
+    assert resp.status_code == 404
+    assert "ETag" not in resp.headers and "Cache-Control" not in resp.headers
+
+
+def test_progress_poll_returns_304_until_member_writes():
+    app = create_app()
+    store = app.extensions["workout_store"]
+    client = app.test_client()
+    url = "/members/E1/progress?range=4w"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    store.add("E2", "Workout", {"exercise": "Row", "duration": 10, "calories": 40.0, "timestamp": "2024-03-05 10:00:00"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304  # other member
+
+    store.add("E1", "Workout", {"exercise": "Row", "duration": 10, "calories": 40.0, "timestamp": "2024-03-05 10:00:00"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,197 @@
+# tests/test_jobs.py
+import os
+import runpy
+import time
+import types
+from unittest import mock
+
+import pytest
+
+from app import create_app, reports
+from app.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobWorkerPool
+
+
+@pytest.fixture
+def queue():
+    q = JobQueue(":memory:", retry_delay=0.0)
+    yield q
+    q.close()
+
+
+# ----------------------------------------------------------------------
+# 📬 QUEUE SEMANTICS
+# ----------------------------------------------------------------------
+def test_claim_runs_jobs_in_order_and_records_results(queue):
+    first = queue.enqueue("echo", {"n": 1})
+    second = queue.enqueue("echo", {"n": 2})
+    pool = JobWorkerPool(queue, {"echo": lambda payload: {"twice": payload["n"] * 2}}, concurrency=1)
+    assert queue.depth() == 2
+    assert pool.run_pending() == 2
+    assert queue.get(first)["result"] == {"twice": 2}
+    assert queue.get(second)["status"] == SUCCEEDED and queue.depth() == 0
+    assert queue.get("missing") is None
+
+
+def test_concurrency_limit_applies_to_running_jobs(queue):
+    for n in range(3):
+        queue.enqueue("echo", {"n": n})
+    assert queue.claim(concurrency=2)["status"] == RUNNING
+    assert queue.claim(concurrency=2) is not None
+    assert queue.claim(concurrency=2) is None  # two already running
+    assert queue.depth() == 1
+
+
+def test_failures_retry_with_backoff_then_fail(queue):
+    queue.retry_delay = 60.0
+    job_id = queue.enqueue("flaky", max_attempts=2)
+    calls = []
+    pool = JobWorkerPool(queue, {"flaky": lambda payload: calls.append(1) / 0}, concurrency=1)
+    assert pool.run_pending() == 1
+    job = queue.get(job_id)
+    assert job["status"] == QUEUED and job["available_at"] > time.time() + 30
+    assert job["error"].startswith("TypeError")
+
+    queue.retry_delay = 0.0
+    with queue._lock:
+        queue._conn.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job_id,))
+    pool.run_pending()
+    job = queue.get(job_id)
+    assert job["status"] == FAILED and job["attempts"] == 2 and len(calls) == 2
+
+
+def test_unknown_kind_fails_without_retry(queue):
+    job_id = queue.enqueue("nope", max_attempts=5)
+    JobWorkerPool(queue, {}, concurrency=1).run_pending()
+    job = queue.get(job_id)
+    assert job["status"] == FAILED and job["attempts"] == 1 and "No handler" in job["error"]
+
+
+def test_expired_lease_is_requeued(queue):
+    queue.lease_seconds = -1  # every claim is already expired
+    job_id = queue.enqueue("echo", max_attempts=2)
+    assert queue.claim(concurrency=1)["id"] == job_id  # worker "dies" here
+    assert queue.claim(concurrency=1)["attempts"] == 2  # requeued and claimed again
+    assert queue.claim(concurrency=1) is None
+    job = queue.get(job_id)
+    assert job["status"] == FAILED and job["error"] == "lease expired"
+
+
+def test_stale_claims_cannot_finish_a_requeued_job(queue):
+    queue.lease_seconds = -1
+    job_id = queue.enqueue("echo", max_attempts=3)
+    stale = queue.claim(concurrency=1)
+    queue.lease_seconds = 600
+    fresh = queue.claim(concurrency=1)  # the stale claim's lease had expired
+    assert (stale["attempts"], fresh["attempts"]) == (1, 2)
+    assert not queue.renew(job_id, stale["attempts"])
+    assert not queue.complete(job_id, stale["attempts"], {"from": "stale"})
+    assert not queue.fail(job_id, stale["attempts"], "stale worker")
+    assert queue.get(job_id)["status"] == RUNNING
+    assert queue.complete(job_id, fresh["attempts"], {"from": "fresh"})
+    assert queue.get(job_id)["result"] == {"from": "fresh"}
+
+
+def test_running_jobs_renew_their_lease(queue):
+    queue.lease_seconds = 0.3
+    job_id = queue.enqueue("slow")
+    def slow(payload):
+        time.sleep(1.0)
+        return queue.claim(concurrency=2)  # would requeue and re-claim the job if its lease had lapsed
+    pool = JobWorkerPool(queue, {"slow": slow}, concurrency=1)
+    assert pool.run_pending() == 1
+    job = queue.get(job_id)
+    assert job["status"] == SUCCEEDED and job["attempts"] == 1 and job["result"] is None
+
+
+def test_workers_start_only_when_asked():
+    assert create_app().extensions["job_workers"]._threads == []
+    app = create_app({"JOB_WORKERS_AUTOSTART": True})
+    pool = app.extensions["job_workers"]
+    assert len(pool._threads) == pool.concurrency
+    pool.stop()
+
+    # gunicorn starts them in each serving worker once the app is loaded
+    hooks = runpy.run_path(os.path.join(os.path.dirname(__file__), "..", "gunicorn.conf.py"))
+    app = create_app()
+    hooks["post_worker_init"](types.SimpleNamespace(wsgi=app))
+    assert len(app.extensions["job_workers"]._threads) == app.config["JOB_WORKERS"]
+    app.extensions["job_workers"].stop()
+
+
+def test_file_queue_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    producer, consumer = JobQueue(path), JobQueue(path)
+    job_id = producer.enqueue("echo", {"n": 3})
+    pool = JobWorkerPool(consumer, {"echo": lambda payload: payload["n"]}, concurrency=1, poll_interval=0.05)
+    pool.start()
+    try:
+        assert producer.wait(job_id, timeout=5)["result"] == 3
+    finally:
+        pool.stop()
+
+
+# ----------------------------------------------------------------------
+# 🌐 REPORT JOB ENDPOINTS
+# ----------------------------------------------------------------------
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    class BufferCanvas:
+        def __init__(self, out, pagesize=None): self.out = out
+        def save(self): self.out.write(b"%PDF-1.4 job")
+        def __getattr__(self, name): return lambda *a, **k: None
+
+    monkeypatch.setattr(reports, "_reportlab", lambda: types.SimpleNamespace(
+        canvas=types.SimpleNamespace(Canvas=BufferCanvas), A4=(595.27, 841.89),
+        Table=mock.MagicMock(**{"return_value.wrapOn.return_value": (0, 20)}),
+        TableStyle=lambda *a, **k: None, colors=mock.MagicMock()))
+    app = create_app({"REPORTS_DIR": str(tmp_path / "out"), "RENDER_CACHE_DIR": str(tmp_path / "cache")})
+    app.extensions["workout_store"].save_member({
+        "name": "Job User", "regn_id": "J1", "age": 30, "gender": "F", "height": 160,
+        "weight": 55, "bmi": 21.5, "bmr": 1300, "weekly_cal_goal": 2000})
+    client = app.test_client()
+    client.application = app
+    return client
+
+
+def test_report_job_lifecycle(client):
+    resp = client.post("/reports", json={"regn_id": "J1", "date": "2024-03-06"})
+    assert resp.status_code == 202
+    job = resp.get_json()
+    assert resp.headers["Location"].endswith(job["status_url"])
+
+    assert job["status"] == QUEUED  # create_app() leaves the workers to the server process
+    assert client.application.extensions["job_workers"].run_pending() == 1
+    status = client.get(job["status_url"]).get_json()
+    assert status["status"] == SUCCEEDED and status["result"]["week_start"] == "2024-03-04"
+    assert "path" not in status["result"]
+    pdf = client.get(status["result_url"])
+    assert pdf.status_code == 200 and pdf.data == b"%PDF-1.4 job"
+    assert "J1_2024-03-04_weekly_report.pdf" in pdf.headers["Content-Disposition"]
+
+
+def test_report_jobs_never_share_output_files(client):
+    store = client.application.extensions["workout_store"]
+    for regn_id in ("A/B", "A_B"):
+        store.save_member({**store.get_member("J1"), "regn_id": regn_id})
+    jobs = [client.post("/reports", json={"regn_id": regn_id, "date": "2024-03-06"}).get_json()
+            for regn_id in ("A/B", "A_B", "A/B")]
+    client.application.extensions["job_workers"].run_pending()
+    queue = client.application.extensions["job_queue"]
+    paths = {queue.get(job["id"])["result"]["path"] for job in jobs}
+    assert len(paths) == 3
+
+
+def test_report_job_validation(client):
+    assert client.post("/reports", json={"regn_id": "NOPE"}).status_code == 404
+    assert client.post("/reports", json={}).status_code == 400
+    assert client.post("/reports", json=[{"regn_id": "J1"}]).status_code == 400
+    assert client.post("/reports", json={"kind": "weekly_reports_batch", "workers": 99}).status_code == 400
+    assert client.post("/reports", json={"regn_id": "J1", "kind": "mine"}).status_code == 400
+    assert client.post("/reports", json={"regn_id": "J1", "date": "06/03/2024"}).status_code == 400
+    assert client.get("/reports/unknown").status_code == 404
+
+    client.application.config["JOB_QUEUE_MAX_DEPTH"] = 1
+    queued = client.post("/reports", json={"regn_id": "J1"}).get_json()
+    assert client.get(f"/reports/{queued['id']}/result").status_code == 409
+    full = client.post("/reports", json={"regn_id": "J1"})
+    assert full.status_code == 503 and full.headers["Retry-After"] == "30"
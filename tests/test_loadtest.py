@@ -0,0 +1,43 @@
+# tests/test_loadtest.py
+import importlib.util
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location("loadtest", os.path.join(ROOT, "tools", "loadtest.py"))
+loadtest = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(loadtest)
+
+
+def test_dockerfile_settings_match_cmd():
+    assert loadtest.dockerfile_settings() == {"workers": 2, "threads": 4}
+
+
+def test_summarize_percentiles_and_errors():
+    latencies = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    statuses = [200] * 97 + [500, 404, "ConnectionError"]
+    stats = loadtest.summarize(latencies, statuses, elapsed=2.0)
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]) == (50.0, 95.0, 99.0, 100.0)
+    assert stats["requests"] == 100 and stats["throughput_rps"] == 50.0
+    assert stats["errors"] == 3 and stats["statuses"]["200"] == 97
+
+
+def test_compare_flags_p95_regressions_only():
+    baseline = {"routes": {"home": {"p95_ms": 10.0}, "members": {"p95_ms": 10.0}}}
+    results = {"routes": {"home": {"p95_ms": 13.0}, "members": {"p95_ms": 11.0}, "new": {"p95_ms": 50.0}}}
+    assert loadtest.compare(results, baseline, max_regression=0.2) == ["home: p95 10.0ms -> 13.0ms (+30%)"]
+
+
+def test_remote_targets_skip_writes_and_synthetic_members():
+    names = lambda scenarios: [s[0] for s in scenarios]
+    local, skipped = loadtest.plan_scenarios()
+    assert "log_workout" in names(local) and skipped == {}
+
+    remote, skipped = loadtest.plan_scenarios(remote=True)
+    assert names(remote) == ["home", "ready", "members"]
+    assert set(skipped) == {"workouts", "progress", "log_workout"}
+    assert "--allow-writes" in skipped["log_workout"]
+
+    remote, skipped = loadtest.plan_scenarios(remote=True, member_ids=["R1"])
+    assert "workouts" in names(remote) and list(skipped) == ["log_workout"]
+    remote, skipped = loadtest.plan_scenarios(["log_workout"], remote=True, member_ids=["R1"], allow_writes=True)
+    assert names(remote) == ["log_workout"] and skipped == {}
@@ -0,0 +1,83 @@
+# tests/test_metrics.py
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from app import create_app
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _samples(text):
+    return {(s.name, tuple(sorted(s.labels.items()))): s.value
+            for family in text_string_to_metric_families(text) for s in family.samples}
+
+
+def _value(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+# ----------------------------------------------------------------------
+# 📊 /metrics
+# ----------------------------------------------------------------------
+def test_metrics_records_route_latency_and_status(client):
+    before = _samples(client.get("/metrics").get_data(as_text=True))
+    client.get("/healthcheck/live")
+    client.get("/healthcheck/live")
+    client.post("/workouts", json={})
+    client.get("/does-not-exist")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.mimetype == "text/plain"
+    after = _samples(resp.get_data(as_text=True))
+
+    def delta(name, **labels):
+        return _value(after, name, **labels) - _value(before, name, **labels)
+
+    assert delta("aceest_http_requests_total", method="GET", endpoint="/healthcheck/live", status="200") == 2
+    assert delta("aceest_http_requests_total", method="POST", endpoint="/workouts", status="400") == 1
+    assert delta("aceest_http_requests_total", method="GET", endpoint="<unmatched>", status="404") == 1
+    assert delta("aceest_http_request_duration_seconds_count", method="GET", endpoint="/healthcheck/live") == 2
+    assert delta("aceest_http_request_duration_seconds_bucket", method="GET", endpoint="/healthcheck/live", le="+Inf") == 2
+    # the scrape itself is the only request in flight
+    assert _value(after, "aceest_http_requests_in_flight", endpoint="/metrics") == 1
+    assert _value(after, "aceest_http_requests_in_flight", endpoint="/healthcheck/live") == 0
+
+
+def test_route_templates_keep_cardinality_bounded(client):
+    client.get("/members/A/reports/weekly"); client.get("/members/B/reports/weekly")
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'endpoint="/members/<regn_id>/reports/weekly"' in text
+    assert "/members/A/" not in text
+
+
+def test_multiprocess_directory_aggregates_workers(tmp_path):
+    """Two 'workers' write to the shared directory; a third process scrapes the sum."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "ACEEST_DB_PATH": ":memory:",
+           "ACEEST_CACHE_DIR": str(tmp_path / "cache")}
+    worker = textwrap.dedent("""
+        from app import create_app
+        client = create_app().test_client()
+        for _ in range(3):
+            assert client.get("/healthcheck/live").status_code == 200
+    """)
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], cwd=ROOT, env=env, check=True)
+    scrape = textwrap.dedent("""
+        from app import create_app
+        print(create_app().test_client().get("/metrics").get_data(as_text=True))
+    """)
+    out = subprocess.run([sys.executable, "-c", scrape], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    samples = _samples(out)
+    assert _value(samples, "aceest_http_requests_total", method="GET", endpoint="/healthcheck/live", status="200") == 6
@@ -0,0 +1,71 @@
+# tests/test_records.py
+import pytest
+
+from app.records import Session, SessionColumns
+from app.storage import from_epoch, to_epoch
+
+
+def _session(session_id, timestamp, category="Workout", exercise="Squats", weight=None):
+    return Session.from_entry(category, {"exercise": exercise, "duration": 10, "calories": 25.0,
+                                         "timestamp": timestamp, "weight": weight}, session_id)
+
+
+# ----------------------------------------------------------------------
+# 🧾 SESSION RECORDS
+# ----------------------------------------------------------------------
+def test_epoch_round_trip():
+    assert to_epoch("1970-01-02 00:00:01") == 86401
+    assert from_epoch(to_epoch("2024-03-05 07:30:00")) == "2024-03-05 07:30:00"
+
+
+def test_session_from_entry_interns_names_and_codes_category():
+    a = _session(1, "2024-03-05T07:30:00", exercise="".join(["Sq", "uats"]))
+    b = _session(2, "2024-03-05 08:00:00", category="Cool-down", weight=70)
+    assert a.exercise is b.exercise
+    assert (a.category, a.timestamp, a.weight) == ("Workout", "2024-03-05 07:30:00", None)
+    assert b.category == "Cool-down" and b.weight == 70.0
+    assert a.as_entry() == {"exercise": "Squats", "duration": 10, "calories": 25.0, "timestamp": "2024-03-05 07:30:00"}
+    assert not hasattr(a, "__dict__")
+    with pytest.raises(ValueError):
+        _session(3, "2024-03-05 08:00:00", category="Stretching")
+
+
+# ----------------------------------------------------------------------
+# 📊 COLUMNAR CONTAINER
+# ----------------------------------------------------------------------
+def test_columns_keep_time_order_and_are_copy_on_write():
+    columns = SessionColumns([_session(2, "2024-03-02 10:00:00"), _session(1, "2024-03-01 10:00:00")])
+    later = columns.inserted([_session(3, "2024-03-01 10:00:00", weight=60), _session(4, "2024-03-03 10:00:00")])
+    assert list(columns.ids) == [1, 2]  # original untouched
+    assert list(later.ids) == [1, 3, 2, 4]
+    assert later[1].weight == 60.0 and later.weight_list() == [None, 60.0, None, None]
+
+    recalculated = later.with_calories([1.0, 2.0, 3.0, 4.0])
+    assert [s.calories for s in recalculated] == [1.0, 2.0, 3.0, 4.0]
+    assert later.entry(0)["calories"] == 25.0
+
+
+def test_in_order_inserts_append_in_place_and_back_dated_ones_merge():
+    columns = SessionColumns([_session(1, "2024-03-01 10:00:00")])
+    grown = columns
+    for i in range(2, 200):
+        grown = grown.inserted([_session(i, "2024-03-02 10:00:00")])
+    assert grown.ids is columns.ids  # amortised appends to one shared buffer
+    assert len(columns) == 1 and list(columns)[0].session_id == 1  # older views keep their length
+    assert columns.span() == range(0, 1) and columns.weight_list() == [None]
+    with pytest.raises(IndexError):
+        columns[1]
+
+    branched = columns.inserted([_session(500, "2024-03-03 10:00:00")])  # from a stale view: copies
+    assert branched.ids is not columns.ids and list(branched.ids) == [1, 500]
+    merged = grown.inserted([_session(999, "2024-02-28 10:00:00")])
+    assert merged.ids is not grown.ids and merged.ids[0] == 999 and len(merged) == len(grown) + 1
+    assert list(grown.ids) == list(range(1, 200))
+
+
+def test_columns_range_and_keyset_lookups():
+    columns = SessionColumns([_session(i, f"2024-03-0{1 + i // 2} 10:00:00") for i in range(6)])
+    assert list(columns.span(to_epoch("2024-03-02 00:00:00"), to_epoch("2024-03-03 00:00:00"))) == [2, 3]
+    assert columns.after(to_epoch("2024-03-02 10:00:00"), 2) == 3
+    assert columns.after(to_epoch("2024-03-02 12:00:00"), 0) == 4
+    assert columns.nbytes == 45 * len(columns)
@@ -0,0 +1,71 @@
+# tests/test_render_cache.py
+import os
+import time
+from unittest import mock
+
+from app.render_cache import RenderCache, cache_key
+
+
+def test_cache_key_is_stable_and_content_addressed():
+    assert cache_key({"a": 1, "b": 2}, [1, 2]) == cache_key({"b": 2, "a": 1}, [1, 2])
+    assert cache_key({"a": 1}) != cache_key({"a": 2})
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert cache.get("k", ".pdf") is None
+    cache.put("k", b"%PDF\x00\xff", ".pdf")
+    assert cache.get("k", ".pdf") == b"%PDF\x00\xff"
+    assert cache.get("k", ".png") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 2, 1, 6)
+
+
+def test_get_or_render_renders_once(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    renders = []
+    render = lambda: renders.append(1) or b"png-bytes"
+    assert cache.get_or_render("chart", render, ".png") == b"png-bytes"
+    assert cache.get_or_render("chart", render, ".png") == b"png-bytes"
+    assert len(renders) == 1
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=30)
+    cache.put("a", b"x" * 10); cache.put("b", b"x" * 10); cache.put("c", b"x" * 10)
+    cache.get("a")  # a is now most recently used
+    cache.put("d", b"x" * 10)
+    assert cache.get("b") is None, "least recently used entry is evicted"
+    assert cache.get("a") is not None and cache.get("c") is not None and cache.get("d") is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 30
+    assert sorted(os.listdir(tmp_path)) == ["a", "c", "d"]
+
+
+def test_recency_survives_restart(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=20)
+    cache.put("old", b"x" * 10); cache.put("new", b"x" * 10)
+    past = time.time() - 100
+    os.utime(tmp_path / "new", (past, past))  # "new" hasn't been used for a while
+
+    reopened = RenderCache(str(tmp_path), max_bytes=20)
+    assert reopened.stats()["bytes"] == 20
+    reopened.put("newest", b"x" * 10)
+    assert sorted(os.listdir(tmp_path)) == ["newest", "old"]
+
+
+def test_workers_sharing_a_directory_stay_under_budget(tmp_path):
+    first, second = RenderCache(str(tmp_path), max_bytes=30), RenderCache(str(tmp_path), max_bytes=30)
+    first.put("a", b"x" * 10); first.put("b", b"x" * 10)
+    second.put("c", b"x" * 10); second.put("d", b"x" * 10)
+    assert sorted(os.listdir(tmp_path)) == ["b", "c", "d"], "second saw first's files and evicted the oldest"
+    first.put("e", b"x" * 10)
+    assert len(os.listdir(tmp_path)) == 3 and first.stats()["bytes"] == 30
+
+
+def test_entry_evicted_by_another_process_is_a_miss(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    cache.put("k", b"data")
+    with mock.patch("app.render_cache.os.utime", side_effect=FileNotFoundError):
+        assert cache.get("k") is None
+    assert cache.stats()["misses"] == 1 and cache.stats()["bytes"] == 0
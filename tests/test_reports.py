@@ -0,0 +1,88 @@
+# tests/test_reports.py
+import types
+from datetime import date
+from unittest import mock
+
+import pytest
+
+from app import reports
+
+USER = {"name": "Report User", "regn_id": "R1", "age": 40, "gender": "M", "height": 180,
+        "weight": 80, "bmi": 24.7, "bmr": 1780, "weekly_cal_goal": 2000}
+
+
+class RecordingCanvas:
+    def __init__(self, out, pagesize=None):
+        self.out = out; self.pages = [[]]; self.saved = False
+    def showPage(self): self.pages.append([])
+    def drawString(self, x, y, text): self.pages[-1].append(("text", text))
+    def drawRightString(self, x, y, text): self.pages[-1].append(("text", text))
+    def setFont(self, *a): pass
+    def save(self): self.saved = True
+
+
+class RecordingTable:
+    def __init__(self, data, colWidths=None, repeatRows=0):
+        self.data = data; self.repeatRows = repeatRows
+    def setStyle(self, style): pass
+    def wrapOn(self, canv, width, height): return width, 18 * len(self.data)
+    def drawOn(self, canv, x, y):
+        assert y >= 0, "table drawn off the bottom of the page"
+        canv.pages[-1].append(("table", self.data))
+
+
+@pytest.fixture
+def fake_reportlab(monkeypatch):
+    canvases = []
+    def make_canvas(*a, **k):
+        canvases.append(RecordingCanvas(*a, **k)); return canvases[-1]
+    monkeypatch.setattr(reports, "_reportlab", lambda: types.SimpleNamespace(
+        canvas=types.SimpleNamespace(Canvas=make_canvas), A4=(595.27, 841.89),
+        Table=RecordingTable, TableStyle=lambda *a, **k: None, colors=mock.MagicMock()))
+    return canvases
+
+
+def _sessions(n, consumed=None):
+    for i in range(n):
+        if consumed is not None:
+            consumed.append(i)
+        yield "Workout", {"exercise": f"Set {i}", "duration": 10, "calories": 12.5,
+                          "timestamp": f"2024-03-0{4 + i % 3} 07:00:00"}
+
+
+# ----------------------------------------------------------------------
+# 📄 PAGINATED WEEKLY REPORT
+# ----------------------------------------------------------------------
+def test_week_bounds_monday_to_sunday():
+    assert reports.week_bounds(date(2024, 3, 7)) == ("2024-03-04", "2024-03-10")
+    assert reports.week_bounds(date(2024, 3, 4)) == ("2024-03-04", "2024-03-10")
+
+
+def test_report_paginates_with_repeated_header(fake_reportlab):
+    pages = reports.render_weekly_report("out.pdf", USER, _sessions(100), "2024-03-04", "2024-03-10")
+    (pdf,) = fake_reportlab
+    assert pdf.saved and pages == len(pdf.pages) == 4
+    tables = [item[1] for page in pdf.pages for item in page if item[0] == "table"]
+    assert [len(t) - 1 for t in tables] == [32, 32, 32, 4]
+    assert all(t[0] == reports.TABLE_HEADER for t in tables)
+    assert ("text", "Page 4") in pdf.pages[3]
+    summary = [text for kind, text in pdf.pages[-1] if kind == "text" and text.startswith("Week total")]
+    assert summary == ["Week total: 100 sessions | 1000 min | 1250 kcal | Goal: 62% of 2000 kcal"]
+
+
+def test_report_consumes_sessions_one_page_at_a_time(fake_reportlab, monkeypatch):
+    consumed = []
+    drawn_after = []
+    original = RecordingTable.drawOn
+    monkeypatch.setattr(RecordingTable, "drawOn",
+                        lambda self, canv, x, y: (drawn_after.append(len(consumed)), original(self, canv, x, y)))
+    reports.render_weekly_report("out.pdf", USER, _sessions(70, consumed), "2024-03-04", "2024-03-10",
+                                 rows_per_page=10)
+    # each page is drawn before the next page's rows are pulled from the iterator
+    assert drawn_after == [10, 20, 30, 40, 50, 60, 70]
+
+
+def test_report_empty_week(fake_reportlab):
+    reports.render_weekly_report("out.pdf", USER, iter(()), "2024-03-04", "2024-03-10")
+    (pdf,) = fake_reportlab
+    assert ("text", "No sessions logged this week.") in pdf.pages[0]
@@ -82,3 +82,229 @@ def test_create_app_instance():
         # len(...) can be zero in minimal apps, so don't fail hard
         assert all(isinstance(k, str) for k in app.blueprints.keys())
 
+
+# ----------------------------------------------------------------------
+# 🏋️ WORKOUT INGESTION
+# ----------------------------------------------------------------------
+def test_post_workout_applies_met_formula(client):
+    resp = client.post("/workouts", json={
+        "regn_id": "API-1", "category": "Workout", "exercise": "Squats",
+        "duration": 30, "weight": 80, "timestamp": "2024-03-05T07:30:00",
+    })
+    assert resp.status_code == 201
+    data = resp.get_json()
+    assert data["calories"] == pytest.approx((6 * 3.5 * 80 / 200) * 30)
+    assert data["timestamp"] == "2024-03-05 07:30:00"
+
+    store = client.application.extensions["workout_store"]
+    assert [e["exercise"] for _, e in store.sessions("API-1")] == ["Squats"]
+
+@pytest.mark.parametrize("payload", [
+    None,
+    {"regn_id": "API-1", "exercise": "Run", "duration": 0},
+    {"regn_id": "API-1", "exercise": "Run", "duration": "abc"},
+    {"regn_id": "API-1", "exercise": "", "duration": 10},
+    {"regn_id": "API-1", "exercise": "Run", "duration": 10, "category": "Stretching"},
+    {"exercise": "Run", "duration": 10},
+    {"regn_id": ["x"], "exercise": "Run", "duration": 10},
+    {"regn_id": "API-1", "exercise": {"a": 1}, "duration": 10},
+])
+def test_post_workout_rejects_invalid_input(client, payload):
+    resp = client.post("/workouts", json=payload)
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+def test_post_workouts_batch_single_transaction(client):
+    store = client.application.extensions["workout_store"]
+    good = [{"regn_id": "KIOSK-7", "exercise": f"Set {i}", "duration": 5, "category": "Warm-up"}
+            for i in range(2000)]
+
+    bad = good[:3] + [{"regn_id": "KIOSK-7", "exercise": "Oops", "duration": -1}]
+    resp = client.post("/workouts/batch", json={"workouts": bad})
+    assert resp.status_code == 400
+    assert resp.get_json()["details"][0]["index"] == 3
+    assert store.sessions("KIOSK-7") == []
+
+    for field, value in (("weight", "nan"), ("weight", 1e308), ("duration", 10**30), ("regn_id", ["x"]),
+                         ("exercise", {"a": 1})):
+        resp = client.post("/workouts/batch", json={"workouts": good[:3] + [{**good[0], field: value}]})
+        assert resp.status_code == 400 and resp.get_json()["details"][0]["index"] == 3
+
+    resp = client.post("/workouts/batch", json={"workouts": good})
+    assert resp.status_code == 201
+    assert resp.get_json() == {"inserted": 2000}
+    assert store.totals("KIOSK-7")["Warm-up"] == 10000
+
+def test_post_workouts_batch_limits(client):
+    assert client.post("/workouts/batch", json=[]).status_code == 400
+    limit = client.application.config["MAX_BATCH_SIZE"]
+    too_many = [{"regn_id": "X", "exercise": "e", "duration": 1}] * (limit + 1)
+    assert client.post("/workouts/batch", json=too_many).status_code == 413
+
+# ----------------------------------------------------------------------
+# 📋 MEMBER ROSTER / WORKOUT HISTORY
+# ----------------------------------------------------------------------
+def test_members_roster_is_paginated():
+    app = create_app()
+    for regn_id in ("M3", "M1", "M2"):
+        app.extensions["workout_store"].save_member({"regn_id": regn_id, "name": regn_id})
+    client = app.test_client()
+    first = client.get("/members?limit=2").get_json()
+    assert [m["regn_id"] for m in first["members"]] == ["M1", "M2"]
+    second = client.get(f"/members?limit=2&cursor={first['next_cursor']}").get_json()
+    assert [m["regn_id"] for m in second["members"]] == ["M3"]
+    assert second["next_cursor"] is None
+
+def test_member_workouts_keyset_pages():
+    app = create_app()
+    app.extensions["workout_store"].add_many(
+        [("W1", "Workout", {"exercise": f"S{i}", "duration": 10, "calories": 50.0,
+                            "timestamp": f"2024-03-0{1 + i // 2} 10:00:00"}) for i in range(5)])
+    client = app.test_client()
+    seen, cursor = [], ""
+    while cursor is not None:
+        data = client.get(f"/members/W1/workouts?limit=2&cursor={cursor}").get_json()
+        seen += [w["exercise"] for w in data["workouts"]]
+        cursor = data["next_cursor"]
+    assert seen == ["S0", "S1", "S2", "S3", "S4"]
+
+    ranged = client.get("/members/W1/workouts?start=2024-03-02&end=2024-03-02").get_json()
+    assert [w["exercise"] for w in ranged["workouts"]] == ["S2", "S3"]
+    for query in ("limit=0", "limit=x", "cursor=bogus", "start=03/02/2024"):
+        assert client.get(f"/members/W1/workouts?{query}").status_code == 400
+    from app.routes import encode_cursor
+    for key in (["garbage", 1], [5, 1], [None, None], ["2024-03-01 10:00:00", "1"], ["2024-03-01 10:00:00", 2 ** 64]):
+        for accept in ("application/json", "application/x-ndjson"):
+            resp = client.get(f"/members/W1/workouts?cursor={encode_cursor(*key)}", headers={"Accept": accept})
+            assert resp.status_code == 400, (key, accept)
+    assert client.get(f"/members?cursor={encode_cursor(5)}").status_code == 400
+
+def test_member_workouts_ndjson_streams_full_history():
+    import json
+    app = create_app()
+    app.extensions["workout_store"].add_many(
+        [("N1", "Warm-up", {"exercise": f"S{i}", "duration": 5, "calories": 20.0,
+                            "timestamp": "2024-03-01 08:00:00"}) for i in range(7)])
+    resp = app.test_client().get("/members/N1/workouts?limit=3", headers={"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200 and resp.mimetype == "application/x-ndjson"
+    assert resp.is_streamed
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r["exercise"] for r in rows] == [f"S{i}" for i in range(7)]
+    assert rows[0]["category"] == "Warm-up" and "id" in rows[0]
+
+def test_member_progress_from_rollups():
+    app = create_app()
+    store = app.extensions["workout_store"]
+    store.save_member({"regn_id": "P1", "name": "P", "weekly_cal_goal": 200})
+    store.add_many([("P1", "Workout", {"exercise": "Run", "duration": 20, "calories": 150.0,
+                                       "timestamp": "2024-03-05 10:00:00"}),
+                    ("P1", "Warm-up", {"exercise": "Jog", "duration": 10, "calories": 50.0,
+                                       "timestamp": "2024-03-12 10:00:00"})])
+    client = app.test_client()
+    data = client.get("/members/P1/progress?range=3w&end=2024-03-14").get_json()
+    assert data["period"] == "week" and data["weekly_cal_goal"] == 200
+    assert [(p["start"], p["calories"], p["goal_pct"]) for p in data["periods"]] == [
+        ("2024-02-26", 0, 0.0), ("2024-03-04", 150.0, 75.0), ("2024-03-11", 50.0, 25.0)]
+    days = client.get("/members/P1/progress?range=2d&end=2024-03-05").get_json()["periods"]
+    assert [(p["start"], p["minutes"]) for p in days] == [("2024-03-04", 0), ("2024-03-05", 20)]
+    for query in ("range=0w", "range=12m", "range=1000d", "end=yesterday"):
+        assert client.get(f"/members/P1/progress?{query}").status_code == 400
+
+# ----------------------------------------------------------------------
+# 📄 BATCH WEEKLY REPORTS
+# ----------------------------------------------------------------------
+def test_weekly_reports_batch_endpoint(tmp_path, monkeypatch):
+    from app import batch_reports
+    calls = []
+    monkeypatch.setattr(batch_reports, "generate_weekly_reports",
+                        lambda out_dir, **kw: calls.append((out_dir, kw)) or {
+                            "generated": [{"regn_id": "B1", "path": "/srv/B1.pdf", "pages": 1}], "skipped": [], "failed": []})
+    app = create_app({"REPORTS_DIR": str(tmp_path), "MAX_REPORT_WORKERS": 2})
+    client = app.test_client()
+
+    resp = client.post("/reports/weekly/batch", json={"date": "2024-03-06", "force": True})
+    assert resp.status_code == 202 and resp.get_json()["kind"] == "weekly_reports_batch"
+    assert app.extensions["job_workers"].run_pending() == 1
+    status = client.get(resp.get_json()["status_url"]).get_json()
+    assert status["status"] == "succeeded" and status["result"]["generated"] == [{"regn_id": "B1", "pages": 1}]
+    out_dir, kw = calls[0]
+    assert out_dir == str(tmp_path) and kw["force"] is True and kw["workers"] == 2
+    assert kw["store"] is app.extensions["workout_store"]
+    assert kw["mp_context"].get_start_method() == "spawn"  # never fork the threaded server process
+
+    for body in ({"date": "06/03/2024"}, {"date": 20240306}, ["2024-03-06"], "2024-03-06",
+                 {"workers": 3}, {"workers": -1}, {"workers": "2"}, {"workers": True}):
+        assert client.post("/reports/weekly/batch", json=body).status_code == 400, body
+    assert client.post("/reports/weekly/batch", json={"workers": 0}).status_code == 202
+
+# ----------------------------------------------------------------------
+# 🗂️ CACHED REPORT / CHART DOWNLOADS
+# ----------------------------------------------------------------------
+def test_member_weekly_report_download_is_cached(tmp_path, monkeypatch):
+    import types
+    from unittest import mock
+    from app import reports
+    renders = []
+
+    class BufferCanvas:
+        def __init__(self, out, pagesize=None): self.out = out; renders.append(out)
+        def save(self): self.out.write(b"%PDF-1.4 fake")
+        def __getattr__(self, name): return lambda *a, **k: None
+
+    monkeypatch.setattr(reports, "_reportlab", lambda: types.SimpleNamespace(
+        canvas=types.SimpleNamespace(Canvas=BufferCanvas), A4=(595.27, 841.89),
+        Table=mock.MagicMock(**{"return_value.wrapOn.return_value": (0, 20)}),
+        TableStyle=lambda *a, **k: None, colors=mock.MagicMock()))
+    app = create_app({"RENDER_CACHE_DIR": str(tmp_path)})
+    client = app.test_client()
+    store = app.extensions["workout_store"]
+    store.save_member({"name": "Ann Lee", "regn_id": "DL-1", "age": 30, "gender": "F", "height": 160,
+                       "weight": 55, "bmi": 21.5, "bmr": 1300, "weekly_cal_goal": 2000})
+    store.add("DL-1", "Workout", {"exercise": "Row", "duration": 10, "calories": 40.0, "timestamp": "2024-03-05 07:00:00"})
+
+    assert client.get("/members/NOPE/reports/weekly").status_code == 404
+    first = client.get("/members/DL-1/reports/weekly?date=2024-03-06")
+    second = client.get("/members/DL-1/reports/weekly?date=2024-03-06")
+    assert first.status_code == 200 and first.mimetype == "application/pdf"
+    assert "Ann_Lee_weekly_report.pdf" in first.headers["Content-Disposition"]
+    assert first.data == second.data == b"%PDF-1.4 fake"
+    assert len(renders) == 1
+
+    # new data in the week -> new key -> fresh render
+    store.add("DL-1", "Warm-up", {"exercise": "Jog", "duration": 5, "calories": 9.0, "timestamp": "2024-03-06 07:00:00"})
+    client.get("/members/DL-1/reports/weekly?date=2024-03-06")
+    assert len(renders) == 2
+
+    stats = client.get("/cache/stats").get_json()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+def test_member_progress_png_is_cached(tmp_path, monkeypatch):
+    from app import charts
+    renders = []
+    monkeypatch.setattr(charts, "render_progress_png",
+                        lambda categories, values, dpi=100: renders.append(values) or b"\x89PNG fake")
+    app = create_app({"RENDER_CACHE_DIR": str(tmp_path)})
+    client = app.test_client()
+    app.extensions["workout_store"].add("PNG-1", "Workout", {"exercise": "Row", "duration": 10, "calories": 40.0})
+    for _ in range(3):
+        resp = client.get("/members/PNG-1/progress.png")
+        assert resp.status_code == 200 and resp.mimetype == "image/png" and resp.data == b"\x89PNG fake"
+    assert renders == [[0, 10, 0]]
+
+def test_render_routes_report_missing_packages(tmp_path, monkeypatch):
+    from app import charts, reports
+    def missing(name):
+        def importer(*args, **kwargs):
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        return importer
+    monkeypatch.setattr(reports, "_reportlab", missing("reportlab.pdfgen"))
+    monkeypatch.setattr(charts, "render_progress_png", missing("matplotlib"))
+    app = create_app({"RENDER_CACHE_DIR": str(tmp_path)})
+    app.extensions["workout_store"].save_member({"regn_id": "NODEP", "name": "No Deps"})
+    client = app.test_client()
+
+    pdf = client.get("/members/NODEP/reports/weekly")
+    assert pdf.status_code == 503 and "reportlab is not installed" in pdf.get_json()["error"]
+    assert "ETag" not in pdf.headers
+    png = client.get("/members/NODEP/progress.png")
+    assert png.status_code == 503 and "matplotlib is not installed" in png.get_json()["error"]
@@ -0,0 +1,314 @@
+# tests/test_storage.py
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+
+from app.memory_store import MemoryWorkoutStore
+from app.storage import (
+    CATEGORIES, SQLiteWorkoutStore, WorkoutStore, normalize_timestamp, open_store, register_backend,
+)
+
+
+def _entry(exercise, duration, timestamp, calories=10.0):
+    return {"exercise": exercise, "duration": duration, "calories": calories, "timestamp": timestamp}
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def store(request):
+    s = SQLiteWorkoutStore(":memory:") if request.param == "sqlite" else MemoryWorkoutStore(stripes=4)
+    yield s
+    s.close()
+
+
+# ----------------------------------------------------------------------
+# 🕒 TIMESTAMP NORMALISATION
+# ----------------------------------------------------------------------
+def test_normalize_timestamp_accepts_tracker_and_iso_formats():
+    assert normalize_timestamp("2024-03-05 07:30:00") == ("2024-03-05 07:30:00", "2024-03-05")
+    assert normalize_timestamp("2024-03-05T07:30:00.123456") == ("2024-03-05 07:30:00", "2024-03-05")
+
+
+# ----------------------------------------------------------------------
+# 💾 BACKENDS (every test below runs against each store)
+# ----------------------------------------------------------------------
+def test_add_and_read_back_grouped(store):
+    store.add("R1", "Workout", _entry("Squats", 20, "2024-03-05 07:30:00"))
+    store.add("R1", "Warm-up", _entry("Jog", 5, "2024-03-05 07:00:00"))
+    store.add("R2", "Workout", _entry("Rows", 15, "2024-03-05 08:00:00"))
+
+    grouped = store.sessions_by_category("R1")
+    assert set(grouped) == set(CATEGORIES)
+    assert [e["exercise"] for e in grouped["Workout"]] == ["Squats"]
+    assert grouped["Cool-down"] == []
+    # entries come back in logging order
+    assert [c for c, _ in store.sessions("R1")] == ["Warm-up", "Workout"]
+
+
+def test_add_many_is_one_transaction(store):
+    rows = [("R1", "Workout", _entry("Lift", 10, "2024-03-05 07:00:00")),
+            ("R1", "Workout", {"exercise": "Broken", "duration": 10})]  # missing calories
+    with pytest.raises(KeyError):
+        store.add_many(rows)
+    assert store.sessions("R1") == []
+
+    assert store.add_many(rows[:1] * 3) == 3
+    assert len(store.sessions("R1")) == 3
+
+
+def test_date_range_and_daily_view(store):
+    store.add("R1", "Workout", _entry("A", 10, "2024-03-01 10:00:00"))
+    store.add("R1", "Workout", _entry("B", 20, "2024-03-03 10:00:00"))
+    store.add("R1", "Cool-down", _entry("C", 5, "2024-03-03 11:00:00"))
+
+    in_range = store.sessions("R1", start_date="2024-03-02", end_date="2024-03-03")
+    assert [e["exercise"] for _, e in in_range] == ["B", "C"]
+
+    daily = store.sessions_by_date("R1")
+    assert sorted(daily) == ["2024-03-01", "2024-03-03"]
+    assert [e["exercise"] for e in daily["2024-03-03"]["Cool-down"]] == ["C"]
+
+
+def test_totals_and_replace(store):
+    store.add("R1", "Workout", _entry("A", 10, "2024-03-01 10:00:00"))
+    store.add("R1", "Workout", _entry("B", 20, "2024-03-01 11:00:00"))
+    assert store.totals("R1") == {"Warm-up": 0, "Workout": 30, "Cool-down": 0}
+
+    store.replace("R1", {"Warm-up": [_entry("Jog", 7, "2024-03-02T09:00:00")], "Workout": []})
+    assert store.totals("R1") == {"Warm-up": 7, "Workout": 0, "Cool-down": 0}
+
+
+def test_file_store_uses_wal_and_persists(tmp_path):
+    path = tmp_path / "nested" / "workouts.db"
+    s = SQLiteWorkoutStore(str(path))
+    s.add("R1", "Workout", _entry("A", 10, "2024-03-01 10:00:00"))
+    s.close()
+
+    conn = sqlite3.connect(str(path))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = [r[1] for r in conn.execute("PRAGMA index_list(sessions)")]
+    assert "idx_sessions_member_time" in indexes and "idx_sessions_member_date_cat" not in indexes
+    conn.close()
+
+    reopened = open_store(str(path))
+    assert reopened.totals("R1")["Workout"] == 10
+    reopened.close()
+
+
+def test_date_ranges_seek_the_epoch_index():
+    s = SQLiteWorkoutStore(":memory:")
+    clause, params = s._where("R1", start_date="2024-03-04", end_date="2024-03-10")
+    assert params[1:] == [1709510400, 1710115200]  # [Monday 00:00, next Monday 00:00)
+    plan = " ".join(r[3] for r in s._conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT {s._COLUMNS} FROM sessions WHERE {clause} ORDER BY ts, id", params))
+    assert "idx_sessions_member_time" in plan and "TEMP B-TREE" not in plan
+    s.close()
+
+
+# ----------------------------------------------------------------------
+# 🔌 BACKEND REGISTRY
+# ----------------------------------------------------------------------
+def test_open_store_backend_selection(monkeypatch):
+    created = []
+    register_backend("dummy", lambda path: created.append(path) or "dummy-store")
+    assert open_store("x.db", backend="dummy") == "dummy-store"
+    assert created == ["x.db"]
+
+    monkeypatch.setenv("ACEEST_STORE_BACKEND", "nope")
+    with pytest.raises(ValueError):
+        open_store(":memory:")
+
+
+def _open_and_add(path, start, regn_id):
+    start.wait()
+    s = SQLiteWorkoutStore(path)
+    s.add(regn_id, "Workout", _entry("A", 10, "2024-03-01 10:00:00"))
+    s.close()
+
+
+def test_concurrent_processes_migrate_a_fresh_database_once(tmp_path):
+    path = str(tmp_path / "fresh.db")
+    start = multiprocessing.Event()
+    procs = [multiprocessing.Process(target=_open_and_add, args=(path, start, f"R{i}")) for i in range(4)]
+    for p in procs:
+        p.start()
+    start.set()
+    for p in procs:
+        p.join(30)
+    assert [p.exitcode for p in procs] == [0, 0, 0, 0]
+    s = SQLiteWorkoutStore(path)
+    assert sum(s.totals(f"R{i}")["Workout"] for i in range(4)) == 40
+    s.close()
+
+
+def test_migrates_unversioned_database(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute(SQLiteWorkoutStore.MIGRATIONS[0])
+    conn.execute(SQLiteWorkoutStore.MIGRATIONS[1])
+    conn.execute("INSERT INTO sessions (regn_id, category, exercise, duration, calories, timestamp, date) "
+                 "VALUES ('R1', 'Workout', 'Old', 10, 1.0, '2024-01-01 10:00:00', '2024-01-01')")
+    conn.commit(); conn.close()
+
+    s = SQLiteWorkoutStore(path)
+    assert not s._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_sessions_member_date_cat'").fetchone()
+    assert s.totals("R1")["Workout"] == 10
+    assert s.rollups("R1")["2024-01-01"]["Workout"]["minutes"] == 10  # backfilled
+    assert len(s.sessions("R1", start_date="2024-01-01", end_date="2024-01-01")) == 1  # epoch ts backfilled too
+    s.add("R1", "Workout", {**_entry("New", 5, "2024-01-02 10:00:00"), "weight": 72})
+    assert s.recalculate_calories(lambda cats, durs, weights: [w or 0 for w in weights], chunk_size=1) == 2
+    assert [e["calories"] for _, e in s.sessions("R1")] == [0, 72]
+    s.close()
+
+
+def test_aggregates_per_category(store):
+    store.add("R1", "Workout", _entry("A", 10, "2024-03-01 10:00:00", calories=50.0))
+    store.add("R1", "Workout", _entry("B", 20, "2024-03-01 11:00:00", calories=70.0))
+    aggregates = store.aggregates("R1")
+    assert aggregates["Workout"] == {"minutes": 30, "calories": 120.0, "count": 2}
+    assert aggregates["Cool-down"] == {"minutes": 0, "calories": 0.0, "count": 0}
+
+
+def test_iter_sessions_streams_in_keyset_batches(store):
+    store.add_many([("R1", "Workout", _entry(f"S{i}", 1, f"2024-03-0{1 + i % 5} 10:00:00")) for i in range(23)])
+    store.add("R1", "Workout", _entry("Outside", 1, "2024-04-01 10:00:00"))
+    streamed = list(store.iter_sessions("R1", start_date="2024-03-01", end_date="2024-03-31", batch_size=5))
+    assert [e for _, e in streamed] == [e for _, e in store.sessions("R1", end_date="2024-03-31")]
+    assert len(streamed) == 23
+
+
+def test_member_profiles_and_range_signature(store):
+    assert store.get_member("R1") is None
+    store.save_member({"regn_id": "R1", "name": "Ann", "weight": 60})
+    store.save_member({"regn_id": "R1", "name": "Ann", "weight": 58})
+    assert store.get_member("R1")["weight"] == 58
+    assert list(store.members()) == [("R1", {"regn_id": "R1", "name": "Ann", "weight": 58})]
+
+    before = store.range_signature("R1", "2024-03-04", "2024-03-10")
+    store.add("R1", "Workout", _entry("A", 10, "2024-02-01 10:00:00"))
+    assert store.range_signature("R1", "2024-03-04", "2024-03-10") == before
+    store.add("R1", "Workout", _entry("B", 10, "2024-03-05 10:00:00"))
+    assert store.range_signature("R1", "2024-03-04", "2024-03-10") != before
+
+
+def test_sessions_page_keyset_cursor(store):
+    # same timestamp for every row, so the id tie-breaker decides the order
+    store.add_many([("R1", "Workout", _entry(f"S{i}", 1, "2024-03-01 10:00:00")) for i in range(5)])
+    first = store.sessions_page("R1", limit=3)
+    assert [e["exercise"] for _, _, e in first] == ["S0", "S1", "S2"]
+    last_id, _, last = first[-1]
+    rest = store.sessions_page("R1", after=(last["timestamp"], last_id), limit=3)
+    assert [e["exercise"] for _, _, e in rest] == ["S3", "S4"]
+
+    store.add("R1", "Cool-down", _entry("C", 1, "2024-03-01 09:00:00"))
+    assert [c for _, c, _ in store.sessions_page("R1", category="Cool-down")] == ["Cool-down"]
+    assert store.sessions_page("R1", after=(last["timestamp"], last_id), category="Workout", limit=1)[0][2]["exercise"] == "S3"
+
+
+def test_members_paging(store):
+    for regn_id in ("R3", "R1", "R2"):
+        store.save_member({"regn_id": regn_id})
+    assert [r for r, _ in store.members(limit=2)] == ["R1", "R2"]
+    assert [r for r, _ in store.members(after="R2")] == ["R3"]
+
+
+def test_active_members_include_profile_less_ids(store):
+    store.save_member({"regn_id": "R1"})
+    store.save_member({"regn_id": "IDLE"})
+    store.add_many([("R1", "Workout", _entry("A", 10, "2024-03-04 10:00:00")),
+                    ("API", "Workout", _entry("B", 20, "2024-03-10 18:00:00")),
+                    ("OLD", "Workout", _entry("C", 5, "2024-02-01 07:00:00"))])
+    assert store.active_members("2024-03-04", "2024-03-10") == ["API", "R1"]
+    assert store.active_members() == ["API", "OLD", "R1"]
+
+
+def test_rollups_follow_inserts_deletes_and_updates(store):
+    store.add_many([("R1", "Workout", _entry("A", 10, "2024-03-04 10:00:00")),    # Monday
+                    ("R1", "Workout", _entry("B", 20, "2024-03-10 18:00:00")),    # Sunday, same ISO week
+                    ("R1", "Cool-down", _entry("C", 5, "2024-03-11 07:00:00"))])  # next week
+    weeks = store.rollups("R1", "week")
+    assert list(weeks) == ["2024-03-04", "2024-03-11"]
+    assert weeks["2024-03-04"]["Workout"] == {"minutes": 30, "calories": 20.0, "count": 2}
+    assert store.rollups("R1", "day", "2024-03-10", "2024-03-10")["2024-03-10"]["Workout"]["minutes"] == 20
+    # the scan-based default agrees with the precomputed tables
+    assert WorkoutStore.rollups(store, "R1", "week", "2024-03-04", "2024-03-04") == store.rollups(
+        "R1", "week", "2024-03-04", "2024-03-04")
+
+    store.recalculate_calories(lambda cats, durs, weights: [1.0] * len(cats))
+    assert store.rollups("R1", "week")["2024-03-04"]["Workout"]["calories"] == 2.0
+    store.replace("R1", {"Warm-up": [_entry("D", 7, "2024-03-05 09:00:00")]})
+    assert store.rollups("R1", "day") == {"2024-03-05": {**store.rollups("R1", "day")["2024-03-05"],
+                                                         "Warm-up": {"minutes": 7, "calories": 10.0, "count": 1}}}
+    assert list(store.rollups("R1", "week")) == ["2024-03-04"]
+    with pytest.raises(ValueError):
+        store.rollups("R1", "month")
+
+
+def test_data_version_counts_member_writes(store):
+    assert store.data_version("R1") == store.data_version() == 0
+    store.add_many([("R1", "Workout", _entry("A", 10, "2024-03-04 10:00:00")),
+                    ("R2", "Workout", _entry("B", 10, "2024-03-04 10:00:00"))])
+    r1, everyone = store.data_version("R1"), store.data_version()
+    assert r1 > 0 and everyone > r1
+    store.save_member({"regn_id": "R1"})
+    assert store.data_version("R1") > r1
+    r1 = store.data_version("R1")
+    store.add("R2", "Workout", _entry("C", 10, "2024-03-05 10:00:00"))
+    assert store.data_version("R1") == r1 and store.data_version() > everyone
+    store.replace("R1", {})
+    assert store.data_version("R1") > r1
+
+
+# ----------------------------------------------------------------------
+# 🧵 MEMORY BACKEND UNDER THREADS
+# ----------------------------------------------------------------------
+def test_memory_store_concurrent_writers_and_readers():
+    store = MemoryWorkoutStore(stripes=2)  # few stripes, so members share locks
+    members = [f"R{i}" for i in range(8)]
+    errors, stop = [], threading.Event()
+
+    def writer(regn_id):
+        for i in range(200):
+            store.add(regn_id, CATEGORIES[i % 3], _entry(f"S{i}", 1, f"2024-03-{1 + i % 28:02d} 10:00:00"))
+
+    def reader():
+        while not stop.is_set():
+            for regn_id in members:
+                rows = store.sessions(regn_id)
+                # a snapshot is always internally consistent
+                if sum(store.totals(regn_id).values()) < len(rows) or rows != sorted(
+                        rows, key=lambda r: r[1]["timestamp"]):
+                    errors.append(regn_id)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    writers = [threading.Thread(target=writer, args=(m,)) for m in members * 2]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    assert errors == []
+    for regn_id in members:
+        assert sum(totals["count"] for totals in store.aggregates(regn_id).values()) == 400
+        assert len(store.sessions(regn_id)) == 400
+        assert store.data_version(regn_id) == 400
+    assert store.data_version() == 8 * 400
+
+
+def test_memory_store_writes_share_rows_with_older_snapshots():
+    store = MemoryWorkoutStore()
+    store.add("R1", "Workout", _entry("A", 10, "2024-03-01 10:00:00"))
+    before = store._snapshot("R1")
+    store.add_many([("R1", "Workout", _entry(f"S{i}", 1, "2024-03-02 10:00:00")) for i in range(50)])
+    after = store._snapshot("R1")
+    assert after.columns.ids is before.columns.ids  # appended, not copied
+    assert len(before.columns) == 1 and before.aggregates["Workout"]["count"] == 1
+    assert len(after.columns) == 51 and after.version == before.version + 1
+
+
+def test_open_store_memory_backend():
+    assert isinstance(open_store(backend="memory"), MemoryWorkoutStore)
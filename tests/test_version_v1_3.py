@@ -30,14 +30,19 @@ class DummyAxes:
         self._bars = []
         self._pies = []
 
-    def bar(self, *a, **k): self._bars.append((a, k))
+    def bar(self, *a, **k):
+        self._bars.append((a, k)); return [mock.MagicMock() for _ in a[0]]
     def set_title(self, *a, **k): pass
     def set_ylabel(self, *a, **k): pass
     def tick_params(self, *a, **k): pass
     def grid(self, *a, **k): pass
     def set_facecolor(self, *a, **k): pass
-    def pie(self, *a, **k): self._pies.append((a, k))
+    def pie(self, *a, **k):
+        self._pies.append((a, k)); n = len(a[0])
+        return tuple([mock.MagicMock() for _ in range(n)] for _ in range(3))
     def axis(self, *a, **k): pass
+    def relim(self, *a, **k): pass
+    def autoscale_view(self, *a, **k): pass
     @property
     def spines(self):
         return {"right": mock.MagicMock(), "top": mock.MagicMock()}
@@ -48,16 +53,16 @@ class DummyFigure:
         ax = DummyAxes(); self._axes.append(ax); return ax
     def tight_layout(self, *a, **k): pass
 
-class FakeCanvasWidget:
-    def __init__(self): self.packed = False; self.destroyed = False
-    def pack(self, *a, **k): self.packed = True
-    def destroy(self): self.destroyed = True
-
 class FakeCanvas:
-    def __init__(self, fig, master=None):
-        self.fig = fig; self.master = master; self._widget = FakeCanvasWidget(); self.draw_called = False
-    def draw(self): self.draw_called = True
-    def get_tk_widget(self): return self._widget
+    """Stands in for FigureCanvasAgg: a 2x1 pixel RGBA frame."""
+    def __init__(self, fig):
+        self.fig = fig; self.draws = 0
+    def draw(self): self.draws += 1
+    def get_width_height(self): return 2, 1
+    def buffer_rgba(self): return bytes([255, 0, 0, 255, 0, 0, 255, 255])
+
+class FakePhotoImage:
+    def __init__(self, master=None, **options): self.options = options
 
 # Fake PDF Canvas used by export_weekly_report
 class FakePDFCanvas:
@@ -71,17 +76,34 @@ class FakePDFCanvas:
     def __getattr__(self, name):
         return lambda *a, **k: None
 
-# Capture labels/texts created in view_summary by monkeypatching tk.Text.insert
-class DummyTextRecorder:
-    def __init__(self):
-        self.inserted = []
-    def insert(self, *args, **kwargs):
-        if len(args) >= 2:
-            self.inserted.append(args[1])
-    def tag_config(self, *a, **k): pass
-    def pack(self, *a, **k): pass
-    def config(self, *a, **k): pass
-    def yview(self, *a, **k): pass
+class FakeTable:
+    def __init__(self, data, **kwargs): self.data = data; self.kwargs = kwargs
+    def setStyle(self, style): pass
+    def wrapOn(self, canv, width, height): return width, 18 * len(self.data)
+    def drawOn(self, canv, x, y): canv.drawn.append(("table", self.data))
+
+def _fake_reportlab():
+    return types.SimpleNamespace(canvas=types.SimpleNamespace(Canvas=FakePDFCanvas), A4=(595.27, 841.89),
+                                 Table=FakeTable, TableStyle=lambda *a, **k: None, colors=mock.MagicMock())
+
+# Stand-in for ttk.Treeview used by view_summary's SessionList; `visible` and
+# `opened` play the part of the scroll position and expanded nodes
+class FakeTreeview:
+    def __init__(self, *a, **k):
+        self.items, self.children = {}, {"": []}
+        self.visible, self.opened, self.bindings, self.focused = set(), set(), {}, ""
+    def insert(self, parent, index, iid=None, **kw):
+        self.items[iid] = dict(kw, parent=parent)
+        siblings = self.children.setdefault(parent, [])
+        siblings.insert(len(siblings) if index == "end" else index, iid)
+        return iid
+    def delete(self, iid): self.children[self.items.pop(iid)["parent"]].remove(iid)
+    def get_children(self, item=""): return tuple(self.children.get(item, []))
+    def item(self, iid, option=None): return iid in self.opened if option == "open" else self.items[iid]
+    def bbox(self, iid): return (0, 0, 10, 10) if iid in self.visible else ""
+    def focus(self): return self.focused
+    def bind(self, event, handler): self.bindings[event] = handler
+    def after_idle(self, func): func()
     def __getattr__(self, _): return lambda *a, **k: None
 
 # Proper fake Scrollbar factory with set/config/pack
@@ -92,10 +114,21 @@ def _fake_scrollbar_factory(*a, **k):
         set=lambda *a, **k: None
     )
 
+def _finish_render(app):
+    """Run the queued chart render, then the Tk-side poll that shows it."""
+    app.progress_chart.renderer.run_next()
+    app.progress_chart.poll()
+
+def _finish_export(app):
+    """Wait for the background export job, then run the Tk-side completion check."""
+    assert app.jobs.wait(app.export_job_id, timeout=10)["status"] in ("succeeded", "failed")
+    app.check_export(app.export_job_id)
+
 # --------- Fixtures --------- #
 @pytest.fixture
-def module_and_app(monkeypatch):
+def module_and_app(monkeypatch, tmp_path):
     assert TEST_FILE.exists(), f"{TEST_FILE} not found"
+    monkeypatch.chdir(tmp_path)  # exported PDFs land here
     spec = importlib.util.spec_from_file_location("ace_fit_v1_3", str(TEST_FILE))
     module = importlib.util.module_from_spec(spec)
     sys.modules["ace_fit_v1_3"] = module
@@ -107,13 +140,13 @@ def module_and_app(monkeypatch):
 
     # Patch plotting classes
     monkeypatch.setattr(module, "Figure", DummyFigure, raising=False)
-    monkeypatch.setattr(module, "FigureCanvasTkAgg", FakeCanvas, raising=False)
+    monkeypatch.setattr(module, "FigureCanvasAgg", FakeCanvas, raising=False)
+    monkeypatch.setattr(module.tk, "PhotoImage", FakePhotoImage, raising=False)
+    # charts render when a test calls _finish_render(), not on a background thread
+    monkeypatch.setattr(module.ChartRenderer, "start", lambda self: None)
 
-    # Patch PDF canvas class
-    monkeypatch.setattr(module.pdf_canvas, "Canvas", FakePDFCanvas, raising=False)
-
-    # **Ensure a real A4 page-size tuple exists on the module so code can unpack it**
-    monkeypatch.setattr(module, "A4", (595.27, 841.89), raising=False)
+    # Patch reportlab (loaded lazily by app/reports.py) with a fake PDF canvas and real A4 tuple
+    monkeypatch.setattr(module.reports, "_reportlab", _fake_reportlab)
 
     # Create app with MagicMock root (ttk.Style calls are no-ops on MagicMock)
     root = mock.MagicMock()
@@ -125,8 +158,11 @@ def module_and_app(monkeypatch):
     except Exception:
         pass
 
+    # Tabs other than Log are built on first selection; the chart tests need the Progress tab
+    app.build_tab(module.PROGRESS_TAB)
+
     # Replace chart_container with simple object safe for tests (some envs mock tk.Frame)
-    app.chart_container = types.SimpleNamespace(winfo_children=lambda: [])
+    app.chart_container = types.SimpleNamespace(winfo_children=lambda: [], after=lambda ms, fn: None)
 
     # make sure ttk.Scrollbar factory is safe for tests
     monkeypatch.setattr(module.ttk, "Scrollbar", _fake_scrollbar_factory, raising=False)
@@ -148,6 +184,11 @@ def test_save_user_info_success_and_invalid(module_and_app):
     app.gender_entry = _make_entry("F")
     app.height_entry = _make_entry("165")
     app.weight_entry = _make_entry("60")
+    app.regn_entry = _make_entry("  ")
+    app.save_user_info()
+    assert mb.error_calls and not app.user_info, "Regn-ID is required"
+    mb.error_calls.clear()
+    app.regn_entry = _make_entry("REG123")
     app.save_user_info()
     assert app.user_info, "user_info should be populated"
     assert "bmi" in app.user_info and "bmr" in app.user_info
@@ -167,8 +208,15 @@ def test_save_user_info_success_and_invalid(module_and_app):
 def test_add_workout_success_and_daily_tracking(module_and_app):
     module, app, mb = module_and_app
 
+    # no saved member yet -> nothing is logged
+    app.workout_entry = _make_entry("Cycling")
+    app.duration_entry = _make_entry("30")
+    app.add_workout()
+    assert mb.error_calls and app.store.sessions("") == []
+    mb.error_calls.clear()
+
     # prepare user_info so calorie calc uses provided weight
-    app.user_info = {"weight": 80}
+    app.user_info = {"regn_id": "R-ADD", "weight": 80}
 
     # distinct entry-like objects
     app.workout_entry = _make_entry("Cycling")
@@ -193,6 +241,7 @@ def test_add_workout_success_and_daily_tracking(module_and_app):
 
 def test_add_workout_invalid_and_zero_duration(module_and_app):
     module, app, mb = module_and_app
+    app.user_info = {"regn_id": "R-BAD"}
 
     # invalid non-int
     app.workout_entry = _make_entry("Run")
@@ -215,36 +264,49 @@ def test_view_summary_empty_and_populated(monkeypatch, module_and_app):
     app.view_summary()
     assert mb.info_calls, "Expected info when no sessions"
 
-    # populated case -> replace Text widget with recorder to capture inserted text
+    # populated case -> sessions are paged into a (fake) Treeview on demand
     mb.info_calls.clear()
-    from datetime import datetime
     app.workouts = {
-        "Warm-up": [{"exercise": "jog", "duration": 10, "calories": 10.0, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}],
-        "Workout": [{"exercise": "lift", "duration": 20, "calories": 50.0, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}],
+        "Warm-up": [{"exercise": "jog", "duration": 10, "calories": 10.0, "timestamp": "2024-03-01 07:00:00"}],
+        "Workout": [{"exercise": f"lift{i}", "duration": 20, "calories": 50.0, "timestamp": f"2024-03-0{i + 1} 08:00:00"}
+                    for i in range(5)],
         "Cool-down": []
     }
-
-    recorder = DummyTextRecorder()
-    # monkeypatch module.tk.Text to our recorder factory
-    monkeypatch.setattr(module.tk, "Text", lambda *a, **k: recorder, raising=False)
-    # monkeypatch ttk.Scrollbar to proper fake (with set)
-    monkeypatch.setattr(module.ttk, "Scrollbar", _fake_scrollbar_factory, raising=False)
-
+    monkeypatch.setattr(module.ttk, "Treeview", FakeTreeview, raising=False)
     app.view_summary()
-
-    # recorder should have some inserted text fragments including totals
-    combined_text = "".join(recorder.inserted).lower()
-    assert "total training time" in combined_text or "total" in combined_text
+    session_list = app.summary_list
+    tree = session_list.tree
+    session_list.page_size = 2
+
+    assert tree.get_children() == ("Warm-up", "Workout", "Cool-down", "totals")
+    assert tree.item("Workout")["values"][0] == "5 sessions"
+    assert "Total Training Time: 110 minutes" in tree.item("totals")["values"][0]
+    assert tree.item("Cool-down:more")["values"][0] == "No sessions recorded."
+    # nothing is read from the store until a category is expanded
+    assert tree.get_children("Workout") == ("Workout:more",)
+
+    tree.focused = "Workout"; tree.opened.add("Workout")
+    tree.bindings["<<TreeviewOpen>>"](None)
+    assert len(tree.get_children("Workout")) == 3  # first page + "more" row
+    session_list.fill_visible()  # "more" row off screen -> no extra page
+    assert len(tree.get_children("Workout")) == 3
+
+    tree.visible.add("Workout:more")
+    session_list._on_scroll("0.0", "1.0")
+    session_list._on_scroll("0.0", "1.0")
+    rows = [tree.item(iid) for iid in tree.get_children("Workout")]
+    assert [r["text"] for r in rows] == ["1", "2", "3", "4", "5"]  # "more" row removed once exhausted
+    assert [r["values"][0] for r in rows] == [f"lift{i}" for i in range(5)]
+    assert rows[0]["values"][3] == "2024-03-01"
 
 def test_update_progress_charts_no_data_and_with_data(module_and_app):
     module, app, mb = module_and_app
 
     # no data
-    app.chart_container = types.SimpleNamespace(winfo_children=lambda: [])
     app.workouts = {"Warm-up": [], "Workout": [], "Cool-down": []}
     app.update_progress_charts()
-    # chart_canvas should remain None if no data
-    assert app.chart_canvas is None
+    # nothing is rendered if there is no data
+    assert app.progress_chart.renderer.figure is None and app.progress_chart.image_label is None
 
     # with data
     from datetime import datetime
@@ -253,13 +315,14 @@ def test_update_progress_charts_no_data_and_with_data(module_and_app):
         "Workout": [{"exercise": "push", "duration": 25, "calories": 50.0, "timestamp": datetime.now().isoformat()}],
         "Cool-down": []
     }
-    module = sys.modules["ace_fit_v1_3"]
-    module.Figure = DummyFigure
-    module.FigureCanvasTkAgg = FakeCanvas
-    app.chart_container = types.SimpleNamespace(winfo_children=lambda: [])
     app.update_progress_charts()
-    assert isinstance(app.chart_canvas, FakeCanvas)
-    assert app.chart_canvas.draw_called
+    assert app.progress_chart.shown_version is None  # rendering happens off the Tk thread
+    _finish_render(app)
+    chart = app.progress_chart
+    assert chart.shown_version == chart.version and chart.renderer.canvas.draws == 1
+    # RGBA frame converted to binary PPM for tk.PhotoImage
+    assert chart.photo.options == {"width": 2, "height": 1, "format": "PPM",
+                                   "data": b"P6 2 1 255\n" + bytes([255, 0, 0, 0, 0, 255])}
 
 def test_export_weekly_report_generates_pdf(monkeypatch, module_and_app):
     module, app, mb = module_and_app
@@ -277,6 +340,227 @@ def test_export_weekly_report_generates_pdf(monkeypatch, module_and_app):
     # Our module's pdf_canvas.Canvas is already monkeypatched to FakePDFCanvas in fixture.
     # call export and verify messagebox showinfo and that fake PDF saved
     app.export_weekly_report()
+    _finish_export(app)
     assert mb.info_calls, "Expected showinfo after PDF export"
     _, msg = mb.info_calls[-1]
     assert ".pdf" in msg.lower()
+
+def test_workouts_persist_per_member_in_store(module_and_app):
+    module, app, mb = module_and_app
+
+    app.user_info = {"regn_id": "R9", "weight": 70}
+    app.workout_entry = _make_entry("Rowing")
+    app.duration_entry = _make_entry("12")
+    app.add_workout()
+
+    # a fresh tracker on the same store sees the member's history
+    other = module.FitnessTrackerApp(mock.MagicMock(), store=app.store)
+    other.user_info = {"regn_id": "R9"}
+    assert [e["exercise"] for e in other.workouts["Workout"]] == ["Rowing"]
+    other.user_info = {"regn_id": "someone-else"}
+    assert not any(other.workouts.values())
+
+def test_running_totals_updated_without_rescanning(module_and_app):
+    module, app, mb = module_and_app
+    app.user_info = {"regn_id": "R10", "weight": 70}
+    loads = []
+    real_aggregates = app.store.aggregates
+    app.store.aggregates = lambda regn_id: loads.append(regn_id) or real_aggregates(regn_id)
+    app.store.sessions = mock.Mock(side_effect=AssertionError("no rescans on add"))
+
+    for name, minutes in (("Squats", "10"), ("Lunges", "15")):
+        app.workout_entry = _make_entry(name)
+        app.duration_entry = _make_entry(minutes)
+        app.add_workout()
+
+    assert loads == ["R10"], "aggregates are loaded once, then maintained incrementally"
+    workout = app.totals["Workout"]
+    assert workout["minutes"] == 25 and workout["count"] == 2
+    assert workout["calories"] == pytest.approx(module.calculate_calories("Workout", 25, 70))
+
+    # switching member reloads that member's aggregates
+    app.user_info = {"regn_id": "R11"}
+    assert app.totals["Workout"]["count"] == 0
+    assert loads == ["R10", "R11"]
+
+def test_progress_chart_reuses_figure_and_label(module_and_app):
+    module, app, mb = module_and_app
+    app.total_label = mock.MagicMock()
+    app.workouts = {"Warm-up": [], "Cool-down": [],
+                    "Workout": [{"exercise": "push", "duration": 30, "calories": 50.0, "timestamp": "2024-03-05 07:00:00"}]}
+
+    app.update_progress_charts(); _finish_render(app)
+    chart = app.progress_chart
+    renderer, canvas, label = chart.renderer, chart.renderer.canvas, chart.image_label
+    assert isinstance(canvas, FakeCanvas) and canvas.draws == 1
+
+    app.workouts = {"Warm-up": [{"exercise": "jog", "duration": 10, "calories": 5.0, "timestamp": "2024-03-05 06:50:00"}],
+                    "Cool-down": [], "Workout": [{"exercise": "push", "duration": 30, "calories": 50.0, "timestamp": "2024-03-05 07:00:00"}]}
+    app.update_progress_charts(); _finish_render(app)
+    assert app.progress_chart is chart and renderer.canvas is canvas and chart.image_label is label
+    assert canvas.draws == 2
+    renderer.bars[0].set_height.assert_called_with(10)
+    renderer.bars[1].set_height.assert_called_with(30)
+    # Warm-up wedge spans a quarter of the pie starting at 12 o'clock
+    renderer.wedges[0].set_theta1.assert_called_with(90.0)
+    renderer.wedges[0].set_theta2.assert_called_with(180.0)
+    renderer.pie_pcts[2].set_visible.assert_called_with(False)
+    # one total label, updated in place
+    app.total_label.config.assert_called_with(text="LIFETIME TOTAL: 40 minutes logged")
+
+def test_chart_renders_skip_stale_requests(module_and_app):
+    module, app, mb = module_and_app
+    chart = module.ProgressChart(types.SimpleNamespace(after=lambda ms, fn: None))
+    renderer = chart.renderer
+
+    # a burst of updates before the worker runs -> one render, of the newest data
+    for minutes in (10, 20, 30):
+        chart.update(["Warm-up", "Workout", "Cool-down"], [minutes, 0, 0])
+    assert renderer.run_next() and not renderer.run_next()
+    chart.poll()
+    assert chart.shown_version == 3 and renderer.canvas.draws == 1
+    renderer.bars[0].set_height.assert_called_with(30)
+
+    # data that changes mid-render abandons the old frame before drawing it
+    chart.update(["Warm-up", "Workout", "Cool-down"], [40, 0, 0])
+    renderer._layout_pie = lambda values: chart.update(["Warm-up", "Workout", "Cool-down"], [50, 0, 0])
+    renderer.run_next()
+    assert renderer.canvas.draws == 1 and renderer.frames.empty() and renderer.pending
+
+    # clearing the data cancels the queued render
+    chart.update(["Warm-up", "Workout", "Cool-down"], [0, 0, 0])
+    assert not renderer.run_next() and not renderer.pending
+
+def test_chart_renderer_thread_hands_frames_to_tk(monkeypatch, module_and_app):
+    module, app, mb = module_and_app
+    monkeypatch.undo()  # real ChartRenderer.start
+    monkeypatch.setattr(module, "Figure", DummyFigure)
+    monkeypatch.setattr(module, "FigureCanvasAgg", FakeCanvas)
+    renderer = module.ChartRenderer()
+    renderer.start()
+    renderer.submit(1, ["Warm-up", "Workout", "Cool-down"], [5, 10, 0])
+    version, width, height, ppm = renderer.frames.get(timeout=5)
+    assert (version, width, height) == (1, 2, 1) and ppm.startswith(b"P6 2 1 255\n")
+    assert renderer._thread.name == "chart-renderer" and renderer._thread.daemon
+
+def test_goal_progress_reads_weekly_rollups(module_and_app):
+    module, app, mb = module_and_app
+    app.goal_label = mock.MagicMock()
+    app.user_info = {"regn_id": "G1", "weekly_cal_goal": 400}
+    this_monday = module.week_bounds()[0]
+    app.store.add("G1", "Workout", {"exercise": "Row", "duration": 30, "calories": 100.0,
+                                    "timestamp": f"{this_monday} 07:00:00"})
+    app.store.sessions = mock.Mock(side_effect=AssertionError("goal widget must not scan sessions"))
+    app.update_goal_progress()
+    app.goal_label.config.assert_called_with(
+        text="THIS WEEK: 100 of 400 kcal goal (25%) | Goal met in 0 of the last 52 weeks")
+
+    app.user_info = {}
+    app.update_goal_progress()
+    app.goal_label.config.assert_called_with(text="")
+
+class FakeAfterMaster:
+    """Collects master.after callbacks so tests can run them on demand."""
+    def __init__(self): self.callbacks = []
+    def after(self, ms, fn): self.callbacks.append(fn); return f"after#{len(self.callbacks)}"
+    def after_cancel(self, ident): pass
+    def run_pending(self):
+        pending, self.callbacks = self.callbacks, []
+        for fn in pending: fn()
+
+def test_redraw_scheduler_coalesces_and_skips(module_and_app):
+    module, app, mb = module_and_app
+    master = FakeAfterMaster()
+    visible = {"progress": True}
+    redraws = []
+    app.chart_scheduler = module.RedrawScheduler(master, lambda: redraws.append(app.data_version),
+                                                 lambda: visible["progress"],
+                                                 lambda: (app.member_id, app.data_version))
+    app.user_info = {"regn_id": "SCAN", "weight": 70}
+
+    # a burst of scanner adds queues a single redraw
+    for i in range(5):
+        app.workout_entry = _make_entry(f"Scan {i}")
+        app.duration_entry = _make_entry("1")
+        app.add_workout()
+    assert len(master.callbacks) == 1
+    master.run_pending()
+    assert redraws == [5]
+
+    # nothing changed -> selecting the tab again doesn't re-render
+    app.chart_scheduler.request(); master.run_pending()
+    assert redraws == [5]
+
+    # hidden tab -> stays dirty until the Progress tab is shown
+    visible["progress"] = False
+    app.workout_entry = _make_entry("Scan 6"); app.duration_entry = _make_entry("1")
+    app.add_workout(); master.run_pending()
+    assert redraws == [5] and app.chart_scheduler.dirty
+    visible["progress"] = True
+    app.notebook.tab.return_value = "📈 Progress Tracker"
+    app.on_tab_change(None); master.run_pending()
+    assert redraws == [5, 6] and not app.chart_scheduler.dirty
+
+def test_tabs_are_built_on_first_selection(monkeypatch, module_and_app):
+    module, _, _ = module_and_app
+    built = []
+    for name in ("create_workout_plan_tab", "create_diet_guide_tab", "create_progress_tab"):
+        monkeypatch.setattr(module.FitnessTrackerApp, name, lambda self, name=name: built.append(name))
+    app = module.FitnessTrackerApp(mock.MagicMock())
+    assert app.built_tabs == {module.LOG_TAB} and built == []
+    app.master.after_idle.assert_called_with(app.mark_interactive)
+    app.mark_interactive()
+    assert "log tab interactive (total)" in module.startup_report()
+
+    app.notebook = mock.MagicMock()  # other test modules may leave ttk.Notebook patched
+    app.notebook.tab.return_value = module.PROGRESS_TAB
+    app.on_tab_change(None); app.on_tab_change(None)
+    app.notebook.tab.return_value = module.DIET_TAB
+    app.on_tab_change(None)
+    assert built == ["create_progress_tab", "create_diet_guide_tab"]
+    assert "build tab Progress Tracker" in module.startup_report()
+
+def test_heavy_dependencies_load_lazily(monkeypatch):
+    spec = importlib.util.spec_from_file_location("ace_fit_v1_3_lazy", str(TEST_FILE))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.Figure is None
+
+    imported = []
+    monkeypatch.setattr(module.importlib, "import_module",
+                        lambda name: imported.append(name) or types.SimpleNamespace(
+                            Figure="F", FigureCanvasAgg="C"))
+    module._load_charting()
+    assert imported == ["matplotlib.figure", "matplotlib.backends.backend_agg"]
+    assert module.Figure == "F"
+    module._load_charting()  # second call is free
+    assert len(imported) == 2
+
+    report = module.startup_report()
+    assert "tkinter" in report and "app.storage" in report and "matplotlib.figure" in report
+    assert "startup imports" not in report
+
+def test_export_weekly_report_only_includes_this_week(monkeypatch, module_and_app):
+    module, app, mb = module_and_app
+    canvases = []
+    monkeypatch.setattr(module.reports, "_reportlab", lambda: types.SimpleNamespace(
+        **{**vars(_fake_reportlab()), "canvas": types.SimpleNamespace(
+            Canvas=lambda *a, **k: canvases.append(FakePDFCanvas(*a, **k)) or canvases[-1])}))
+    app.user_info = {"name": "Week User", "regn_id": "R-WEEK", "age": 30, "gender": "F", "height": 160,
+                     "weight": 55, "bmi": 21.5, "bmr": 1300, "weekly_cal_goal": 2000}
+    from datetime import datetime, timedelta
+    now = datetime.now()
+    app.workouts = {"Warm-up": [], "Cool-down": [],
+                    "Workout": [{"exercise": "old", "duration": 5, "calories": 5.0, "timestamp": now - timedelta(days=30)},
+                                {"exercise": "new", "duration": 25, "calories": 60.0, "timestamp": now}]}
+    app.export_weekly_report()
+    _finish_export(app)
+    (pdf,) = canvases
+    assert pdf.saved and pathlib.Path("Week_User_weekly_report.pdf").exists()
+    tables = [data for kind, data in pdf.drawn if kind == "table"]
+    assert [row[1] for row in tables[0][1:]] == ["new"]
+
+    # unchanged data -> the second export is served from the render cache
+    app.export_weekly_report()
+    _finish_export(app)
+    assert len(canvases) == 1 and app.render_cache.hits == 1
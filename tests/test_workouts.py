@@ -0,0 +1,116 @@
+# tests/test_workouts.py
+import pytest
+
+from app.workouts import MET_VALUES, calculate_calories, parse_duration, validate_workout
+
+
+def test_calculate_calories_matches_tracker_formula():
+    for category, met in MET_VALUES.items():
+        assert calculate_calories(category, 10, 70) == pytest.approx((met * 3.5 * 70 / 200) * 10)
+    # unknown categories fall back to MET 5 like the GUI
+    assert calculate_calories("Other", 10, 70) == pytest.approx((5 * 3.5 * 70 / 200) * 10)
+
+
+@pytest.mark.parametrize("value, expected", [("15", 15), (" 7 ", 7), (20, 20), (3.0, 3)])
+def test_parse_duration_accepts_whole_numbers(value, expected):
+    assert parse_duration(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "-3", "abc", 2.5, True, None, "nan", "inf", 1e308, 10**30, 1441])
+def test_parse_duration_rejects_invalid(value):
+    with pytest.raises(ValueError, match="positive whole number"):
+        parse_duration(value)
+
+
+def test_validate_workout_defaults():
+    regn_id, category, entry = validate_workout({"regn_id": " R1 ", "exercise": "Run", "duration": "10"})
+    assert (regn_id, category) == ("R1", "Workout")
+    assert entry["calories"] == pytest.approx(calculate_calories("Workout", 10, 70))
+    assert len(entry["timestamp"]) == 19
+
+
+def test_validate_workout_rejects_bad_weight_and_timestamp():
+    base = {"regn_id": "R1", "exercise": "Run", "duration": 10}
+    with pytest.raises(ValueError, match="weight"):
+        validate_workout({**base, "weight": "heavy"})
+    with pytest.raises(ValueError, match="timestamp"):
+        validate_workout({**base, "timestamp": "yesterday"})
+    for weight in ("nan", "inf", float("nan"), 1e308, 10**30, 10**400, 501, 0):
+        with pytest.raises(ValueError, match="weight"):
+            validate_workout({**base, "weight": weight})
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("regn_id", ["x"], "regn_id must be a string"), ("regn_id", 7, "regn_id must be a string"),
+    ("exercise", {"a": 1}, "exercise must be a string"), ("regn_id", "R" * 65, "at most 64"),
+    ("exercise", "E" * 101, "at most 100"),
+])
+def test_validate_workout_rejects_non_string_and_oversized_text(field, value, message):
+    with pytest.raises(ValueError, match=message):
+        validate_workout({"regn_id": "R1", "exercise": "Run", "duration": 10, field: value})
+
+
+def test_validate_workout_converts_utc_offsets_to_local_time(monkeypatch):
+    import time
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        base = {"regn_id": "R1", "exercise": "Run", "duration": 10}
+        for stamp in ("2024-03-05T02:00:00Z", "2024-03-05T02:00:00+00:00", "2024-03-05 07:30:00+05:30"):
+            assert validate_workout({**base, "timestamp": stamp})[2]["timestamp"] == "2024-03-05 07:30:00"
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+# ----------------------------------------------------------------------
+# ⚡ BATCH CALORIE ENGINE
+# ----------------------------------------------------------------------
+@pytest.fixture(params=["numpy", "pure-python"])
+def engine(request, monkeypatch):
+    import app.workouts as workouts
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(workouts, "np", None)
+    return workouts
+
+
+def test_batch_matches_scalar_formula(engine):
+    categories = ["Warm-up", "Workout", "Cool-down", "Workout"]
+    durations = [10, 30, 5, 1]
+    weights = [60.0, 80.0, None, 100.5]
+    codes = [engine.CATEGORY_CODES[c] for c in categories]
+    burns = engine.calculate_calories_batch(codes, durations, weights)
+    expected = [engine.calculate_calories(c, d, 70 if w is None else w)
+                for c, d, w in zip(categories, durations, weights)]
+    assert burns == pytest.approx(expected)
+    assert engine.calculate_calories_batch([], [], []) == []
+
+
+def test_batch_unknown_codes_and_custom_met_table(engine):
+    burns = engine.calculate_calories_batch([-1, 99, 1], [10, 10, 10], [70, 70, 70],
+                                            met_values={"Workout": 8})
+    assert burns == pytest.approx([(5 * 3.5 * 70 / 200) * 10] * 2 + [(8 * 3.5 * 70 / 200) * 10])
+
+
+def test_validate_workouts_collects_errors(engine):
+    rows, errors = engine.validate_workouts([
+        {"regn_id": "R1", "exercise": "Run", "duration": 10, "weight": 90},
+        {"regn_id": "R1", "exercise": "Run", "duration": "x"},
+    ])
+    assert [e["index"] for e in errors] == [1]
+    assert rows[0][2]["calories"] == pytest.approx(engine.calculate_calories("Workout", 10, 90))
+
+
+def test_recompute_calories_after_met_change(engine):
+    from app.storage import SQLiteWorkoutStore
+    store = SQLiteWorkoutStore(":memory:")
+    rows, _ = engine.validate_workouts([
+        {"regn_id": "R1", "category": "Workout", "exercise": "Lift", "duration": 10, "weight": 80},
+        {"regn_id": "R2", "category": "Warm-up", "exercise": "Jog", "duration": 20},
+    ])
+    store.add_many(rows)
+    assert engine.recompute_calories(store, met_values={"Workout": 7, "Warm-up": 4}) == 2
+    assert store.sessions("R1")[0][1]["calories"] == pytest.approx((7 * 3.5 * 80 / 200) * 10)
+    assert store.sessions("R2")[0][1]["calories"] == pytest.approx((4 * 3.5 * 70 / 200) * 20)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Load test for the Flask service: p50/p95/p99 latency and throughput per route.
+
+By default the script starts the service under gunicorn with the Dockerfile's
+--workers/--threads (run:app, or asgi:app with --mode async), on a throwaway
+database seeded with synthetic members.
+Pass --url to test a server that is already running instead (e.g. an image tag).
+Against --url, per-member routes need real ids from --member-ids and write
+routes only run with --allow-writes, so a shared server isn't filled with
+synthetic sessions.
+Results go to a JSON file that can be diffed, or checked with --baseline,
+between releases.
+
+Usage:
+  python3 tools/loadtest.py --label v1.4 --out reports/loadtest-v1.4.json
+  python3 tools/loadtest.py --url http://localhost:5000 --member-ids R1001,R1002 --concurrency 16 --duration 20
+  python3 tools/loadtest.py --out new.json --baseline reports/loadtest-v1.3.json --max-regression 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (name, method, path, json body); {member} is replaced per request
+SCENARIOS = [
+    ("home", "GET", "/", None),
+    ("ready", "GET", "/healthcheck/ready", None),
+    ("members", "GET", "/members?limit=50", None),
+    ("workouts", "GET", "/members/{member}/workouts?limit=100", None),
+    ("progress", "GET", "/members/{member}/progress?range=12w", None),
+    ("log_workout", "POST", "/workouts",
+     {"regn_id": "{member}", "category": "Workout", "exercise": "Rowing", "duration": 20}),
+]
+
+
+def plan_scenarios(routes=None, remote=False, member_ids=None, allow_writes=False):
+    """Return ``(scenarios to run, {name: reason} skipped)`` for the selected routes.
+
+    Locally the throwaway database makes every route safe.  Against a remote
+    server, writes need ``allow_writes`` and per-member routes need real
+    ``member_ids`` (synthetic ones would only measure empty pages).
+    """
+    scenarios, skipped = [], {}
+    for scenario in SCENARIOS:
+        name, method, path, body = scenario
+        if routes and name not in routes:
+            continue
+        if remote and method != "GET" and not allow_writes:
+            skipped[name] = "writes to the target server; pass --allow-writes"
+        elif remote and not member_ids and "{member}" in path + json.dumps(body):
+            skipped[name] = "needs real members; pass --member-ids"
+        else:
+            scenarios.append(scenario)
+    return scenarios, skipped
+
+
+def dockerfile_settings(path=os.path.join(ROOT, "Dockerfile")):
+    """Return {"workers": n, "threads": n} from the Dockerfile's gunicorn CMD."""
+    settings = {"workers": 2, "threads": 4}
+    with open(path) as f:
+        text = f.read()
+    for key in settings:
+        match = re.search(rf'"--{key}",\s*"(\d+)"', text)
+        if match:
+            settings[key] = int(match.group(1))
+    return settings
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, statuses, elapsed):
+    latencies = sorted(latencies)
+    errors = sum(1 for s in statuses if not isinstance(s, int) or s >= 400)
+    ms = lambda v: None if v is None else round(v * 1000, 2)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+        "statuses": {str(s): statuses.count(s) for s in sorted(set(statuses), key=str)},
+    }
+
+
+def _fill(value, member):
+    if isinstance(value, str):
+        return value.replace("{member}", member)
+    if isinstance(value, dict):
+        return {k: _fill(v, member) for k, v in value.items()}
+    return value
+
+
+def run_scenario(base_url, scenario, members, concurrency, duration):
+    """Hammer one route from `concurrency` threads for `duration` seconds."""
+    name, method, path, body = scenario
+    latencies, statuses, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local_lat, local_status = [], []
+        while time.perf_counter() < deadline:
+            member = rng.choice(members)
+            start = time.perf_counter()
+            try:
+                resp = session.request(method, base_url + _fill(path, member), json=_fill(body, member), timeout=30)
+                resp.content  # include body transfer
+                status = resp.status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            local_lat.append(time.perf_counter() - start)
+            local_status.append(status)
+        with lock:
+            latencies.extend(local_lat); statuses.extend(local_status)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+def seed_database(db_path, members, sessions_per_member):
+    from app.storage import open_store
+    from app.workouts import calculate_calories
+    store = open_store(db_path, "sqlite")
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, 7, 0, 0)
+    rows = []
+    for regn_id in members:
+        store.save_member({"regn_id": regn_id, "name": f"Member {regn_id}", "age": 30, "gender": "F",
+                           "height": 170.0, "weight": 65.0, "bmi": 22.5, "bmr": 1400.0, "weekly_cal_goal": 2000})
+        for i in range(sessions_per_member):
+            category = rng.choice(("Warm-up", "Workout", "Cool-down"))
+            duration = rng.randint(5, 60)
+            rows.append((regn_id, category, {
+                "exercise": f"Exercise {i % 12}", "duration": duration, "weight": 65.0,
+                "calories": calculate_calories(category, duration, 65.0),
+                "timestamp": (start + timedelta(hours=8 * i)).strftime("%Y-%m-%d %H:%M:%S")}))
+    store.add_many(rows)
+    store.close()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(workdir, workers, threads, mode="sync", extra_env=None):
+    port = _free_port()
+    env = dict(os.environ, ACEEST_DB_PATH=os.path.join(workdir, "workouts.db"),
+               ACEEST_JOBS_DB=os.path.join(workdir, "jobs.db"),
+               ACEEST_CACHE_DIR=os.path.join(workdir, "cache"), ACEEST_SERVER_MODE=mode,
+               PROMETHEUS_MULTIPROC_DIR=os.path.join(workdir, "metrics"), **(extra_env or {}))
+    cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+           "--workers", str(workers), "--threads", str(threads), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            if requests.get(base_url + "/healthcheck/live", timeout=1).ok:
+                return proc, base_url
+        except requests.RequestException:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not become live within 20s")
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """Return messages for routes whose p95 grew by more than `max_regression` (a fraction)."""
+    regressions = []
+    for name, current in results["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before or not before.get("p95_ms") or current.get("p95_ms") is None:
+            continue
+        change = current["p95_ms"] / before["p95_ms"] - 1
+        if change > max_regression:
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    defaults = dockerfile_settings()
+    parser = argparse.ArgumentParser(description="Load-test the ACEest Flask service.")
+    parser.add_argument("--url", help="test this running server instead of starting gunicorn")
+    parser.add_argument("--workers", type=int, default=defaults["workers"], help="gunicorn workers (default: Dockerfile)")
+    parser.add_argument("--threads", type=int, default=defaults["threads"], help="gunicorn threads (default: Dockerfile)")
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync", help="ACEEST_SERVER_MODE to start")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients per route")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per route")
+    parser.add_argument("--members", type=int, default=50, help="synthetic members to seed")
+    parser.add_argument("--member-ids", help="comma-separated existing regn_ids to request (with --url)")
+    parser.add_argument("--allow-writes", action="store_true", help="run write routes against --url too")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per seeded member")
+    parser.add_argument("--route", action="append", choices=[s[0] for s in SCENARIOS],
+                        help="route(s) to test (default: all)")
+    parser.add_argument("--label", default=None, help="release label recorded in the output, e.g. v1.4")
+    parser.add_argument("--out", default=os.path.join("reports", "loadtest.json"), help="JSON results file")
+    parser.add_argument("--baseline", help="previous results file to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    member_ids = [m for m in (args.member_ids or "").split(",") if m]
+    members = member_ids or [f"LT{i:04d}" for i in range(args.members)]
+    scenarios, skipped = plan_scenarios(args.route, bool(args.url), member_ids, args.allow_writes)
+    for name, reason in skipped.items():
+        print(f"{name:<12} skipped: {reason}")
+    proc = None
+    with tempfile.TemporaryDirectory(prefix="aceest-loadtest-") as workdir:
+        try:
+            if args.url:
+                base_url = args.url.rstrip("/")
+            else:
+                seed_database(os.path.join(workdir, "workouts.db"), members, args.sessions)
+                proc, base_url = start_gunicorn(workdir, args.workers, args.threads, args.mode)
+            results = {
+                "meta": {
+                    "label": args.label, "git_revision": _git_revision(), "target": args.url or f"gunicorn ({args.mode})",
+                    "workers": None if args.url else args.workers, "threads": None if args.url else args.threads,
+                    "concurrency": args.concurrency, "duration_s": args.duration,
+                    "members": len(members), "sessions_per_member": None if args.url else args.sessions,
+                    "skipped_routes": skipped,
+                    "python": platform.python_version(),
+                    "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                },
+                "routes": {},
+            }
+            for scenario in scenarios:
+                stats = run_scenario(base_url, scenario, members, args.concurrency, args.duration)
+                results["routes"][scenario[0]] = stats
+                print(f"{scenario[0]:<12} {stats['throughput_rps']:>8.1f} req/s  p50 {stats['p50_ms']}ms  "
+                      f"p95 {stats['p95_ms']}ms  p99 {stats['p99_ms']}ms  errors {stats['errors']}")
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for line in regressions:
+            print("REGRESSION " + line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for the in-process workout store (app/memory_store.py).
+
+Each thread logs workouts for random members and reads them back
+(--read-ratio of operations are reads).  The run is repeated per thread count,
+once with lock striping and once with a single global lock (--stripes 1),
+and reports throughput, scaling efficiency (throughput / (threads x
+single-thread throughput) and the fraction of lock acquires that had to wait.
+Under the GIL throughput can't scale past one core with either layout, so
+those columns mostly matter on a free-threaded interpreter (python3.13t+).
+
+What striping changes under the GIL too is head-of-line blocking: a write
+whose change() is slow (or sleeps, releasing the GIL) holds its lock, and
+every write that needs the same lock waits for it.  The blocking probe
+holds one member's lock for --hold-ms and times writes to other members
+meanwhile: with one lock they wait out the hold, with striping they don't.
+
+Usage:
+  python3 tools/store_benchmark.py
+  python3 tools/store_benchmark.py --threads 1 2 4 8 16 --ops 50000 --out reports/store-benchmark.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.memory_store import DEFAULT_STRIPES, MemoryWorkoutStore  # noqa: E402
+from app.storage import CATEGORIES  # noqa: E402
+
+
+class CountingLock:
+    """threading.Lock that counts acquires and how many found it already held."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquires = 0
+        self.contended = 0
+
+    def __enter__(self):
+        if not self._lock.acquire(blocking=False):
+            self._lock.acquire()
+            self.contended += 1  # updated while holding the lock, so exact
+        self.acquires += 1
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+
+def instrumented_store(stripes):
+    store = MemoryWorkoutStore(stripes=stripes)
+    store._stripes = [CountingLock() for _ in range(stripes)]
+    return store
+
+
+def run(threads, stripes, ops_per_thread, members, read_ratio):
+    """Return (ops/s, contended fraction) for one configuration."""
+    store = instrumented_store(stripes)
+    ids = [f"B{i:05d}" for i in range(members)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        barrier.wait()
+        for i in range(ops_per_thread):
+            regn_id = rng.choice(ids)
+            if rng.random() < read_ratio:
+                store.aggregates(regn_id)
+            else:
+                store.add(regn_id, CATEGORIES[i % 3], {"exercise": "Bench", "duration": 10, "calories": 50.0,
+                                                       "timestamp": f"2024-03-{1 + i % 28:02d} 07:00:00"})
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+    acquires = sum(lock.acquires for lock in store._stripes)
+    contended = sum(lock.contended for lock in store._stripes)
+    return threads * ops_per_thread / elapsed, contended / acquires if acquires else 0.0
+
+
+def blocked_write_latency(stripes, members, hold_ms, probes=20):
+    """Median seconds a write to another member takes while one member's slow write holds its lock."""
+    store = MemoryWorkoutStore(stripes=stripes)
+    rng = random.Random(0)
+    ids = [f"B{i:05d}" for i in range(members)]
+    latencies = []
+    for _ in range(probes):
+        holding, release = threading.Event(), threading.Event()
+
+        def change(current):
+            holding.set()
+            release.wait(hold_ms / 1000)  # releases the GIL, like slow I/O would
+            return current.columns, current.aggregates, current.profile
+
+        slow = threading.Thread(target=store._update, args=("SLOW", change))
+        slow.start()
+        holding.wait()
+        start = time.perf_counter()
+        store.add(rng.choice(ids), "Workout", {"exercise": "Bench", "duration": 10, "calories": 50.0,
+                                               "timestamp": "2024-03-01 07:00:00"})
+        latencies.append(time.perf_counter() - start)
+        release.set()
+        slow.join()
+    return sorted(latencies)[len(latencies) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the lock-striped in-memory workout store.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to run")
+    parser.add_argument("--stripes", type=int, default=DEFAULT_STRIPES, help="stripes for the striped run")
+    parser.add_argument("--ops", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--members", type=int, default=1000, help="members spread over the stripes")
+    parser.add_argument("--read-ratio", type=float, default=0.5, help="fraction of operations that are reads")
+    parser.add_argument("--hold-ms", type=float, default=20.0, help="how long the blocking probe's slow write holds its lock")
+    parser.add_argument("--out", help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {platform.python_version()} ({'GIL' if gil else 'free-threaded'}), "
+          f"{args.members} members, {args.ops} ops/thread, {args.read_ratio:.0%} reads")
+    results = {"meta": {"python": platform.python_version(), "gil": gil, "members": args.members,
+                        "ops_per_thread": args.ops, "read_ratio": args.read_ratio, "hold_ms": args.hold_ms},
+               "runs": [], "blocked_write_ms": {}}
+    for stripes in (args.stripes, 1):
+        base = None
+        for threads in args.threads:
+            throughput, contended = run(threads, stripes, args.ops, args.members, args.read_ratio)
+            base = base or throughput / threads
+            efficiency = throughput / (threads * base)
+            results["runs"].append({"stripes": stripes, "threads": threads, "ops_per_s": round(throughput),
+                                    "scaling_efficiency": round(efficiency, 3), "contended": round(contended, 4)})
+            print(f"stripes {stripes:>4}  threads {threads:>3}  {throughput:>10,.0f} ops/s  "
+                  f"efficiency {efficiency:>6.1%}  contended acquires {contended:>6.2%}")
+    for stripes in (args.stripes, 1):
+        latency = blocked_write_latency(stripes, args.members, args.hold_ms) * 1000
+        results["blocked_write_ms"][str(stripes)] = round(latency, 3)
+        print(f"stripes {stripes:>4}  write to another member during a {args.hold_ms:g}ms slow write: "
+              f"median {latency:.3f}ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())